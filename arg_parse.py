@@ -4,6 +4,7 @@
 import argparse
 import sys
 from error import ErrorNum
+import limits
 
 # class for parsing command line arguments
 
@@ -17,6 +18,45 @@ class ArgumentParser:
             "--input", help="input file", metavar='FILE', dest="input_file")
         self.parser.add_argument(
             "--help", help="help", dest="help", action="store_true")
+        self.parser.add_argument(
+            "--engine", help="execution engine", dest="engine",
+            choices=["classic", "bytecode"], default="classic")
+        self.parser.add_argument(
+            "--output-buffer", help="flush policy of program output",
+            dest="output_buffer", choices=["block", "line", "unbuffered"],
+            default="block")
+        self.parser.add_argument(
+            "--no-cache", help="do not use cache of loaded programs",
+            dest="no_cache", action="store_true")
+        self.parser.add_argument(
+            "--profile", help="file for collapsed stacks of sampling profiler",
+            metavar='FILE', dest="profile")
+        self.parser.add_argument(
+            "--emit-python", help="write program as standalone python file",
+            metavar='FILE', dest="emit_python")
+        self.parser.add_argument(
+            "--optimize", help="fold constants and remove unreachable code",
+            dest="optimize", action="store_true")
+        self.parser.add_argument(
+            "--specialize",
+            help="infer types and skip proven checks of instructions",
+            dest="specialize", action="store_true")
+        self.parser.add_argument(
+            "--jit", help="compile traces of hot loops to python code",
+            dest="jit", action="store_true")
+        self.parser.add_argument(
+            "--fuse", help="fuse common instruction pairs",
+            dest="fuse", action="store_true")
+        # resource limits of run
+        limits.add_arguments(self.parser)
+        # statistics, metrics belong to the last --stats file
+        self.parser.add_argument(
+            "--stats", help="file for statistics", metavar='FILE',
+            dest="stats", action=StatsFile, default=[])
+        for metric in ("insts", "hot", "vars", "opcodes", "fused"):
+            self.parser.add_argument(
+                "--" + metric, help="write %s statistic" % metric,
+                dest="stats", action=StatsMetric, nargs=0, const=metric)
         self.args = self.parser.parse_args()
 
     def get_source(self):
@@ -28,6 +68,62 @@ class ArgumentParser:
     def get_help(self):
         return self.args.help
 
+    def get_engine(self):
+        return self.args.engine
+
+    def get_output_buffer(self):
+        return self.args.output_buffer
+
+    def get_cache(self):
+        return not self.args.no_cache
+
+    def get_emit_python(self):
+        return self.args.emit_python
+
+    def get_optimize(self):
+        return self.args.optimize
+
+    def get_specialize(self):
+        return self.args.specialize
+
+    def get_jit(self):
+        return self.args.jit
+
+    def get_fuse(self):
+        return self.args.fuse
+
+    def get_profile(self):
+        return self.args.profile
+
+    def get_stats(self):
+        return self.args.stats
+
+    def get_limits(self):
+        return limits.from_args(self.args)
+
+# action for --stats, starts new group of metrics
+
+
+class StatsFile(argparse.Action):
+    def __call__(self, parser, namespace, values, option_string=None):
+        groups = getattr(namespace, self.dest)
+        if any(values == file_name for file_name, _ in groups):
+            sys.stderr.write("Error: Stats file used more than once\n")
+            sys.exit(ErrorNum.OUTPUT_FILE_ERR)
+        # default list is not changed
+        setattr(namespace, self.dest, groups + [(values, [])])
+
+# action for metric options, metric has to follow --stats
+
+
+class StatsMetric(argparse.Action):
+    def __call__(self, parser, namespace, values, option_string=None):
+        groups = getattr(namespace, self.dest)
+        if not groups:
+            sys.stderr.write("Error: Missing --stats file\n")
+            sys.exit(ErrorNum.WRONG_PARAM)
+        groups[-1][1].append(self.const)
+
 # rewrite of argparse.ArgumentParser.exit() method
 
 
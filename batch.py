@@ -0,0 +1,193 @@
+# batch.py
+# author: Jakub Kontrik xkontr02
+# Description: module for running many test cases in one process pool
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import traceback
+import multiprocessing
+from interpret_class import Interpret
+from loader import Loader
+from output import ErrorStream
+from error import InterpretError, ProgramExit
+import limits
+
+# programs loaded by parent and limits of every case, set in every worker
+# by init_worker
+PROGRAMS = {}
+LIMITS = None
+
+# class for one loaded source, errors of loading are stored as
+# (stdout, stderr, exit code) and reported by every case of the source
+
+
+class LoadedSource:
+    def __init__(self, path):
+        self.path = path
+        self.program = None
+        # error reported before input file is opened
+        self.load_error = None
+        # error reported after input file is opened
+        self.link_error = None
+        loader = Loader(path, Interpret(None))
+        self.load_error = capture(loader.load)[1]
+        if self.load_error is None:
+            self.link_error = capture(self.link, loader)[1]
+
+    def link(self, loader):
+        self.program = loader.link()
+        self.program.link()
+
+
+# call function with captured stdout and stderr, returns its result and
+# None or (stdout, stderr, exit code) when it failed
+def capture(function, *args):
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = io.StringIO(), io.StringIO()
+    try:
+        return function(*args), None
+    except InterpretError as error:
+        sys.stderr.write(error.message)
+        return None, (sys.stdout.getvalue(), sys.stderr.getvalue(),
+                      int(error.code))
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+
+
+def init_worker(programs, limits):
+    global LIMITS
+    PROGRAMS.update(programs)
+    LIMITS = limits
+
+
+# run one case in isolated interpret, returns (stdout, stderr, exit code)
+def run_case(source, input_file):
+    loaded = PROGRAMS[source]
+    if loaded.load_error is not None:
+        return loaded.load_error
+    stdout, stderr, stdin = sys.stdout, sys.stderr, sys.stdin
+    out, err = io.StringIO(), io.StringIO()
+    sys.stdout, sys.stderr = out, err
+    # program without input file reads empty stdin
+    sys.stdin = io.StringIO("")
+    code = 0
+    try:
+        interpret = Interpret(input_file)
+        interpret.open_input()
+        sys.stderr = ErrorStream(err, interpret.output)
+        if loaded.link_error is not None:
+            return loaded.link_error
+        program = loaded.program
+        # instructions of shared program use interpret of this case
+        for inst in program.instruction_list:
+            inst.interpret = interpret
+        if program.instruction_list:
+            interpret.run(program, limits=LIMITS)
+    except InterpretError as error:
+        # message is written after program output is flushed
+        sys.stderr.write(error.message)
+        code = int(error.code)
+    except ProgramExit as exit:
+        code = exit.code
+    except Exception:
+        # same as uncaught exception of interpret.py
+        err.write(traceback.format_exc())
+        code = 1
+    finally:
+        sys.stdout, sys.stderr, sys.stdin = stdout, stderr, stdin
+    return out.getvalue(), err.getvalue(), code
+
+
+def read_file(path):
+    with open(path, 'r') as file:
+        return file.read()
+
+
+# run case from manifest, returns result written to json lines
+def run_entry(entry):
+    number, case = entry
+    start = time.perf_counter()
+    stdout, stderr, code = run_case(case["source"], case.get("input"))
+    result = {
+        "case": number,
+        "source": case["source"],
+        "input": case.get("input"),
+        "code": code,
+        "stdout": stdout,
+        "stderr": stderr,
+        "time": time.perf_counter() - start,
+    }
+    # case without expectations is only run
+    passed = None
+    if "expected" in case:
+        passed = stdout == read_file(case["expected"])
+    if "code" in case:
+        passed = passed is not False and code == case["code"]
+    result["passed"] = passed
+    return result
+
+
+# read manifest, every line is json object with source and optional
+# input, expected (file with expected stdout) and code, relative paths
+# are relative to manifest
+def read_manifest(path):
+    directory = os.path.dirname(os.path.abspath(path))
+    cases = []
+    with open(path) as file:
+        for line in file:
+            if not line.strip():
+                continue
+            case = json.loads(line)
+            case["source"] = os.path.join(directory, case["source"])
+            for key in ("input", "expected"):
+                if case.get(key) is not None:
+                    case[key] = os.path.join(directory, case[key])
+            cases.append(case)
+    return cases
+
+
+# run all cases, results are written in manifest order, returns number
+# of failed cases
+def run_batch(cases, output, jobs, limits=None):
+    programs = {}
+    for case in cases:
+        if case["source"] not in programs:
+            programs[case["source"]] = LoadedSource(case["source"])
+    failed = 0
+    entries = list(enumerate(cases))
+    with multiprocessing.Pool(jobs, init_worker,
+                              (programs, limits)) as pool:
+        chunksize = max(1, len(entries) // (4 * (jobs or os.cpu_count())))
+        for result in pool.imap(run_entry, entries, chunksize):
+            if result["passed"] is False:
+                failed += 1
+            output.write(json.dumps(result) + "\n")
+    return failed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog="python batch.py")
+    parser.add_argument("manifest", help="json lines file with cases")
+    parser.add_argument("--output", metavar="FILE",
+                        help="file for json lines results, stdout by default")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes, cpu count by default")
+    limits.add_arguments(parser)
+    args = parser.parse_args()
+    try:
+        cases = read_manifest(args.manifest)
+    except (OSError, ValueError, KeyError) as error:
+        sys.stderr.write("Error: Wrong manifest: %s\n" % error)
+        sys.exit(1)
+    if args.output is None:
+        failed = run_batch(cases, sys.stdout, args.jobs,
+                           limits.from_args(args))
+    else:
+        with open(args.output, 'w') as file:
+            failed = run_batch(cases, file, args.jobs,
+                               limits.from_args(args))
+    sys.stderr.write("%d cases, %d failed\n" % (len(cases), failed))
+    sys.exit(1 if failed else 0)
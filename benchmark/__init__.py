@@ -0,0 +1,5 @@
+# __init__.py
+# author: Jakub Kontrik xkontr02
+# Description: package with benchmarks of interpreter
+from benchmark.workloads import Program, WORKLOADS
+from benchmark.runner import Runner, compare
@@ -0,0 +1,49 @@
+# __main__.py
+# author: Jakub Kontrik xkontr02
+# Description: command line of benchmarks, run as python -m benchmark
+import sys
+import json
+import argparse
+from benchmark.workloads import WORKLOADS
+from benchmark.runner import Runner, compare, VERSION
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog="python -m benchmark")
+    parser.add_argument("workloads", nargs="*",
+                        help="workloads to run, all by default: " +
+                        ", ".join(WORKLOADS))
+    parser.add_argument("--scale", type=int, default=1,
+                        help="size of generated programs")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs of every workload, best one is used")
+    parser.add_argument("--engine", choices=["classic", "bytecode"],
+                        default="classic")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write results as json to file")
+    parser.add_argument("--compare", metavar="FILE",
+                        help="baseline results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="allowed relative regression, 0.1 is 10 %%")
+    args = parser.parse_args()
+    for name in args.workloads:
+        if name not in WORKLOADS:
+            parser.error("unknown workload %s" % name)
+    results = Runner(args.scale, args.repeat, args.engine).run(args.workloads)
+    for name, result in results["workloads"].items():
+        print("%-12s %10d insts %12.0f insts/s %8d KiB rss %8.4f s load" %
+              (name, result["instructions"], result["ips"],
+               result["peak_rss_kib"], result["load_time"]))
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    if args.compare is not None:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if baseline.get("version") != VERSION:
+            sys.stderr.write("Baseline has different version, not compared\n")
+            sys.exit(0)
+        regressions = compare(baseline, results, args.threshold)
+        for name, key, old, new in regressions:
+            print("REGRESSION %s %s: %g -> %g" % (name, key, old, new))
+        if regressions:
+            sys.exit(1)
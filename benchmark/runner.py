@@ -0,0 +1,123 @@
+# runner.py
+# author: Jakub Kontrik xkontr02
+# Description: module running benchmark workloads and comparing results
+import os
+import sys
+import time
+import platform
+import subprocess
+import tempfile
+from benchmark.workloads import WORKLOADS
+
+# directory with interpret.py
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INTERPRET = os.path.join(ROOT, "interpret.py")
+# results with other version are not compared
+VERSION = 1
+
+# class for running workloads through interpret.py
+
+
+class Runner:
+    def __init__(self, scale=1, repeat=3, engine="classic"):
+        self.scale = scale
+        self.repeat = repeat
+        self.engine = engine
+
+    # run interpret.py once, returns wall time and peak rss in KiB
+    def execute(self, source, input_file, extra=()):
+        cmd = [sys.executable, INTERPRET, "--source", source, "--no-cache",
+               "--engine", self.engine]
+        if input_file is not None:
+            cmd += ["--input", input_file]
+        cmd += list(extra)
+        start = time.perf_counter()
+        process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL,
+                                   stdout=subprocess.DEVNULL)
+        # wait4 gives resource usage of this child only
+        _, status, usage = os.wait4(process.pid, 0)
+        elapsed = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+        if process.returncode != 0:
+            raise RuntimeError("%s exited with %d" %
+                               (" ".join(cmd), process.returncode))
+        return elapsed, usage.ru_maxrss
+
+    # number of executed instructions counted by --stats
+    def count(self, source, input_file, directory):
+        stats = os.path.join(directory, "stats.txt")
+        # statistics are always collected by classic engine
+        self.execute(source, input_file, ("--stats", stats, "--insts"))
+        with open(stats) as file:
+            return int(file.read())
+
+    # time of loading program in this process, without running it
+    def load_time(self, source):
+        if ROOT not in sys.path:
+            sys.path.insert(0, ROOT)
+        from interpret_class import Interpret
+        from loader import Loader
+        start = time.perf_counter()
+        loader = Loader(source, Interpret(None))
+        loader.load()
+        loader.link()
+        return time.perf_counter() - start
+
+    def run_workload(self, name, directory):
+        xml, input_text = WORKLOADS[name](self.scale)
+        source = os.path.join(directory, name + ".xml")
+        with open(source, 'w') as file:
+            file.write(xml)
+        input_file = None
+        if input_text is not None:
+            input_file = os.path.join(directory, name + ".in")
+            with open(input_file, 'w') as file:
+                file.write(input_text)
+        instructions = self.count(source, input_file, directory)
+        times, rss = [], []
+        for _ in range(self.repeat):
+            elapsed, peak = self.execute(source, input_file)
+            times.append(elapsed)
+            rss.append(peak)
+        best = min(times)
+        return {
+            "instructions": instructions,
+            "time": best,
+            "ips": instructions / best,
+            "peak_rss_kib": max(rss),
+            "load_time": min(self.load_time(source)
+                             for _ in range(self.repeat)),
+        }
+
+    def run(self, names=None):
+        results = {
+            "version": VERSION,
+            "python": platform.python_version(),
+            "engine": self.engine,
+            "scale": self.scale,
+            "workloads": {},
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            for name in names or WORKLOADS:
+                results["workloads"][name] = self.run_workload(name, directory)
+        return results
+
+# compare results with baseline, returns list of regressions bigger
+# than threshold (0.1 means 10 %)
+
+
+def compare(baseline, results, threshold):
+    regressions = []
+    if baseline.get("version") != VERSION:
+        return regressions
+    for name, current in results["workloads"].items():
+        old = baseline["workloads"].get(name)
+        if old is None:
+            continue
+        # instructions per second have to stay, rest must not grow
+        if current["ips"] < old["ips"] * (1 - threshold):
+            regressions.append((name, "ips", old["ips"], current["ips"]))
+        for key in ("peak_rss_kib", "load_time"):
+            if current[key] > old[key] * (1 + threshold):
+                regressions.append((name, key, old[key], current[key]))
+    return regressions
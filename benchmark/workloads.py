@@ -0,0 +1,169 @@
+# workloads.py
+# author: Jakub Kontrik xkontr02
+# Description: module generating IPPcode23 programs for benchmarks
+import math
+from xml.sax.saxutils import escape
+
+# class for building xml of IPPcode23 program, arguments are given
+# as strings in IPPcode23 form, for example "GF@x" or "int@5"
+
+
+class Program:
+    def __init__(self):
+        self.instructions = []
+
+    def add(self, opcode, *args):
+        self.instructions.append((opcode, args))
+        return self
+
+    # split argument to xml type and text
+    def argument(self, arg):
+        if arg in ("int", "bool", "string"):
+            return "type", arg
+        prefix, _, value = arg.partition('@')
+        if prefix in ("GF", "LF", "TF"):
+            return "var", arg
+        if prefix in ("int", "bool", "string", "nil"):
+            return prefix, value
+        return "label", arg
+
+    def to_xml(self):
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+                 '<program language="IPPcode23">']
+        for order, (opcode, args) in enumerate(self.instructions, 1):
+            lines.append('<instruction order="%d" opcode="%s">' %
+                         (order, opcode))
+            for i, arg in enumerate(args, 1):
+                type, text = self.argument(arg)
+                lines.append('<arg%d type="%s">%s</arg%d>' %
+                             (i, type, escape(text), i))
+            lines.append('</instruction>')
+        lines.append('</program>')
+        return "\n".join(lines) + "\n"
+
+# every workload returns xml of program and content of input file or None
+
+
+# loop with integer arithmetic and comparisons
+def arithmetic(n):
+    p = Program()
+    for name in ("i", "x", "c"):
+        p.add("DEFVAR", "GF@" + name)
+    p.add("MOVE", "GF@i", "int@0").add("MOVE", "GF@x", "int@1")
+    p.add("LABEL", "loop")
+    p.add("MUL", "GF@x", "GF@x", "int@3")
+    p.add("ADD", "GF@x", "GF@x", "GF@i")
+    p.add("IDIV", "GF@x", "GF@x", "int@2")
+    p.add("SUB", "GF@x", "GF@x", "int@1")
+    # value is kept small
+    p.add("LT", "GF@c", "GF@x", "int@1000000")
+    p.add("JUMPIFEQ", "skip", "GF@c", "bool@true")
+    p.add("MOVE", "GF@x", "int@1")
+    p.add("LABEL", "skip")
+    p.add("ADD", "GF@i", "GF@i", "int@1")
+    p.add("JUMPIFNEQ", "loop", "GF@i", "int@%d" % n)
+    p.add("WRITE", "GF@x")
+    return p.to_xml(), None
+
+
+# recursive fibonacci with local frames and data stack
+def recursion(n):
+    p = Program()
+    p.add("DEFVAR", "GF@r")
+    p.add("PUSHS", "int@%d" % n).add("CALL", "fib").add("POPS", "GF@r")
+    p.add("WRITE", "GF@r").add("EXIT", "int@0")
+    p.add("LABEL", "fib")
+    p.add("CREATEFRAME").add("PUSHFRAME")
+    for name in ("n", "a", "c"):
+        p.add("DEFVAR", "LF@" + name)
+    p.add("POPS", "LF@n")
+    p.add("LT", "LF@c", "LF@n", "int@2")
+    p.add("JUMPIFEQ", "fib_end", "LF@c", "bool@true")
+    p.add("SUB", "LF@a", "LF@n", "int@1")
+    p.add("PUSHS", "LF@a").add("CALL", "fib").add("POPS", "LF@a")
+    p.add("SUB", "LF@n", "LF@n", "int@2")
+    p.add("PUSHS", "LF@n").add("CALL", "fib").add("POPS", "LF@n")
+    p.add("ADD", "LF@n", "LF@n", "LF@a")
+    p.add("LABEL", "fib_end")
+    p.add("PUSHS", "LF@n").add("POPFRAME").add("RETURN")
+    return p.to_xml(), None
+
+
+# building string by CONCAT and rewriting it by SETCHAR
+def strings(n):
+    p = Program()
+    for name in ("s", "i", "len"):
+        p.add("DEFVAR", "GF@" + name)
+    p.add("MOVE", "GF@s", "string@").add("MOVE", "GF@i", "int@0")
+    p.add("LABEL", "build")
+    p.add("CONCAT", "GF@s", "GF@s", "string@ab")
+    p.add("ADD", "GF@i", "GF@i", "int@1")
+    p.add("JUMPIFNEQ", "build", "GF@i", "int@%d" % n)
+    p.add("STRLEN", "GF@len", "GF@s").add("MOVE", "GF@i", "int@0")
+    p.add("LABEL", "rewrite")
+    p.add("SETCHAR", "GF@s", "GF@i", "string@x")
+    p.add("ADD", "GF@i", "GF@i", "int@2")
+    p.add("JUMPIFNEQ", "rewrite", "GF@i", "GF@len")
+    p.add("STRLEN", "GF@len", "GF@s").add("WRITE", "GF@len")
+    return p.to_xml(), None
+
+
+# pushing values to data stack and popping them back
+def stack(n):
+    p = Program()
+    for name in ("i", "x", "sum"):
+        p.add("DEFVAR", "GF@" + name)
+    p.add("MOVE", "GF@i", "int@0").add("MOVE", "GF@sum", "int@0")
+    p.add("LABEL", "push")
+    p.add("PUSHS", "GF@i")
+    p.add("ADD", "GF@i", "GF@i", "int@1")
+    p.add("JUMPIFNEQ", "push", "GF@i", "int@%d" % n)
+    p.add("LABEL", "pop")
+    p.add("POPS", "GF@x")
+    p.add("ADD", "GF@sum", "GF@sum", "GF@x")
+    p.add("SUB", "GF@i", "GF@i", "int@1")
+    p.add("JUMPIFNEQ", "pop", "GF@i", "int@0")
+    p.add("WRITE", "GF@sum")
+    return p.to_xml(), None
+
+
+# reading every input line and writing it back
+def io(n):
+    p = Program()
+    for name in ("x", "t"):
+        p.add("DEFVAR", "GF@" + name)
+    p.add("LABEL", "loop")
+    p.add("READ", "GF@x", "int")
+    p.add("TYPE", "GF@t", "GF@x")
+    p.add("JUMPIFEQ", "end", "GF@t", "string@nil")
+    p.add("WRITE", "GF@x").add("WRITE", "string@\\010")
+    p.add("JUMP", "loop")
+    p.add("LABEL", "end")
+    return p.to_xml(), "".join("%d\n" % i for i in range(n))
+
+
+# long program without loops, memory is taken by loaded instructions
+def program(n):
+    p = Program()
+    for name in ("x", "s", "c"):
+        p.add("DEFVAR", "GF@" + name)
+    p.add("MOVE", "GF@s", "string@")
+    for i in range(n):
+        p.add("MOVE", "GF@x", "int@%d" % i)
+        p.add("ADD", "GF@x", "GF@x", "int@1")
+        p.add("CONCAT", "GF@s", "string@item\\032", "string@value")
+        p.add("EQ", "GF@c", "GF@x", "nil@nil")
+    p.add("WRITE", "GF@x")
+    return p.to_xml(), None
+
+
+# programs of workloads for given scale, work grows linearly with scale
+WORKLOADS = {
+    "arithmetic": lambda scale: arithmetic(20000 * scale),
+    # number of calls grows by golden ratio with every added level
+    "recursion": lambda scale: recursion(20 + round(math.log(scale, 1.618))),
+    "strings": lambda scale: strings(10000 * scale),
+    "stack": lambda scale: stack(20000 * scale),
+    "io": lambda scale: io(20000 * scale),
+    "program": lambda scale: program(25000 * scale),
+}
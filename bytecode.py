@@ -0,0 +1,573 @@
+# bytecode.py
+# author: Jakub Kontrik xkontr02
+# Description: module for compact bytecode and table dispatch execution
+from array import array
+from error import InterpretError, ProgramExit, make_error, SemanticError, \
+    OperandTypeError, UndefinedVariableError, MissingFrameError, \
+    MissingValueError, OperandValueError, StringError, StringLimitError
+from frame import SlotFrame, UNDEFINED
+from instructions import Nil
+
+# opcode numbers of bytecode
+OPCODES = ("NOP", "ERROR", "MOVE", "CREATEFRAME", "PUSHFRAME", "POPFRAME",
+           "DEFVAR", "CALL", "RETURN", "PUSHS", "POPS", "ADD", "SUB", "MUL",
+           "IDIV", "LT", "GT", "EQ", "AND", "OR", "NOT", "INT2CHAR",
+           "STRI2INT", "READ", "WRITE", "CONCAT", "STRLEN", "GETCHAR",
+           "SETCHAR", "TYPE", "JUMP", "JUMPIFEQ", "JUMPIFNEQ", "EXIT")
+OP = {name: number for number, name in enumerate(OPCODES)}
+# instructions without effect
+NOPS = ("LABEL", "DPRINT", "BREAK")
+# frame numbers of variable references
+GF, LF, TF = 0, 1, 2
+FRAMES = {"GF": GF, "LF": LF, "TF": TF}
+
+# class for program lowered to parallel arrays
+# operand >= 0 is variable reference (slot << 2 | frame number),
+# operand < 0 is ~index of constant,
+# label operands hold target index or -1 for undefined label
+
+
+class Bytecode:
+    def __init__(self, instructions):
+        self.ops = array('B')
+        self.arg1 = array('q')
+        self.arg2 = array('q')
+        self.arg3 = array('q')
+        self.consts = []
+        # names of variables in slots of global frame and of local frames,
+        # temporary frame becomes local so they share slots
+        self.global_names = []
+        self.local_names = []
+        self.errors = []
+        # (order, opcode) of original instruction on every index
+        self.sources = []
+        self.const_index = {}
+        self.var_index = {}
+        for inst in instructions:
+            self.lower(inst)
+
+    def lower(self, inst):
+        operands = [0, 0, 0]
+        if inst.error is not None:
+            opcode = OP["ERROR"]
+            operands[0] = len(self.errors)
+            self.errors.append(self.error(inst))
+        elif inst.opcode in NOPS:
+            opcode = OP["NOP"]
+        elif inst.opcode in ("CALL", "JUMP", "JUMPIFEQ", "JUMPIFNEQ"):
+            opcode = OP[inst.opcode]
+            operands[0] = -1 if inst.target is None else inst.target
+            if inst.opcode == "CALL":
+                # call stack holds index of call instruction
+                operands[1] = len(self.ops)
+            for i, arg in enumerate(inst.arguments[1:], 1):
+                operands[i] = self.operand(arg)
+        elif inst.opcode == "TYPE" and inst.arguments[1].type != "var":
+            # type of constant is known
+            opcode = OP["MOVE"]
+            operands[0] = self.operand(inst.arguments[0])
+            operands[1] = self.constant("string", inst.arguments[1].type)
+        else:
+            opcode = OP[inst.opcode]
+            for i, arg in enumerate(inst.arguments):
+                operands[i] = self.operand(arg)
+        self.ops.append(opcode)
+        self.sources.append((inst.order, inst.opcode))
+        self.arg1.append(operands[0])
+        self.arg2.append(operands[1])
+        self.arg3.append(operands[2])
+
+    # (message, code, checks) of instruction with static error, checks are
+    # (reference, kinds) from Instruction.checks, None reference is
+    # undefined label
+    def error(self, inst):
+        checks = []
+        for arg, kinds in inst.checks():
+            if arg.type != "label":
+                checks.append((self.operand(arg), kinds))
+            elif inst.target is None:
+                checks.append((None, None))
+        return inst.error[0], inst.error[1], tuple(checks)
+
+    def operand(self, arg):
+        if arg.type == "var":
+            return self.variable(arg.frame, arg.name)
+        return self.constant(arg.type, arg.value)
+
+    # assign slot to variable name
+    def variable(self, frame, name):
+        if frame == "GF":
+            names = self.global_names
+        else:
+            names = self.local_names
+        key = (frame == "GF", name)
+        if key not in self.var_index:
+            self.var_index[key] = len(names)
+            names.append(name)
+        return self.var_index[key] << 2 | FRAMES[frame]
+
+    def constant(self, type, value):
+        # nil constants are shared, other values are keyed by type
+        key = (type, None if type == "nil" else value)
+        if key not in self.const_index:
+            self.const_index[key] = ~len(self.consts)
+            self.consts.append(value)
+        return self.const_index[key]
+
+# class for execution state of bytecode
+
+
+class Machine:
+    def __init__(self, interpret, bytecode):
+        self.interpret = interpret
+        self.code = bytecode
+        self.consts = bytecode.consts
+        # frames are fixed size records with variable slots
+        interpret.global_frame = SlotFrame(bytecode.global_names)
+        self.globals = interpret.global_frame.slots
+        # slots of top local frame and of temporary frame
+        self.local = None
+        self.temp = None
+
+    def run(self, limits=None):
+        # lists are faster to index than arrays
+        ops = self.code.ops.tolist()
+        arg1 = self.code.arg1.tolist()
+        arg2 = self.code.arg2.tolist()
+        arg3 = self.code.arg3.tolist()
+        table = HANDLERS
+        end = len(ops)
+        pc = 0
+        # executing instructions, handler returns index of next instruction
+        # if it changes control flow
+        try:
+            if limits is None:
+                while pc < end:
+                    jump = table[ops[pc]](self, arg1[pc], arg2[pc], arg3[pc])
+                    if jump is None:
+                        pc += 1
+                    else:
+                        pc = jump
+            else:
+                # same loop with checks of limits, see Interpret.run_limited
+                limits.start(self.interpret)
+                executed = 0
+                check = limits.next_check(executed)
+                while pc < end:
+                    if executed >= check:
+                        limits.check(executed)
+                        check = limits.next_check(executed)
+                    jump = table[ops[pc]](self, arg1[pc], arg2[pc], arg3[pc])
+                    executed += 1
+                    if jump is None:
+                        pc += 1
+                    else:
+                        pc = jump
+        except InterpretError as error:
+            raise error.locate(*self.code.sources[pc])
+        self.interpret.output.flush()
+
+## HELPERS ##
+
+
+# get slots of frame of variable reference
+def frame_slots(m, ref):
+    frame = ref & 3
+    if frame == GF:
+        return m.globals
+    elif frame == LF:
+        if m.local is None:
+            raise MissingFrameError("Error: Frame does not exist\n")
+        return m.local
+    if m.temp is None:
+        raise MissingFrameError("Error: Frame does not exist\n")
+    return m.temp
+
+
+# check if variable is defined and return slots of its frame
+def target(m, ref):
+    slots = m.globals if ref & 3 == GF else frame_slots(m, ref)
+    if slots[ref >> 2] is UNDEFINED:
+        raise UndefinedVariableError("Error: Variable not defined\n")
+    return slots
+
+
+# get value of symbol, variables have to be initialized
+def load(m, ref, message="Error: Variable not set\n"):
+    if ref < 0:
+        return m.consts[~ref]
+    if ref & 3 == GF:
+        value = m.globals[ref >> 2]
+    else:
+        value = frame_slots(m, ref)[ref >> 2]
+    if value is None:
+        raise MissingValueError(message)
+    if value is UNDEFINED:
+        raise UndefinedVariableError("Error: Variable not defined\n")
+    return value
+
+
+# constants of typed loads are checked by Instruction.decode
+def load_int(m, ref):
+    if ref < 0:
+        return m.consts[~ref]
+    if ref & 3 == GF:
+        value = m.globals[ref >> 2]
+    else:
+        value = frame_slots(m, ref)[ref >> 2]
+    if type(value) != int:
+        check_value(value)
+        raise OperandTypeError("Error: Wrong type\n")
+    return value
+
+
+def load_bool(m, ref):
+    if ref < 0:
+        return m.consts[~ref]
+    if ref & 3 == GF:
+        value = m.globals[ref >> 2]
+    else:
+        value = frame_slots(m, ref)[ref >> 2]
+    if type(value) != bool:
+        check_value(value)
+        raise OperandTypeError("Error: Wrong type\n")
+    return value
+
+
+def load_str(m, ref):
+    if ref < 0:
+        return m.consts[~ref]
+    if ref & 3 == GF:
+        value = m.globals[ref >> 2]
+    else:
+        value = frame_slots(m, ref)[ref >> 2]
+    if type(value) != str:
+        check_value(value)
+        raise OperandTypeError("Error: Wrong type\n")
+    return value
+
+
+# value of wrongly typed load may be missing
+def check_value(value):
+    if value is None:
+        raise MissingValueError("Error: Variable not set\n")
+    if value is UNDEFINED:
+        raise UndefinedVariableError("Error: Variable not defined\n")
+
+
+# load operands of relational instruction
+def load_cmp(m, b, c):
+    left = load(m, b)
+    if type(left) != int and type(left) != bool and type(left) != str:
+        raise OperandTypeError("Error: Wrong type\n")
+    right = load(m, c)
+    if type(right) != int and type(right) != bool and type(right) != str:
+        raise OperandTypeError("Error: Wrong type\n")
+    if type(left) != type(right):
+        raise OperandTypeError("Error: Wrong type\n")
+    return left, right
+
+
+# compare operands of conditional jump
+def equal(m, b, c):
+    left = load(m, b)
+    right = load(m, c)
+    if type(left) == Nil or type(right) == Nil:
+        return type(left) == type(right)
+    if type(left) != type(right):
+        raise OperandTypeError("Error: Wrong type\n")
+    return left == right
+
+## HANDLERS ##
+
+
+def op_nop(m, a, b, c):
+    pass
+
+
+def op_error(m, a, b, c):
+    message, code, checks = m.code.errors[a]
+    for ref, kinds in checks:
+        if ref is None:
+            raise SemanticError("Error: Missing label\n")
+        if kinds is None:
+            target(m, ref)
+        elif TYPE_NAMES[type(load(m, ref))] not in kinds:
+            raise OperandTypeError("Error: Wrong type\n")
+    raise make_error(code, message)
+
+
+def op_move(m, a, b, c):
+    slots = target(m, a)
+    slots[a >> 2] = load(m, b, "Error: Variable not defined\n")
+
+
+def op_createframe(m, a, b, c):
+    m.interpret.tmp_frame = SlotFrame(m.code.local_names)
+    m.temp = m.interpret.tmp_frame.slots
+
+
+def op_pushframe(m, a, b, c):
+    if m.interpret.tmp_frame is None:
+        raise MissingFrameError("Error: Temp frame does not exist\n")
+    m.interpret.local_frames.push(m.interpret.tmp_frame)
+    m.local = m.temp
+    m.interpret.tmp_frame = None
+    m.temp = None
+
+
+def op_popframe(m, a, b, c):
+    if m.interpret.local_frames.is_empty():
+        raise MissingFrameError("Error: Temp frame does not exist\n")
+    m.interpret.tmp_frame = m.interpret.local_frames.pop()
+    m.temp = m.local
+    top = m.interpret.local_frames.top()
+    m.local = None if top is None else top.slots
+
+
+def op_defvar(m, a, b, c):
+    slots = frame_slots(m, a)
+    if slots[a >> 2] is not UNDEFINED:
+        raise SemanticError("Error: Variable already defined\n")
+    slots[a >> 2] = None
+
+
+def op_call(m, a, b, c):
+    if a < 0:
+        raise SemanticError("Error: Label does not exist\n")
+    m.interpret.call_stack.push(b)
+    return a + 1
+
+
+def op_return(m, a, b, c):
+    if m.interpret.call_stack.is_empty():
+        raise MissingValueError("Error: Call stack is empty\n")
+    return m.interpret.call_stack.pop() + 1
+
+
+def op_pushs(m, a, b, c):
+    m.interpret.data_stack.push(load(m, a, "Error: Empty var\n"))
+
+
+def op_pops(m, a, b, c):
+    if m.interpret.data_stack.is_empty():
+        raise MissingValueError("Error: EMPTY STACK\n")
+    slots = target(m, a)
+    slots[a >> 2] = m.interpret.data_stack.pop()
+
+
+def op_add(m, a, b, c):
+    slots = target(m, a)
+    left = load_int(m, b)
+    slots[a >> 2] = left + load_int(m, c)
+
+
+def op_sub(m, a, b, c):
+    slots = target(m, a)
+    left = load_int(m, b)
+    slots[a >> 2] = left - load_int(m, c)
+
+
+def op_mul(m, a, b, c):
+    slots = target(m, a)
+    left = load_int(m, b)
+    slots[a >> 2] = left * load_int(m, c)
+
+
+def op_idiv(m, a, b, c):
+    slots = target(m, a)
+    left = load_int(m, b)
+    right = load_int(m, c)
+    if right == 0:
+        raise OperandValueError("Error: Division by zero\n")
+    slots[a >> 2] = int(left / right)
+
+
+def op_lt(m, a, b, c):
+    slots = target(m, a)
+    left, right = load_cmp(m, b, c)
+    slots[a >> 2] = left < right
+
+
+def op_gt(m, a, b, c):
+    slots = target(m, a)
+    left, right = load_cmp(m, b, c)
+    slots[a >> 2] = left > right
+
+
+def op_eq(m, a, b, c):
+    slots = target(m, a)
+    left = load(m, b)
+    if type(left) != int and type(left) != bool and type(left) != str and type(left) != Nil:
+        raise OperandTypeError("Error: Wrong type\n")
+    right = load(m, c)
+    if type(right) != int and type(right) != bool and type(right) != str and type(right) != Nil:
+        raise OperandTypeError("Error: Wrong type\n")
+    if type(left) == Nil or type(right) == Nil:
+        slots[a >> 2] = type(left) == type(right)
+        return
+    if type(left) != type(right):
+        raise OperandTypeError("Error: Wrong type\n")
+    slots[a >> 2] = left == right
+
+
+def op_and(m, a, b, c):
+    slots = target(m, a)
+    left = load_bool(m, b)
+    right = load_bool(m, c)
+    slots[a >> 2] = left and right
+
+
+def op_or(m, a, b, c):
+    slots = target(m, a)
+    left = load_bool(m, b)
+    right = load_bool(m, c)
+    slots[a >> 2] = left or right
+
+
+def op_not(m, a, b, c):
+    slots = target(m, a)
+    slots[a >> 2] = not load_bool(m, b)
+
+
+def op_int2char(m, a, b, c):
+    slots = target(m, a)
+    value = load_int(m, b)
+    try:
+        char = chr(value)
+    except ValueError:
+        raise StringError("Error: Wrong value\n")
+    interpret = m.interpret
+    interpret.string_budget -= 1
+    if interpret.string_budget < 0:
+        interpret.limits.reclaim(interpret, 1, slots[a >> 2])
+    slots[a >> 2] = char
+
+
+def op_stri2int(m, a, b, c):
+    slots = target(m, a)
+    string = load_str(m, b)
+    index = load_int(m, c)
+    if index > len(string) - 1 or index < 0:
+        raise StringError("Error: Wrong value\n")
+    slots[a >> 2] = ord(string[index])
+
+
+def op_read(m, a, b, c):
+    slots = target(m, a)
+    value = m.interpret.input.readline()
+    if value is None:
+        slots[a >> 2] = Nil()
+        return
+    kind = m.consts[~b]
+    if kind == "bool":
+        slots[a >> 2] = value.lower() == "true"
+    elif kind == "int":
+        try:
+            slots[a >> 2] = int(value)
+        except ValueError:
+            slots[a >> 2] = Nil()
+    else:
+        interpret = m.interpret
+        interpret.string_budget -= len(value)
+        if interpret.string_budget < 0:
+            interpret.limits.reclaim(interpret, len(value), slots[a >> 2])
+        slots[a >> 2] = value
+
+
+def op_write(m, a, b, c):
+    value = load(m, a)
+    if type(value) == bool:
+        m.interpret.output.write("true" if value else "false")
+    elif type(value) != Nil:
+        m.interpret.output.write(str(value))
+
+
+def op_concat(m, a, b, c):
+    slots = target(m, a)
+    left = load_str(m, b)
+    right = load_str(m, c)
+    size = len(left) + len(right)
+    interpret = m.interpret
+    interpret.string_budget -= size
+    if interpret.string_budget < 0:
+        interpret.limits.reclaim(interpret, size, slots[a >> 2])
+    slots[a >> 2] = left + right
+
+
+def op_strlen(m, a, b, c):
+    slots = target(m, a)
+    slots[a >> 2] = len(load_str(m, b))
+
+
+def op_getchar(m, a, b, c):
+    slots = target(m, a)
+    string = load_str(m, b)
+    index = load_int(m, c)
+    if index > len(string) - 1 or index < 0:
+        raise StringError("Error: Wrong value\n")
+    interpret = m.interpret
+    interpret.string_budget -= 1
+    if interpret.string_budget < 0:
+        interpret.limits.reclaim(interpret, 1, slots[a >> 2])
+    slots[a >> 2] = string[index]
+
+
+def op_setchar(m, a, b, c):
+    slots = target(m, a)
+    string = load_str(m, a)
+    index = load_int(m, b)
+    char = load_str(m, c)
+    if index > len(string) - 1 or index < 0 or len(char) == 0:
+        raise StringError("Error: Wrong value\n")
+    interpret = m.interpret
+    interpret.string_budget -= len(string)
+    if interpret.string_budget < 0:
+        interpret.limits.reclaim(interpret, len(string), slots[a >> 2])
+    slots[a >> 2] = string[:index] + char[0] + string[index + 1:]
+
+
+def op_type(m, a, b, c):
+    slots = target(m, a)
+    value = target(m, b)[b >> 2]
+    if value is None:
+        slots[a >> 2] = ""
+    else:
+        slots[a >> 2] = TYPE_NAMES[type(value)]
+
+
+def op_jump(m, a, b, c):
+    if a < 0:
+        raise SemanticError("Error: Missing label\n")
+    return a + 1
+
+
+def op_jumpifeq(m, a, b, c):
+    if a < 0:
+        raise SemanticError("Error: Missing label\n")
+    if equal(m, b, c):
+        return a + 1
+
+
+def op_jumpifneq(m, a, b, c):
+    if a < 0:
+        raise SemanticError("Error: Missing label\n")
+    if not equal(m, b, c):
+        return a + 1
+
+
+def op_exit(m, a, b, c):
+    value = load_int(m, a)
+    m.interpret.output.flush()
+    raise ProgramExit(value)
+
+
+TYPE_NAMES = {int: "int", str: "string", bool: "bool", Nil: "nil"}
+
+# dispatch table indexed by opcode number
+HANDLERS = (op_nop, op_error, op_move, op_createframe, op_pushframe,
+            op_popframe, op_defvar, op_call, op_return, op_pushs, op_pops,
+            op_add, op_sub, op_mul, op_idiv, op_lt, op_gt, op_eq, op_and,
+            op_or, op_not, op_int2char, op_stri2int, op_read, op_write,
+            op_concat, op_strlen, op_getchar, op_setchar, op_type, op_jump,
+            op_jumpifeq, op_jumpifneq, op_exit)
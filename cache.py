@@ -0,0 +1,124 @@
+# cache.py
+# author: Jakub Kontrik xkontr02
+# Description: module for caching loaded programs on disk
+import os
+import sys
+import io
+import hashlib
+import pickle
+import struct
+import zlib
+from error import InputFileError
+from program import Program
+
+# cache file starts with magic bytes and stamp of pickled classes
+MAGIC = b"IPPC"
+HEADER = struct.Struct(">4s8s")
+# modules which validate, decode and create stored instructions and whose
+# classes are pickled, files stored by other sources of these modules are
+# not used
+MODULES = ("loader.py", "xmlvalidator.py", "factory.py", "instructions.py",
+           "program.py", "frame.py", "error.py")
+
+
+# stamp from hash of sources of pickled modules, None if they can not be read
+def source_stamp():
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    try:
+        for name in MODULES:
+            with open(os.path.join(directory, name), 'rb') as file:
+                digest.update(file.read())
+    except OSError:
+        return None
+    return digest.digest()[:HEADER.size - len(MAGIC)]
+
+# class for storing validated and decoded programs keyed by hash of source
+
+
+class ProgramCache:
+    # size of all cache files after which least recently used are removed
+    MAX_SIZE = 1 << 26
+
+    def __init__(self, directory=None):
+        if directory is None:
+            directory = os.path.join(
+                os.environ.get("XDG_CACHE_HOME",
+                               os.path.join(os.path.expanduser("~"), ".cache")),
+                "ipp-interpret")
+        self.directory = directory
+        # without stamp programs are not cached
+        self.stamp = source_stamp()
+
+    # get hash of source and source for loader, stdin has to be read whole
+    def hash_source(self, source):
+        digest = hashlib.sha256()
+        if source is None:
+            data = sys.stdin.buffer.read()
+            digest.update(data)
+            return digest.hexdigest(), io.BytesIO(data)
+        try:
+            with open(source, 'rb') as file:
+                for chunk in iter(lambda: file.read(1 << 16), b""):
+                    digest.update(chunk)
+        except FileNotFoundError:
+            raise InputFileError("Error: File not found\n")
+        return digest.hexdigest(), source
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".ippc")
+
+    # get cached program, None if it is not cached
+    def load(self, key, interpret):
+        if self.stamp is None:
+            return None
+        try:
+            with open(self.path(key), 'rb') as file:
+                data = file.read()
+            magic, stamp = HEADER.unpack_from(data)
+            if magic != MAGIC or stamp != self.stamp:
+                return None
+            instructions, labels = pickle.loads(
+                zlib.decompress(data[HEADER.size:]))
+            # marking file as recently used
+            os.utime(self.path(key))
+        except (OSError, struct.error, zlib.error, pickle.UnpicklingError,
+                EOFError, AttributeError, ImportError, ValueError):
+            return None
+        for instruction in instructions:
+            instruction.interpret = interpret
+        return Program(instructions, labels)
+
+    # store loaded program, cache errors are ignored
+    def store(self, key, program):
+        if self.stamp is None:
+            return
+        try:
+            data = HEADER.pack(MAGIC, self.stamp) + zlib.compress(
+                pickle.dumps((program.instruction_list, program.labels),
+                             pickle.HIGHEST_PROTOCOL))
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = self.path(key) + ".%d.tmp" % os.getpid()
+            with open(tmp, 'wb') as file:
+                file.write(data)
+            os.replace(tmp, self.path(key))
+            self.evict()
+        except (OSError, pickle.PicklingError):
+            pass
+
+    # remove least recently used files until cache fits its size
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".ippc"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        size = sum(entry[1] for entry in entries)
+        for _, file_size, path in sorted(entries):
+            if size <= self.MAX_SIZE:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            size -= file_size
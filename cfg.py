@@ -0,0 +1,252 @@
+# cfg.py
+# author: Jakub Kontrik xkontr02
+# Description: module with control flow graph of basic blocks and analyses
+
+# kinds of edges between blocks
+FALL = "fall"
+JUMP = "jump"
+BRANCH = "branch"
+CALL = "call"
+RETURN = "return"
+
+# instructions which end basic block
+BRANCHES = ("JUMPIFEQ", "JUMPIFNEQ")
+ENDS = ("JUMP", "JUMPIFEQ", "JUMPIFNEQ", "CALL", "RETURN", "EXIT")
+
+# class for basic block, instructions from start to end (without end)
+# are always executed together
+
+
+class BasicBlock:
+    def __init__(self, id, start, end):
+        self.id = id
+        self.start = start
+        self.end = end
+        # lists of (block, kind of edge)
+        self.successors = []
+        self.predecessors = []
+
+    # index of last instruction of block
+    def last(self):
+        return self.end - 1
+
+    def __repr__(self):
+        return "BasicBlock(%d, %d..%d)" % (self.id, self.start, self.end)
+
+# class for loop found by back edge, header dominates every block of body
+
+
+class Loop:
+    def __init__(self, header):
+        self.header = header
+        # blocks which jump back to header
+        self.latches = []
+        # ids of blocks in loop including header
+        self.body = {header.id}
+
+    def __repr__(self):
+        return "Loop(header=%d, blocks=%s)" % (self.header.id,
+                                                sorted(self.body))
+
+# class for control flow graph of loaded program, blocks and edges are built
+# in one pass over instruction list, dominators and loops are computed
+# when they are needed for the first time
+
+
+class ControlFlowGraph:
+    def __init__(self, instruction_list):
+        self.instruction_list = instruction_list
+        self.blocks = []
+        # block id of every instruction
+        self.block_ids = []
+        # called label entry block id to set of block ids with RETURN
+        self.functions = {}
+        self.idom = None
+        self.loop_list = None
+        self.build_blocks()
+        self.build_edges()
+
+    def build_blocks(self):
+        instruction_list = self.instruction_list
+        leaders = {0}
+        for i, inst in enumerate(instruction_list):
+            if inst.opcode == "LABEL":
+                leaders.add(i)
+            elif inst.opcode in ENDS:
+                leaders.add(i + 1)
+        starts = sorted(index for index in leaders
+                        if index < len(instruction_list))
+        for id, start in enumerate(starts):
+            end = starts[id + 1] if id + 1 < len(starts) \
+                else len(instruction_list)
+            self.blocks.append(BasicBlock(id, start, end))
+            self.block_ids.extend([id] * (end - start))
+
+    # block with given instruction index, None after end of program
+    def block_at(self, index):
+        if index is None or index >= len(self.block_ids):
+            return None
+        return self.blocks[self.block_ids[index]]
+
+    def add_edge(self, block, successor, kind):
+        if successor is None:
+            return
+        block.successors.append((successor, kind))
+        successor.predecessors.append((block, kind))
+
+    def build_edges(self):
+        calls = []
+        for block in self.blocks:
+            inst = self.instruction_list[block.last()]
+            opcode = inst.opcode
+            following = self.block_at(block.end)
+            # jump lands on instruction after label
+            target = getattr(inst, "target", None)
+            if opcode == "JUMP":
+                self.add_edge(block, self.block_at(target), JUMP)
+            elif opcode in BRANCHES:
+                self.add_edge(block, self.block_at(target), BRANCH)
+                self.add_edge(block, following, FALL)
+            elif opcode == "CALL":
+                self.add_edge(block, self.block_at(target), CALL)
+                calls.append((block, self.block_at(target), following))
+            elif opcode not in ("RETURN", "EXIT"):
+                self.add_edge(block, following, FALL)
+        # return goes back after every call of function containing it
+        for block, entry, following in calls:
+            if entry is None:
+                continue
+            if entry.id not in self.functions:
+                self.functions[entry.id] = self.returns(entry)
+            for id in self.functions[entry.id]:
+                self.add_edge(self.blocks[id], following, RETURN)
+
+    # blocks with RETURN reachable from function entry, calls inside
+    # function continue after call
+    def returns(self, entry):
+        found = set()
+        seen = {entry.id}
+        stack = [entry]
+        while stack:
+            block = stack.pop()
+            inst = self.instruction_list[block.last()]
+            if inst.opcode == "RETURN":
+                found.add(block.id)
+            successors = [successor for successor, kind in block.successors
+                          if kind != CALL]
+            if inst.opcode == "CALL":
+                successors.append(self.block_at(block.end))
+            for successor in successors:
+                if successor is not None and successor.id not in seen:
+                    seen.add(successor.id)
+                    stack.append(successor)
+        return found
+
+    # blocks reachable from entry in reverse postorder
+    def reverse_postorder(self):
+        if not self.blocks:
+            return []
+        order = []
+        seen = {0}
+        stack = [(self.blocks[0], iter(self.blocks[0].successors))]
+        while stack:
+            block, successors = stack[-1]
+            for successor, _ in successors:
+                if successor.id not in seen:
+                    seen.add(successor.id)
+                    stack.append((successor, iter(successor.successors)))
+                    break
+            else:
+                stack.pop()
+                order.append(block)
+        order.reverse()
+        return order
+
+    def reachable(self):
+        return {block.id for block in self.reverse_postorder()}
+
+    # immediate dominator of every reachable block by id, entry has itself
+    def dominators(self):
+        if self.idom is not None:
+            return self.idom
+        order = self.reverse_postorder()
+        position = {block.id: i for i, block in enumerate(order)}
+        idom = {}
+        if order:
+            idom[order[0].id] = order[0].id
+        changed = True
+        while changed:
+            changed = False
+            for block in order[1:]:
+                new = None
+                for predecessor, _ in block.predecessors:
+                    if predecessor.id not in idom:
+                        continue
+                    if new is None:
+                        new = predecessor.id
+                    else:
+                        new = self.intersect(predecessor.id, new, idom,
+                                             position)
+                if idom.get(block.id) != new:
+                    idom[block.id] = new
+                    changed = True
+        self.idom = idom
+        return idom
+
+    def intersect(self, first, second, idom, position):
+        while first != second:
+            while position[first] > position[second]:
+                first = idom[first]
+            while position[second] > position[first]:
+                second = idom[second]
+        return first
+
+    # does block a dominate block b
+    def dominates(self, a, b):
+        idom = self.dominators()
+        if b.id not in idom:
+            return False
+        id = b.id
+        while True:
+            if id == a.id:
+                return True
+            if idom[id] == id:
+                return False
+            id = idom[id]
+
+    # natural loops, one for every header
+    def loops(self):
+        if self.loop_list is not None:
+            return self.loop_list
+        loops = {}
+        for block in self.reverse_postorder():
+            for successor, _ in block.successors:
+                if self.dominates(successor, block):
+                    loop = loops.setdefault(successor.id, Loop(successor))
+                    loop.latches.append(block)
+                    self.loop_body(loop, block)
+        self.loop_list = [loops[id] for id in sorted(loops)]
+        return self.loop_list
+
+    # add blocks reaching latch without going through header
+    def loop_body(self, loop, latch):
+        stack = [latch]
+        while stack:
+            block = stack.pop()
+            if block.id in loop.body:
+                continue
+            loop.body.add(block.id)
+            for predecessor, _ in block.predecessors:
+                # unreachable blocks are not part of loop
+                if predecessor.id in self.idom:
+                    stack.append(predecessor)
+
+    # innermost loop containing instruction index, None if there is none
+    def loop_at(self, index):
+        block = self.block_at(index)
+        best = None
+        for loop in self.loops():
+            if block is not None and block.id in loop.body and \
+                    (best is None or len(loop.body) < len(best.body)):
+                best = loop
+        return best
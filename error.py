@@ -17,4 +17,127 @@ class ErrorNum(IntEnum):
     MISSING_VALUE = 56
     WRONG_OPERAND_VALUE = 57
     STRING_ERROR = 58
+    INSTRUCTION_LIMIT = 61
+    TIME_LIMIT = 62
+    STACK_LIMIT = 63
+    STRING_LIMIT = 64
     INTERNAL_ERR = 99
+
+# base class of errors of interpretation, command line interface writes
+# message to stderr and exits with code, order and opcode are of
+# instruction which failed, None if error is not caused by instruction
+
+
+class InterpretError(Exception):
+    code = ErrorNum.INTERNAL_ERR
+
+    def __init__(self, message, order=None, opcode=None):
+        super().__init__(message)
+        self.message = message
+        self.order = order
+        self.opcode = opcode
+
+    # set instruction which failed, first location is kept
+    def locate(self, order, opcode):
+        if self.order is None and self.opcode is None:
+            self.order = order
+            self.opcode = opcode
+        return self
+
+
+class ParamError(InterpretError):
+    code = ErrorNum.WRONG_PARAM
+
+
+class InputFileError(InterpretError):
+    code = ErrorNum.INPUT_FILE_ERR
+
+
+class OutputFileError(InterpretError):
+    code = ErrorNum.OUTPUT_FILE_ERR
+
+
+class XMLFormatError(InterpretError):
+    code = ErrorNum.WRONG_XML_FORMAT
+
+
+class XMLStructureError(InterpretError):
+    code = ErrorNum.WRONG_XML_STRUCTURE
+
+
+class SemanticError(InterpretError):
+    code = ErrorNum.SEMANTIC_ERROR
+
+
+class OperandTypeError(InterpretError):
+    code = ErrorNum.TYPE_ERROR
+
+
+class UndefinedVariableError(InterpretError):
+    code = ErrorNum.UNDEFINED_VARIABLE
+
+
+class MissingFrameError(InterpretError):
+    code = ErrorNum.MISSING_FRAME
+
+
+class MissingValueError(InterpretError):
+    code = ErrorNum.MISSING_VALUE
+
+
+class OperandValueError(InterpretError):
+    code = ErrorNum.WRONG_OPERAND_VALUE
+
+
+class StringError(InterpretError):
+    code = ErrorNum.STRING_ERROR
+
+
+class InternalError(InterpretError):
+    code = ErrorNum.INTERNAL_ERR
+
+# errors of exceeded resource limits of run
+
+
+class LimitError(InterpretError):
+    pass
+
+
+class InstructionLimitError(LimitError):
+    code = ErrorNum.INSTRUCTION_LIMIT
+
+
+class TimeLimitError(LimitError):
+    code = ErrorNum.TIME_LIMIT
+
+
+class StackLimitError(LimitError):
+    code = ErrorNum.STACK_LIMIT
+
+
+class StringLimitError(LimitError):
+    code = ErrorNum.STRING_LIMIT
+
+
+def subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from subclasses(subclass)
+
+
+# error class of every code
+ERRORS = {cls.code: cls for cls in subclasses(InterpretError)
+          if "code" in cls.__dict__}
+
+
+# error with code known only at runtime
+def make_error(code, message):
+    return ERRORS[code](message)
+
+# raised by EXIT instruction, command line interface exits with code
+
+
+class ProgramExit(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.code = code
@@ -1,87 +1,59 @@
 # factory.py
 # author: Jakub Kontrik xkontr02
 # Description: factory desing pattern module
-import sys
 from instructions import *
-from error import ErrorNum
+from error import XMLStructureError
 
 # factory class that creates instruction objects
 
 
 class Factory:
+    # instruction classes by opcode
+    instructions = {
+        'MOVE': Move,
+        'CREATEFRAME': CreateFrame,
+        'PUSHFRAME': PushFrame,
+        'POPFRAME': PopFrame,
+        'DEFVAR': DefVar,
+        'CALL': Call,
+        'RETURN': Return,
+        'PUSHS': PushS,
+        'POPS': PopS,
+        'ADD': Add,
+        'SUB': Sub,
+        'MUL': Mul,
+        'IDIV': IDiv,
+        'LT': Lt,
+        'GT': Gt,
+        'EQ': Eq,
+        'AND': And,
+        'OR': Or,
+        'NOT': Not,
+        'INT2CHAR': Int2Char,
+        'STRI2INT': Stri2Int,
+        'READ': Read,
+        'WRITE': Write,
+        'CONCAT': Concat,
+        'STRLEN': Strlen,
+        'GETCHAR': GetChar,
+        'SETCHAR': SetChar,
+        'TYPE': Type,
+        'LABEL': Label,
+        'JUMP': Jump,
+        'JUMPIFEQ': JumpIfEq,
+        'JUMPIFNEQ': JumpIfNeq,
+        'EXIT': Exit,
+        'DPRINT': DPrint,
+        'BREAK': Break,
+    }
+
     @classmethod
     def get_instruction(cls, string: str, interpret):
-        match string.upper():
-            case 'MOVE':
-                return Move(interpret)
-            case 'CREATEFRAME':
-                return CreateFrame(interpret)
-            case 'PUSHFRAME':
-                return PushFrame(interpret)
-            case 'POPFRAME':
-                return PopFrame(interpret)
-            case 'DEFVAR':
-                return DefVar(interpret)
-            case 'CALL':
-                return Call(interpret)
-            case 'RETURN':
-                return Return(interpret)
-            case 'PUSHS':
-                return PushS(interpret)
-            case 'POPS':
-                return PopS(interpret)
-            case 'ADD':
-                return Add(interpret)
-            case 'SUB':
-                return Sub(interpret)
-            case 'MUL':
-                return Mul(interpret)
-            case 'IDIV':
-                return IDiv(interpret)
-            case 'LT':
-                return Lt(interpret)
-            case 'GT':
-                return Gt(interpret)
-            case 'EQ':
-                return Eq(interpret)
-            case 'AND':
-                return And(interpret)
-            case 'OR':
-                return Or(interpret)
-            case 'NOT':
-                return Not(interpret)
-            case 'INT2CHAR':
-                return Int2Char(interpret)
-            case 'STRI2INT':
-                return Stri2Int(interpret)
-            case 'READ':
-                return Read(interpret)
-            case 'WRITE':
-                return Write(interpret)
-            case 'CONCAT':
-                return Concat(interpret)
-            case 'STRLEN':
-                return Strlen(interpret)
-            case 'GETCHAR':
-                return GetChar(interpret)
-            case 'SETCHAR':
-                return SetChar(interpret)
-            case 'TYPE':
-                return Type(interpret)
-            case 'LABEL':
-                return Label(interpret)
-            case 'JUMP':
-                return Jump(interpret)
-            case 'JUMPIFEQ':
-                return JumpIfEq(interpret)
-            case 'JUMPIFNEQ':
-                return JumpIfNeq(interpret)
-            case 'EXIT':
-                return Exit(interpret)
-            case 'DPRINT':
-                return DPrint(interpret)
-            case 'BREAK':
-                return Break(interpret)
-            case _:
-                sys.stderr.write("Error: Unknown instruction\n")
-                sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
+        instruction = cls.instructions.get(string.upper())
+        if instruction is None:
+            raise XMLStructureError("Error: Unknown instruction\n")
+        return instruction(interpret)
+
+    @classmethod
+    def is_instruction(cls, string: str):
+        return string.upper() in cls.instructions
@@ -16,3 +16,21 @@ class Frame:
 
     def get_vars(self):
         return self.vars
+
+# marker of variable slot without defined variable
+UNDEFINED = object()
+
+# class for frames with variables in fixed slots assigned at load time
+
+
+class SlotFrame:
+    __slots__ = ("names", "slots")
+
+    def __init__(self, names):
+        # names of slots are shared by all frames of same kind
+        self.names = names
+        self.slots = [UNDEFINED] * len(names)
+
+    def get_vars(self):
+        return {name: value for name, value in zip(self.names, self.slots)
+                if value is not UNDEFINED}
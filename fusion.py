@@ -0,0 +1,190 @@
+# fusion.py
+# author: Jakub Kontrik xkontr02
+# Description: module for fusing common instruction pairs to superinstructions
+
+from instructions import Instruction, StrBuf, same_var
+
+# types compared by LT, GT and EQ without error
+CMP_TYPES = (int, bool, str)
+
+# parent class for fused pair of instructions, fused instruction replaces
+# first instruction of pair and second one stays on its index, so jumps and
+# returns landing on it are not changed
+# fast path only handles cases without errors, everything else is done by
+# executing both original instructions, so the same error fires first
+
+
+class Fused(Instruction):
+    pattern = None
+
+    # Instruction.__init__ is not called, fused instruction is not added
+    # to instruction list
+    def __init__(self, first, second):
+        self.first = first
+        self.second = second
+        self.opcode = first.opcode
+        self.order = first.order
+        self.arguments = first.arguments
+        self.interpret = first.interpret
+        self.error = None
+
+    # pair is fused only if both instructions passed decode
+    @classmethod
+    def matches(cls, first, second):
+        return False
+
+    def link(self, labels):
+        pass
+
+    def slow(self):
+        self.first.execute()
+        # second instruction is executed on its own index
+        self.interpret.inst_index += 1
+        self.second.execute()
+
+    # variables of frame, None if frame does not exist
+    def frame_vars(self, frame):
+        interpret = self.interpret
+        if frame == "GF":
+            return interpret.global_frame.vars
+        if frame == "LF":
+            top = interpret.local_frames.top()
+            return None if top is None else top.vars
+        tmp = interpret.tmp_frame
+        return None if tmp is None else tmp.vars
+
+    # value of symbol, None if it is not defined or initialized
+    def value(self, arg):
+        if arg.frame is None:
+            return arg.value
+        vars = self.frame_vars(arg.frame)
+        if vars is None:
+            return None
+        value = vars.get(arg.name)
+        if type(value) is StrBuf:
+            return value.text()
+        return value
+
+    # variables of frame with defined variable, None otherwise
+    def dest_vars(self, arg):
+        vars = self.frame_vars(arg.frame)
+        if vars is None or arg.name not in vars:
+            return None
+        return vars
+
+## LT/GT/EQ <var> <symb1> <symb2> + JUMPIFEQ/JUMPIFNEQ <label> <var> bool ##
+
+
+class CompareBranch(Fused):
+    pattern = "compare-and-branch"
+
+    def __init__(self, first, second):
+        super().__init__(first, second)
+        # compared bool literal of jump
+        args = second.arguments
+        literal = args[2] if args[2].type == "bool" else args[1]
+        # jump is taken if result of comparison is equal to this
+        self.jump_on = literal.value == (second.opcode == "JUMPIFEQ")
+
+    @classmethod
+    def matches(cls, first, second):
+        if first.opcode not in ("LT", "GT", "EQ") or \
+                second.opcode not in ("JUMPIFEQ", "JUMPIFNEQ"):
+            return False
+        args = second.arguments
+        dest = first.arguments[0]
+        return (same_var(args[1], dest) and args[2].type == "bool") or \
+            (same_var(args[2], dest) and args[1].type == "bool")
+
+    def execute(self):
+        target = self.second.target
+        vars = self.dest_vars(self.arguments[0])
+        left = self.value(self.arguments[1])
+        right = self.value(self.arguments[2])
+        if target is None or vars is None or type(left) is not type(right) \
+                or type(left) not in CMP_TYPES:
+            self.slow()
+            return
+        if self.opcode == "LT":
+            result = left < right
+        elif self.opcode == "GT":
+            result = left > right
+        else:
+            result = left == right
+        vars[self.arguments[0].name] = result
+        if result == self.jump_on:
+            self.interpret.inst_index = target
+        else:
+            self.interpret.inst_index += 1
+
+## ADD/SUB <var> <symb1> <symb2> + JUMP <label> ##
+
+
+class IncrementJump(Fused):
+    pattern = "increment-and-jump"
+
+    @classmethod
+    def matches(cls, first, second):
+        return first.opcode in ("ADD", "SUB") and second.opcode == "JUMP"
+
+    def execute(self):
+        target = self.second.target
+        vars = self.dest_vars(self.arguments[0])
+        left = self.value(self.arguments[1])
+        right = self.value(self.arguments[2])
+        if target is None or vars is None or type(left) is not int \
+                or type(right) is not int:
+            self.slow()
+            return
+        if self.opcode == "ADD":
+            vars[self.arguments[0].name] = left + right
+        else:
+            vars[self.arguments[0].name] = left - right
+        self.interpret.inst_index = target
+
+## DEFVAR <var> + MOVE <var> <symb> ##
+
+
+class DefineInit(Fused):
+    pattern = "define-and-init"
+
+    @classmethod
+    def matches(cls, first, second):
+        return first.opcode == "DEFVAR" and second.opcode == "MOVE" and \
+            same_var(second.arguments[0], first.arguments[0])
+
+    def execute(self):
+        arg = self.arguments[0]
+        vars = self.frame_vars(arg.frame)
+        value = self.second.arguments[1]
+        # variable is defined by first instruction, so it is not initialized
+        if vars is None or arg.name in vars or same_var(value, arg):
+            self.slow()
+            return
+        value = self.value(value)
+        if value is None:
+            self.slow()
+            return
+        vars[arg.name] = value
+        self.interpret.inst_index += 1
+
+
+PATTERNS = (CompareBranch, IncrementJump, DefineInit)
+
+# replace fusable pairs in instruction list, list keeps its length
+
+
+def fuse(instruction_list):
+    i = 0
+    while i < len(instruction_list) - 1:
+        first = instruction_list[i]
+        second = instruction_list[i + 1]
+        if first.error is None and second.error is None and \
+                not isinstance(first, Fused):
+            for pattern in PATTERNS:
+                if pattern.matches(first, second):
+                    instruction_list[i] = pattern(first, second)
+                    i += 1
+                    break
+        i += 1
+    return instruction_list
@@ -0,0 +1,247 @@
+# inference.py
+# author: Jakub Kontrik xkontr02
+# Description: module for static type inference of global variables and
+# specialized instructions without proven dynamic checks
+from error import OperandValueError, StringError
+from instructions import Instruction, Nil, StrBuf, VAR
+
+# type of value written to destination by instruction which did not fail
+RESULTS = {
+    "ADD": "int", "SUB": "int", "MUL": "int", "IDIV": "int",
+    "STRLEN": "int", "STRI2INT": "int",
+    "LT": "bool", "GT": "bool", "EQ": "bool",
+    "AND": "bool", "OR": "bool", "NOT": "bool",
+    "CONCAT": "string", "GETCHAR": "string", "INT2CHAR": "string",
+    "SETCHAR": "string", "TYPE": "string",
+}
+
+# types of literal arguments
+LITERALS = ("int", "bool", "string", "nil")
+
+# class for forward dataflow analysis over control flow graph, state is dict
+# with types of global variables which are surely defined and initialized
+
+
+class TypeInference:
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.instruction_list = cfg.instruction_list
+        # state at start of every reachable block by id
+        self.states = {}
+        self.solve()
+
+    # type of symbol in state, None if it is not known
+    def symbol_type(self, arg, state):
+        if arg.type in LITERALS:
+            return arg.type
+        if arg.type == "var" and arg.frame == "GF":
+            return state.get(arg.name)
+        return None
+
+    # change state by one instruction, only instructions whose first
+    # operand is variable write to it
+    def transfer(self, inst, state):
+        args = inst.arguments
+        if not inst.operands or inst.operands[0] is not VAR or not args or \
+                args[0].type != "var" or args[0].frame != "GF":
+            return
+        name = args[0].name
+        if inst.error is None and inst.opcode == "MOVE":
+            result = self.symbol_type(args[1], state)
+        elif inst.error is None:
+            result = RESULTS.get(inst.opcode)
+        else:
+            result = None
+        if result is None:
+            state.pop(name, None)
+        else:
+            state[name] = result
+
+    def join(self, first, second):
+        return {name: type for name, type in first.items()
+                if second.get(name) == type}
+
+    def solve(self):
+        order = self.cfg.reverse_postorder()
+        if not order:
+            return
+        self.states[order[0].id] = {}
+        changed = True
+        while changed:
+            changed = False
+            for block in order:
+                if block.id not in self.states:
+                    continue
+                state = dict(self.states[block.id])
+                for index in range(block.start, block.end):
+                    self.transfer(self.instruction_list[index], state)
+                for successor, _ in block.successors:
+                    old = self.states.get(successor.id)
+                    new = state if old is None else self.join(old, state)
+                    if new != old:
+                        self.states[successor.id] = dict(new)
+                        changed = True
+
+    # state before every instruction of reachable blocks
+    def instruction_states(self):
+        for block in self.cfg.blocks:
+            if block.id not in self.states:
+                continue
+            state = dict(self.states[block.id])
+            for index in range(block.start, block.end):
+                inst = self.instruction_list[index]
+                yield index, inst, state
+                self.transfer(inst, state)
+
+# operations of specialized instructions, errors which do not depend
+# on types are still checked
+
+
+def idiv(left, right):
+    if right == 0:
+        raise OperandValueError("Error: Division by zero\n")
+    return int(left / right)
+
+
+def char_at(string, index):
+    if index > len(string) - 1 or index < 0:
+        raise StringError("Error: Wrong value\n")
+    return string[index]
+
+
+def int2char(value):
+    try:
+        return chr(value)
+    except ValueError:
+        raise StringError("Error: Wrong value\n")
+
+
+def equal(left, right):
+    if type(left) is Nil or type(right) is Nil:
+        return type(left) is type(right)
+    return left == right
+
+
+# opcode to (types of operands, operation)
+OPERATIONS = {
+    "ADD": (("int", "int"), lambda left, right: left + right),
+    "SUB": (("int", "int"), lambda left, right: left - right),
+    "MUL": (("int", "int"), lambda left, right: left * right),
+    "IDIV": (("int", "int"), idiv),
+    "CONCAT": (("string", "string"), lambda left, right: left + right),
+    "STRLEN": (("string",), len),
+    "GETCHAR": (("string", "int"), char_at),
+    "STRI2INT": (("string", "int"),
+                 lambda string, index: ord(char_at(string, index))),
+    "INT2CHAR": (("int",), int2char),
+    "AND": (("bool", "bool"), lambda left, right: left and right),
+    "OR": (("bool", "bool"), lambda left, right: left or right),
+    "NOT": (("bool",), lambda value: not value),
+}
+COMPARISONS = {
+    "LT": lambda left, right: left < right,
+    "GT": lambda left, right: left > right,
+    "EQ": equal,
+}
+
+# specialized variant of instruction whose operands have proven types,
+# operands are literals or initialized global variables, so they are read
+# without checks, destination is checked only if it is not proven defined
+# string variables may hold StrBuf, which is materialized
+
+
+class Specialized(Instruction):
+    # Instruction.__init__ is not called, instruction is not added
+    # to instruction list
+    def __init__(self, inst, operation, dest_proven, args, strings):
+        self.original = inst
+        self.opcode = inst.opcode
+        self.order = inst.order
+        self.arguments = inst.arguments
+        self.interpret = inst.interpret
+        self.error = None
+        self.operation = operation
+        self.globals = inst.interpret.global_frame.vars
+        self.dest_proven = dest_proven
+        # are some operands string variables
+        self.strings = strings
+        self.name = inst.arguments[0].name
+        # (name of global variable or None, value of literal)
+        self.sources = tuple((arg.name, None) if arg.type == "var"
+                              else (None, arg.value)
+                              for arg in args)
+
+    def execute(self):
+        if self.dest_proven:
+            vars = self.globals
+        else:
+            vars = self.check_var(self.arguments[0])
+        values = [value if name is None else self.globals[name]
+                  for name, value in self.sources]
+        if self.strings:
+            values = [value.text() if type(value) is StrBuf else value
+                      for value in values]
+        vars[self.name] = self.operation(*values)
+
+# specialized instruction with two operands, most common case
+
+
+class SpecializedBinary(Specialized):
+    def execute(self):
+        if self.dest_proven:
+            vars = self.globals
+        else:
+            vars = self.check_var(self.arguments[0])
+        (left_name, left), (right_name, right) = self.sources
+        if left_name is not None:
+            left = self.globals[left_name]
+        if right_name is not None:
+            right = self.globals[right_name]
+        if self.strings:
+            if type(left) is StrBuf:
+                left = left.text()
+            if type(right) is StrBuf:
+                right = right.text()
+        vars[self.name] = self.operation(left, right)
+
+# replace instructions whose operand types are proven, returns number
+# of specialized instructions
+
+
+def specialize(cfg):
+    inference = TypeInference(cfg)
+    instruction_list = cfg.instruction_list
+    replaced = []
+    for index, inst, state in inference.instruction_states():
+        if inst.error is not None or inst.opcode not in OPERATIONS and \
+                inst.opcode not in COMPARISONS:
+            continue
+        # concatenation to itself appends in place
+        if getattr(inst, "append", False):
+            continue
+        args = inst.arguments[1:]
+        types = [inference.symbol_type(arg, state) for arg in args]
+        if None in types:
+            continue
+        if inst.opcode in COMPARISONS:
+            # comparison of different types fails, nil is only for EQ
+            if types[0] != types[1] and not (
+                    inst.opcode == "EQ" and "nil" in types):
+                continue
+            if "nil" in types and inst.opcode != "EQ":
+                continue
+            operation = COMPARISONS[inst.opcode]
+        else:
+            required, operation = OPERATIONS[inst.opcode]
+            if tuple(types) != required:
+                continue
+        dest = inst.arguments[0]
+        dest_proven = dest.frame == "GF" and dest.name in state
+        variant = SpecializedBinary if len(types) == 2 else Specialized
+        strings = any(arg.type == "var" and type == "string"
+                      for arg, type in zip(args, types))
+        replaced.append((index, variant(inst, operation, dest_proven,
+                                                 args, strings)))
+    for index, inst in replaced:
+        instruction_list[index] = inst
+    return len(replaced)
@@ -0,0 +1,51 @@
+# input_reader.py
+# author: Jakub Kontrik xkontr02
+# Description: module for lazy reading of input lines for READ instruction
+import io
+import sys
+import os
+import mmap
+import locale
+
+# class for reading input lines one by one from file or stdin
+
+
+class InputReader:
+    # files from this size are memory mapped
+    MMAP_SIZE = 1 << 26
+
+    def __init__(self, path=None, text=None):
+        # if path is None read from stdin, text is read same way as file
+        if text is not None:
+            self.lines = self.file_lines(io.StringIO(text, newline=None))
+        elif path is None:
+            self.lines = None
+        elif os.path.getsize(path) >= self.MMAP_SIZE:
+            self.lines = self.mapped_lines(path)
+        else:
+            self.lines = self.file_lines(open(path, 'r'))
+
+    # get next line without line end, None at end of input
+    def readline(self):
+        if self.lines is None:
+            # same as input(), only trailing newline is removed
+            line = sys.stdin.readline()
+            if line == "":
+                return None
+            if line[-1] == "\n":
+                line = line[:-1]
+            return line
+        return next(self.lines, None)
+
+    # lines are split same way as str.splitlines() of whole file
+    def file_lines(self, file):
+        with file:
+            for chunk in file:
+                yield from chunk.splitlines()
+
+    def mapped_lines(self, path):
+        encoding = locale.getpreferredencoding(False)
+        with open(path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for chunk in iter(data.readline, b""):
+                    yield from chunk.decode(encoding).splitlines()
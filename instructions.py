@@ -3,86 +3,296 @@
 # Description: module for instruction classes
 
 from frame import Frame
-from error import ErrorNum
+from error import ErrorNum, ProgramExit, make_error, XMLStructureError, \
+    SemanticError, OperandTypeError, UndefinedVariableError, \
+    MissingFrameError, MissingValueError, OperandValueError, StringError, \
+    StringLimitError
 import sys
+from array import array, typecodes
 from interpret_class import Interpret
 import re
 
+# operand kinds checked once by Instruction.decode
+# (allowed argument types, error message, error code)
+VAR = (("var",), "Error: Wrong XML structure\n", ErrorNum.WRONG_XML_STRUCTURE)
+LABEL = (("label",), "Error: Wrong XML structure\n",
+         ErrorNum.WRONG_XML_STRUCTURE)
+TYPE = (("type",), "Error: Wrong XML structure\n",
+        ErrorNum.WRONG_XML_STRUCTURE)
+SYMB = (("var", "int", "bool", "string", "nil"),
+        "Error: Wrong XML structure\n", ErrorNum.WRONG_XML_STRUCTURE)
+ANY = (("var", "int", "bool", "string", "nil", "label", "type"),
+       "Error: Wrong XML structure\n", ErrorNum.WRONG_XML_STRUCTURE)
+INT_SYMB = (("var", "int"), "Error: Wrong XML structure\n",
+            ErrorNum.TYPE_ERROR)
+BOOL_SYMB = (("var", "bool"), "Error: Wrong XML structure\n",
+             ErrorNum.TYPE_ERROR)
+STR_SYMB = (("var", "string"), "Error: Wrong XML structure\n",
+            ErrorNum.TYPE_ERROR)
+CMP_SYMB = (("var", "int", "bool", "string"), "Error: Wrong XML structure\n",
+            ErrorNum.TYPE_ERROR)
+EQ_SYMB = (("var", "int", "bool", "string", "nil"),
+           "Error: Wrong XML structure\n", ErrorNum.TYPE_ERROR)
+
 # parent class for all instructions
 
 
 class Instruction:
-    # shared list of all instructions
-    instruction_list = []
-
-    def __init__(self, opcode, interpret: Interpret):
-        self.opcode = opcode
-        self.instruction_list.append(self)
-        self.arguments = []
+    # operand kinds of instruction, None means arguments are not checked
+    operands = ()
+    # opcode is attribute of class, instances only have slots
+    opcode = None
+    # kinds of value of first variable operand which is read before it is
+    # written, None if variable is only written
+    dest_kinds = None
+    __slots__ = ("order", "arguments", "error", "interpret")
+
+    def __init__(self, interpret: Interpret):
+        # order attribute from xml, set by loader
+        self.order = None
+        self.arguments = ()
+        # static error found by decode, reported when instruction is executed
+        self.error = None
         # interpret class for accessing global variables and runtime checking
         self.interpret = interpret
 
     def execute(self):
         pass
 
-    def set_arg(self, arg):
-        self.arguments.append(Argument(arg.attrib.get('type'), arg.text))
-    # check if variable is defined in given frame
+    # interpret is not stored with cached program
+    def __getstate__(self):
+        return {name: getattr(self, name)
+                for cls in type(self).__mro__
+                for name in cls.__dict__.get("__slots__", ())
+                if name != "interpret" and hasattr(self, name)}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    # literals is pool of decoded string literals of loaded program
+    def set_arg(self, arg, literals=None):
+        self.arguments += (Argument(arg.attrib.get('type'), arg.text,
+                                    literals),)
+
+    # verify arity and operand kinds once after all arguments are set
+    # and split variables to frame and name
+    def decode(self):
+        for arg in self.arguments:
+            if arg.type == "var":
+                frame, name = arg.value.split('@', 1)
+                arg.frame, arg.name = sys.intern(frame), sys.intern(name)
+        if self.operands is None:
+            return
+        if len(self.arguments) != len(self.operands):
+            self.set_error("Error: Wrong XML structure\n",
+                           ErrorNum.WRONG_XML_STRUCTURE)
+            return
+        for i, (arg, (types, message, code)) in enumerate(
+                zip(self.arguments, self.operands)):
+            if arg.type not in types:
+                self.set_error(message, code, i)
+                return
+        self.verify()
+
+    # instruction specific static checks
+    def verify(self):
+        pass
+
+    # resolve label of control flow instruction to instruction index
+    # None means undefined label, reported when instruction is executed
+    def link(self, labels):
+        pass
 
-    def check_var(self, frame, name):
+    # instruction with static error only reports it when executed,
+    # its class is changed to variant whose execute reports the error,
+    # index is operand on which the error was found
+    def set_error(self, message, code, index=0):
+        self.error = (message, code, index)
+        self.__class__ = ERROR_VARIANTS[type(self)]
+
+    # operands are checked in the same order as before static checks, so
+    # errors of operands before the wrong one are reported first
+    def raise_error(self):
+        for arg, kinds in self.checks():
+            if arg.type == "label":
+                if self.target is None:
+                    raise SemanticError("Error: Missing label\n")
+            elif kinds is None:
+                self.check_var(arg)
+            elif KINDS[type(self.get_symb(arg))] not in kinds:
+                raise OperandTypeError("Error: Wrong type\n")
+        raise make_error(self.error[1], self.error[0])
+
+    # dynamic checks of operands before operand with static error as
+    # (argument, kinds of its value), kinds are None for variable which is
+    # only written, label has to be defined
+    def checks(self):
+        checks = []
+        for i, (arg, (types, _, _)) in enumerate(
+                zip(self.arguments[:self.error[2]], self.operands)):
+            if arg.type == "label":
+                checks.append((arg, None))
+            elif types == ("var",):
+                checks.append((arg, self.dest_kinds if i == 0 else None))
+            elif arg.type == "var":
+                checks.append((arg, tuple(kind for kind in types
+                                          if kind != "var")))
+        return checks
+
+    # get variables of given frame
+    def get_frame(self, frame):
         if frame == "GF":
-            if name not in self.interpret.global_frame.vars:
-                sys.stderr.write("Error: Variable not defined\n")
-                sys.exit(ErrorNum.UNDEFINED_VARIABLE)
+            return self.interpret.global_frame.vars
         elif frame == "LF":
             if self.interpret.local_frames.is_empty():
-                sys.stderr.write("Error: Frame does not exist\n")
-                sys.exit(ErrorNum.MISSING_FRAME)
-            if name not in self.interpret.local_frames.top().vars:
-                sys.stderr.write("Error: Variable not defined\n")
-                sys.exit(ErrorNum.UNDEFINED_VARIABLE)
-        elif frame == "TF":
-            if self.interpret.tmp_frame is None:
-                sys.stderr.write("Error: Frame does not exist\n")
-                sys.exit(ErrorNum.MISSING_FRAME)
-            if name not in self.interpret.tmp_frame.vars:
-                sys.stderr.write("Error: Variable not defined\n")
-                sys.exit(ErrorNum.UNDEFINED_VARIABLE)
+                raise MissingFrameError("Error: Frame does not exist\n")
+            return self.interpret.local_frames.top().vars
+        if self.interpret.tmp_frame is None:
+            raise MissingFrameError("Error: Frame does not exist\n")
+        return self.interpret.tmp_frame.vars
+
+    # check if variable is defined in its frame and return the frame variables
+    def check_var(self, arg):
+        if arg.frame == "GF":
+            vars = self.interpret.global_frame.vars
+        else:
+            vars = self.get_frame(arg.frame)
+        if arg.name not in vars:
+            raise UndefinedVariableError("Error: Variable not defined\n")
+        return vars
+
+    # get variable value, may be None if not initialized
+    def get_var(self, arg):
+        return self.check_var(arg)[arg.name]
+
+    # get value of symbol, variables have to be initialized
+    def get_symb(self, arg, message="Error: Variable not set\n"):
+        if arg.frame is None:
+            return arg.value
+        if arg.frame == "GF":
+            vars = self.interpret.global_frame.vars
+        else:
+            vars = self.get_frame(arg.frame)
+        if arg.name not in vars:
+            raise UndefinedVariableError("Error: Variable not defined\n")
+        value = vars[arg.name]
+        if value is None:
+            raise MissingValueError(message)
+        if type(value) is StrBuf:
+            return value.text()
+        return value
+
+    # get value of string symbol, mutable string is returned as it is
+    # because its length and characters are read without materializing
+    def get_string(self, arg):
+        if arg.frame is None:
+            value = arg.value
         else:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-    # get variable from given frame
+            if arg.frame == "GF":
+                vars = self.interpret.global_frame.vars
+            else:
+                vars = self.get_frame(arg.frame)
+            if arg.name not in vars:
+                raise UndefinedVariableError("Error: Variable not defined\n")
+            value = vars[arg.name]
+            if value is None:
+                raise MissingValueError("Error: Variable not set\n")
+        if type(value) != str and type(value) is not StrBuf:
+            raise OperandTypeError("Error: Wrong type\n")
+        return value
 
-    def get_var(self, frame, name):
-        if frame == "GF":
-            return self.interpret.global_frame.get_var(name)
-        elif frame == "LF":
-            return self.interpret.local_frames.top().get_var(name)
-        elif frame == "TF":
-            return self.interpret.tmp_frame.get_var(name)
-    # set variable in given frame
+# same variable as other argument
 
-    def set_var(self, frame, name, value):
-        if frame == "GF":
-            self.interpret.global_frame.set_var(name, value)
-        elif frame == "LF":
-            self.interpret.local_frames.top().set_var(name, value)
-        elif frame == "TF":
-            self.interpret.tmp_frame.set_var(name, value)
 
-# class for nil type
+def same_var(arg, other):
+    return arg.type == "var" and arg.frame == other.frame and \
+        arg.name == other.name
+
+# class for nil type, there is only one nil value
 
 
 class Nil:
-    def __init__(self):
-        self.value = None
+    __slots__ = ()
+    instance = None
+
+    def __new__(cls):
+        if cls.instance is None:
+            cls.instance = super().__new__(cls)
+        return cls.instance
+
+# kind of every value of variable, as in symbol operands
+KINDS = {int: "int", bool: "bool", str: "string", Nil: "nil"}
+
+# class for string value of variable built by CONCAT to itself or changed
+# by SETCHAR, characters are appended and set in place and str is created
+# only when the value is read by other instruction
+
+
+class StrBuf:
+    # shorter strings are still copied
+    THRESHOLD = 256
+    # array of unicode characters, 'u' is deprecated where 'w' exists
+    TYPECODE = 'w' if 'w' in typecodes else 'u'
+
+    def __init__(self, string):
+        self.chars = array(self.TYPECODE, string)
+        # materialized value, None after change
+        self.string = string
+
+    def append(self, string):
+        self.chars.fromunicode(string)
+        self.string = None
+
+    def set(self, index, char):
+        self.chars[index] = char
+        self.string = None
+
+    def text(self):
+        if self.string is None:
+            self.string = self.chars.tounicode()
+        return self.string
+
+    def __len__(self):
+        return len(self.chars)
+
+    def __getitem__(self, index):
+        return self.chars[index]
+
+# escape sequence of string literal
+ESCAPE = re.compile(r'\\(\d{3})')
+
+
+def decode_escape(match):
+    return chr(int(match.group(1)))
+
+
+# decode string literal, literal without backslash has no escape sequence,
+# literals is dictionary of decoded literals by text, so equal literals of
+# one program share one value and are decoded only once
+def decode_string(text, literals=None):
+    if literals is not None:
+        value = literals.get(text)
+        if value is not None:
+            return value
+    value = str(text)
+    if '\\' in value:
+        value = ESCAPE.sub(decode_escape, value)
+    if literals is not None:
+        literals[text] = value
+    return value
 
 # class for instruction arguments
 
 
 class Argument:
-    def __init__(self, type, value: str):
+    __slots__ = ("type", "frame", "name", "value")
+
+    def __init__(self, type, value: str, literals=None):
         self.type = type
+        # frame and name of variable, set by Instruction.decode
+        self.frame = None
+        self.name = None
         if type == "bool":
             if value == "true":
                 self.value = True
@@ -95,74 +305,50 @@ class Argument:
             try:
                 self.value = int(value, 0)
             except ValueError:
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        # format escape sequences
+                raise XMLStructureError("Error: Wrong XML structure\n")
+        # format escape sequences, literal is decoded only once
         elif type == "string":
-            self.value = str(value)
-            self.value = re.sub(r'\\(\d{3})', lambda x: chr(
-                int(x.group(1))), self.value)
+            self.value = decode_string(value, literals)
         elif type == "var":
-            self.value = value
+            # names repeat across program, one copy of each is kept
+            self.value = sys.intern(value)
         elif type == "nil" and value == "nil":
             self.value = Nil()
         elif type == "label":
-            self.value = value
+            self.value = sys.intern(value)
         elif type == "type":
-            self.value = value
+            self.value = sys.intern(value)
         else:
-            sys.stderr.write("TODO ERROR\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
+            raise XMLStructureError("Error: Wrong XML structure\n")
 
 ## INSTRUCTIONS ##
 ## MOVE <var> <symb> ##
 
 
 class Move(Instruction):
-    def __init__(self, interpret):
-        super().__init__("MOVE", interpret)
+    operands = (VAR, SYMB)
+    opcode = "MOVE"
+    __slots__ = ()
+
+    # kinds of both operands are checked before variables
+    def checks(self):
+        return []
 
     def execute(self):
-        # validate arguments
-        if len(self.arguments) != 2:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[1].type in ["type", "label"]:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        # get frame and name of variable
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        value = 0
-        # if second argument is variable, get its value
-        if self.arguments[1].type == "var":
-            frame_2, name_2 = self.arguments[1].value.split('@', 1)
-            self.check_var(frame_2, name_2)
-            value = self.get_var(frame_2, name_2)
-            # check if variable is initialized
-            if value is None:
-                sys.stderr.write("Error: Variable not defined\n")
-                sys.exit(ErrorNum.MISSING_VALUE)
-        # if second argument is not variable, get its value
-        else:
-            value = self.arguments[1].value
-        self.set_var(frame, name, value)
+        vars = self.check_var(self.arguments[0])
+        # check if variable is initialized
+        value = self.get_symb(self.arguments[1],
+                              "Error: Variable not defined\n")
+        vars[self.arguments[0].name] = value
 
 ## CREATEFRAME ##
 
 
 class CreateFrame(Instruction):
-    def __init__(self, interpret):
-        super().__init__("CREATEFRAME", interpret)
+    opcode = "CREATEFRAME"
+    __slots__ = ()
 
     def execute(self):
-        # validate arguments
-        if len(self.arguments) != 0:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
         # create new tmp frame
         self.interpret.tmp_frame = Frame()
 
@@ -170,18 +356,13 @@ class CreateFrame(Instruction):
 
 
 class PushFrame(Instruction):
-    def __init__(self, interpret):
-        super().__init__("PUSHFRAME", interpret)
+    opcode = "PUSHFRAME"
+    __slots__ = ()
 
     def execute(self):
-        # validate arguments
-        if len(self.arguments) != 0:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
         # if no tmp frame, exit with error
         if self.interpret.tmp_frame is None:
-            sys.stderr.write("Error: Temp frame does not exist\n")
-            sys.exit(ErrorNum.MISSING_FRAME)
+            raise MissingFrameError("Error: Temp frame does not exist\n")
         # push tmp frame to local frames stack
         self.interpret.local_frames.push(self.interpret.tmp_frame)
         self.interpret.tmp_frame = None
@@ -190,1096 +371,659 @@ class PushFrame(Instruction):
 
 
 class PopFrame(Instruction):
-    def __init__(self, interpret):
-        super().__init__("POPFRAME", interpret)
+    opcode = "POPFRAME"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 0:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
         # if no local frames, exit with error
         if self.interpret.local_frames.is_empty():
-            sys.stderr.write("Error: Temp frame does not exist\n")
-            sys.exit(ErrorNum.MISSING_FRAME)
+            raise MissingFrameError("Error: Temp frame does not exist\n")
         self.interpret.tmp_frame = self.interpret.local_frames.pop()
 
 ## DEFVAR <var> ##
 
 
 class DefVar(Instruction):
-    def __init__(self, interpret):
-        super().__init__("DEFVAR", interpret)
+    operands = (VAR,)
+    opcode = "DEFVAR"
+    __slots__ = ()
 
     def execute(self):
-        # validate arguments
-        if len(self.arguments) != 1:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
+        vars = self.get_frame(self.arguments[0].frame)
         # check if variable is already defined
-        if frame == "GF":
-            if name in self.interpret.global_frame.vars:
-                sys.stderr.write("Error: Variable already defined\n")
-                sys.exit(ErrorNum.SEMANTIC_ERROR)
-            self.interpret.global_frame.set_var(name, None)
-        elif frame == "LF":
-            if self.interpret.local_frames.is_empty():
-                sys.stderr.write("Error: Frame does not exist\n")
-                sys.exit(ErrorNum.MISSING_FRAME)
-            if name in self.interpret.local_frames.top().vars:
-                sys.stderr.write("Error: Variable already defined\n")
-                sys.exit(ErrorNum.SEMANTIC_ERROR)
-            self.interpret.local_frames.top().set_var(name, None)
-        elif frame == "TF":
-            if self.interpret.tmp_frame is None:
-                sys.stderr.write("Error: Frame does not exist\n")
-                sys.exit(ErrorNum.MISSING_FRAME)
-            if name in self.interpret.tmp_frame.vars:
-                sys.stderr.write("Error: Variable already defined\n")
-                sys.exit(ErrorNum.SEMANTIC_ERROR)
-            self.interpret.tmp_frame.set_var(name, None)
-        else:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
+        if self.arguments[0].name in vars:
+            raise SemanticError("Error: Variable already defined\n")
+        vars[self.arguments[0].name] = None
 
 ## Call <label> ##
 
 
 class Call(Instruction):
+    operands = (LABEL,)
+    opcode = "CALL"
+    __slots__ = ("target",)
+
     def __init__(self, interpret):
-        super().__init__("CALL", interpret)
+        super().__init__(interpret)
+        self.target = None
+
+    def link(self, labels):
+        # instruction without arguments reports its arity error
+        if self.arguments:
+            self.target = labels.get(self.arguments[0].value)
 
     def execute(self):
-        if len(self.arguments) != 1:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "label":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].value not in self.interpret.labels:
-            sys.stderr.write("Error: Label does not exist\n")
-            sys.exit(ErrorNum.SEMANTIC_ERROR)
+        if self.target is None:
+            raise SemanticError("Error: Label does not exist\n")
         # push current instruction index to call stack
         self.interpret.call_stack.push(self.interpret.inst_index)
         # set instruction index to label index
-        self.interpret.inst_index = self.interpret.labels[self.arguments[0].value]
+        self.interpret.inst_index = self.target
 
 ## Return ##
 
 
 class Return(Instruction):
-    def __init__(self, interpret):
-        super().__init__("RETURN", interpret)
+    opcode = "RETURN"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 0:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
         # if call stack is empty, exit with error
         if self.interpret.call_stack.is_empty():
-            sys.stderr.write("Error: Call stack is empty\n")
-            sys.exit(ErrorNum.MISSING_VALUE)
+            raise MissingValueError("Error: Call stack is empty\n")
         self.interpret.inst_index = self.interpret.call_stack.pop()
 
 ## PUSHS <symb> ##
 
 
 class PushS(Instruction):
-    def __init__(self, interpret):
-        super().__init__("PUSHS", interpret)
+    operands = (SYMB,)
+    opcode = "PUSHS"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 1:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type in ["type", "label"]:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        # if variable, check if it is defined
-        if self.arguments[0].type == "var":
-            frame, name = self.arguments[0].value.split('@', 1)
-            self.check_var(frame, name)
-            # if variable is not defined, exit with error
-            if self.get_var(frame, name) is None:
-                sys.stderr.write("Error: Empty var\n")
-                sys.exit(ErrorNum.MISSING_VALUE)
-            self.interpret.data_stack.push(self.get_var(frame, name))
-        else:
-            self.interpret.data_stack.push(self.arguments[0].value)
+        # if variable is not defined, exit with error
+        self.interpret.data_stack.push(
+            self.get_symb(self.arguments[0], "Error: Empty var\n"))
 
 ## POPS <var> ##
 
 
 class PopS(Instruction):
-    def __init__(self, interpret):
-        super().__init__("POPS", interpret)
+    operands = (VAR,)
+    opcode = "POPS"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 1:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
         if self.interpret.data_stack.is_empty():
-            sys.stderr.write("Error: EMPTY STACK\n")
-            sys.exit(ErrorNum.MISSING_VALUE)
-        frame, name = self.arguments[0].value.split('@', 1)
+            raise MissingValueError("Error: EMPTY STACK\n")
         # check if variable is defined
-        self.check_var(frame, name)
-        self.set_var(frame, name, self.interpret.data_stack.pop())
+        vars = self.check_var(self.arguments[0])
+        vars[self.arguments[0].name] = self.interpret.data_stack.pop()
 
 ## ADD <var> <symb1> <symb2> ##
 
 
 class Add(Instruction):
-    def __init__(self, interpret):
-        super().__init__("ADD", interpret)
+    operands = (VAR, INT_SYMB, INT_SYMB)
+    opcode = "ADD"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 3:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        numbers = [None, None]
-        # loop through symb1 and symb2
-        for i, var in enumerate(self.arguments[1:]):
-            # if symb is variable check if it is defined
-            if var.type == "var":
-                frame_2, name_2 = var.value.split('@', 1)
-                self.check_var(frame_2, name_2)
-                numbers[i] = self.get_var(frame_2, name_2)
-                # check if variable is initialized
-                if numbers[i] is None:
-                    sys.stderr.write("Error: Variable not set\n")
-                    sys.exit(ErrorNum.MISSING_VALUE)
-                # dynamic type check
-                if type(numbers[i]) != int:
-                    sys.stderr.write("Error: Wrong type\n")
-                    sys.exit(ErrorNum.TYPE_ERROR)
-            elif var.type == "int":
-                numbers[i] = var.value
-            else:
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
-        self.set_var(frame, name, numbers[0] + numbers[1])
+        vars = self.check_var(self.arguments[0])
+        # dynamic type check of symb1 and symb2
+        left = self.get_symb(self.arguments[1])
+        if type(left) != int:
+            raise OperandTypeError("Error: Wrong type\n")
+        right = self.get_symb(self.arguments[2])
+        if type(right) != int:
+            raise OperandTypeError("Error: Wrong type\n")
+        vars[self.arguments[0].name] = left + right
 
 ## SUB <var> <symb1> <symb2> ##
 
 
 class Sub(Instruction):
-    def __init__(self, interpret):
-        super().__init__("SUB", interpret)
+    operands = (VAR, INT_SYMB, INT_SYMB)
+    opcode = "SUB"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 3:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        numbers = [None, None]
-        # loop through symb1 and symb2
-        for i, var in enumerate(self.arguments[1:]):
-            # if symb is variable check if it is defined
-            if var.type == "var":
-                frame_2, name_2 = var.value.split('@', 1)
-                self.check_var(frame_2, name_2)
-                numbers[i] = self.get_var(frame_2, name_2)
-                # check if variable is initialized
-                if numbers[i] is None:
-                    sys.stderr.write("Error: Variable not set\n")
-                    sys.exit(ErrorNum.MISSING_VALUE)
-                # dynamic type check
-                if type(numbers[i]) != int:
-                    sys.stderr.write("Error: Wrong type\n")
-                    sys.exit(ErrorNum.TYPE_ERROR)
-            elif var.type == "int":
-                numbers[i] = var.value
-            else:
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
-        self.set_var(frame, name, numbers[0] - numbers[1])
+        vars = self.check_var(self.arguments[0])
+        # dynamic type check of symb1 and symb2
+        left = self.get_symb(self.arguments[1])
+        if type(left) != int:
+            raise OperandTypeError("Error: Wrong type\n")
+        right = self.get_symb(self.arguments[2])
+        if type(right) != int:
+            raise OperandTypeError("Error: Wrong type\n")
+        vars[self.arguments[0].name] = left - right
 
 ## MUL <var> <symb1> <symb2> ##
 
 
 class Mul(Instruction):
-    def __init__(self, interpret):
-        super().__init__("MUL", interpret)
+    operands = (VAR, INT_SYMB, INT_SYMB)
+    opcode = "MUL"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 3:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        numbers = [None, None]
-        # loop through symb1 and symb2
-        for i, var in enumerate(self.arguments[1:]):
-            # if symb is variable check if it is defined
-            if var.type == "var":
-                frame_2, name_2 = var.value.split('@', 1)
-                self.check_var(frame_2, name_2)
-                numbers[i] = self.get_var(frame_2, name_2)
-                if numbers[i] is None:
-                    sys.stderr.write("Error: Variable not set\n")
-                    sys.exit(ErrorNum.MISSING_VALUE)
-                # dynamic type check
-                if type(numbers[i]) != int:
-                    sys.stderr.write("Error: Wrong type\n")
-                    sys.exit(ErrorNum.TYPE_ERROR)
-            elif var.type == "int":
-                numbers[i] = var.value
-            else:
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
-        self.set_var(frame, name, numbers[0] * numbers[1])
+        vars = self.check_var(self.arguments[0])
+        # dynamic type check of symb1 and symb2
+        left = self.get_symb(self.arguments[1])
+        if type(left) != int:
+            raise OperandTypeError("Error: Wrong type\n")
+        right = self.get_symb(self.arguments[2])
+        if type(right) != int:
+            raise OperandTypeError("Error: Wrong type\n")
+        vars[self.arguments[0].name] = left * right
 
 ## DIV <var> <symb1> <symb2> ##
 
 
 class IDiv(Instruction):
-    def __init__(self, interpret):
-        super().__init__("IDIV", interpret)
+    operands = (VAR, INT_SYMB, INT_SYMB)
+    opcode = "IDIV"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 3:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        numbers = [None, None]
-        # loop through symb1 and symb2
-        for i, var in enumerate(self.arguments[1:]):
-            # if symb is variable check if it is defined
-            if var.type == "var":
-                frame_2, name_2 = var.value.split('@', 1)
-                self.check_var(frame_2, name_2)
-                numbers[i] = self.get_var(frame_2, name_2)
-                # check if variable is initialized
-                if numbers[i] is None:
-                    sys.stderr.write("Error: Variable not set\n")
-                    sys.exit(ErrorNum.MISSING_VALUE)
-                # dynamic type check
-                if type(numbers[i]) != int:
-                    sys.stderr.write("Error: Wrong type\n")
-                    sys.exit(ErrorNum.TYPE_ERROR)
-            elif var.type == "int":
-                numbers[i] = var.value
-            else:
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
+        vars = self.check_var(self.arguments[0])
+        # dynamic type check of symb1 and symb2
+        left = self.get_symb(self.arguments[1])
+        if type(left) != int:
+            raise OperandTypeError("Error: Wrong type\n")
+        right = self.get_symb(self.arguments[2])
+        if type(right) != int:
+            raise OperandTypeError("Error: Wrong type\n")
         # handle zero division exception
         try:
-            self.set_var(frame, name, int(numbers[0] / numbers[1]))
+            vars[self.arguments[0].name] = int(left / right)
         except ZeroDivisionError:
-            sys.stderr.write("Error: Division by zero\n")
-            sys.exit(ErrorNum.WRONG_OPERAND_VALUE)
+            raise OperandValueError("Error: Division by zero\n")
 
 ## LT <var> <symb1> <symb2> ##
 
 
 class Lt(Instruction):
-    def __init__(self, interpret):
-        super().__init__("LT", interpret)
+    operands = (VAR, CMP_SYMB, CMP_SYMB)
+    opcode = "LT"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 3:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        numbers = [None, None]
-        # loop through symb1 and symb2
-        for i, var in enumerate(self.arguments[1:]):
-            # if symb is variable check if it is defined
-            if var.type == "var":
-                frame_2, name_2 = var.value.split('@', 1)
-                self.check_var(frame_2, name_2)
-                numbers[i] = self.get_var(frame_2, name_2)
-                # check if variable is initialized
-                if numbers[i] is None:
-                    sys.stderr.write("Error: Variable not set\n")
-                    sys.exit(ErrorNum.MISSING_VALUE)
-                # dynamic type check
-                if type(numbers[i]) != int and type(numbers[i]) != bool and type(numbers[i]) != str:
-                    sys.stderr.write("Error: Wrong type\n")
-                    sys.exit(ErrorNum.TYPE_ERROR)
-            elif var.type == "int" or var.type == "bool" or var.type == "string":
-                numbers[i] = var.value
-            else:
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
+        vars = self.check_var(self.arguments[0])
+        # dynamic type check of symb1 and symb2
+        left = self.get_symb(self.arguments[1])
+        if type(left) != int and type(left) != bool and type(left) != str:
+            raise OperandTypeError("Error: Wrong type\n")
+        right = self.get_symb(self.arguments[2])
+        if type(right) != int and type(right) != bool and type(right) != str:
+            raise OperandTypeError("Error: Wrong type\n")
         # check if types are the same
-        if type(numbers[0]) != type(numbers[1]):
-            sys.stderr.write("Error: Wrong type\n")
-            sys.exit(ErrorNum.TYPE_ERROR)
-        self.set_var(frame, name, numbers[0] < numbers[1])
+        if type(left) != type(right):
+            raise OperandTypeError("Error: Wrong type\n")
+        vars[self.arguments[0].name] = left < right
 
 ## GT <var> <symb1> <symb2> ##
 
 
 class Gt(Instruction):
-    def __init__(self, interpret):
-        super().__init__("GT", interpret)
+    operands = (VAR, CMP_SYMB, CMP_SYMB)
+    opcode = "GT"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 3:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        numbers = [None, None]
-        for i, var in enumerate(self.arguments[1:]):
-            if var.type == "var":
-                frame_2, name_2 = var.value.split('@', 1)
-                self.check_var(frame_2, name_2)
-                numbers[i] = self.get_var(frame_2, name_2)
-                if numbers[i] is None:
-                    sys.stderr.write("Error: Variable not set\n")
-                    sys.exit(ErrorNum.MISSING_VALUE)
-                if type(numbers[i]) != int and type(numbers[i]) != bool and type(numbers[i]) != str:
-                    sys.stderr.write("Error: Wrong type\n")
-                    sys.exit(ErrorNum.TYPE_ERROR)
-            elif var.type == "int" or var.type == "bool" or var.type == "string":
-                numbers[i] = var.value
-            else:
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
-        if type(numbers[0]) != type(numbers[1]):
-            sys.stderr.write("Error: Wrong type\n")
-            sys.exit(ErrorNum.TYPE_ERROR)
-        self.set_var(frame, name, numbers[0] > numbers[1])
+        vars = self.check_var(self.arguments[0])
+        left = self.get_symb(self.arguments[1])
+        if type(left) != int and type(left) != bool and type(left) != str:
+            raise OperandTypeError("Error: Wrong type\n")
+        right = self.get_symb(self.arguments[2])
+        if type(right) != int and type(right) != bool and type(right) != str:
+            raise OperandTypeError("Error: Wrong type\n")
+        if type(left) != type(right):
+            raise OperandTypeError("Error: Wrong type\n")
+        vars[self.arguments[0].name] = left > right
 
 ## EQ <var> <symb1> <symb2> ##
 
 
 class Eq(Instruction):
-    def __init__(self, interpret):
-        super().__init__("EQ", interpret)
+    operands = (VAR, EQ_SYMB, EQ_SYMB)
+    opcode = "EQ"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 3:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        numbers = [None, None]
-        for i, var in enumerate(self.arguments[1:]):
-            if var.type == "var":
-                frame_2, name_2 = var.value.split('@', 1)
-                self.check_var(frame_2, name_2)
-                numbers[i] = self.get_var(frame_2, name_2)
-                if numbers[i] is None:
-                    sys.stderr.write("Error: Variable not set\n")
-                    sys.exit(ErrorNum.MISSING_VALUE)
-                # dynamic type check
-                if type(numbers[i]) != int and type(numbers[i]) != bool and type(numbers[i]) != str and type(numbers[i]) != Nil:
-                    sys.stderr.write("Error: Wrong type\n")
-                    sys.exit(ErrorNum.TYPE_ERROR)
-            elif var.type == "int" or var.type == "bool" or var.type == "string" or var.type == "nil":
-                numbers[i] = var.value
-            else:
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
+        vars = self.check_var(self.arguments[0])
+        # dynamic type check
+        left = self.get_symb(self.arguments[1])
+        if type(left) != int and type(left) != bool and type(left) != str and type(left) != Nil:
+            raise OperandTypeError("Error: Wrong type\n")
+        right = self.get_symb(self.arguments[2])
+        if type(right) != int and type(right) != bool and type(right) != str and type(right) != Nil:
+            raise OperandTypeError("Error: Wrong type\n")
         # if at least one is nil
-        if Nil in [type(numbers[0]), type(numbers[1])]:
-            self.set_var(frame, name, type(numbers[0]) == type(numbers[1]))
+        if type(left) == Nil or type(right) == Nil:
+            vars[self.arguments[0].name] = type(left) == type(right)
             return
         # check same type
-        if type(numbers[0]) != type(numbers[1]):
-            sys.stderr.write("Error: Wrong type\n")
-            sys.exit(ErrorNum.TYPE_ERROR)
-        self.set_var(frame, name, numbers[0] == numbers[1])
+        if type(left) != type(right):
+            raise OperandTypeError("Error: Wrong type\n")
+        vars[self.arguments[0].name] = left == right
 
 ## AND <var> <symb1> <symb2> ##
 
 
 class And(Instruction):
-    def __init__(self, interpret):
-        super().__init__("AND", interpret)
+    operands = (VAR, BOOL_SYMB, BOOL_SYMB)
+    opcode = "AND"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 3:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        numbers = [None, None]
-        for i, var in enumerate(self.arguments[1:]):
-            if var.type == "var":
-                frame_2, name_2 = var.value.split('@', 1)
-                self.check_var(frame_2, name_2)
-                numbers[i] = self.get_var(frame_2, name_2)
-                if numbers[i] is None:
-                    sys.stderr.write("Error: Variable not set\n")
-                    sys.exit(ErrorNum.MISSING_VALUE)
-                if type(numbers[i]) != bool:
-                    sys.stderr.write("Error: Wrong type\n")
-                    sys.exit(ErrorNum.TYPE_ERROR)
-            elif var.type == "bool":
-                numbers[i] = var.value
-            else:
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
-        self.set_var(frame, name, numbers[0] and numbers[1])
+        vars = self.check_var(self.arguments[0])
+        left = self.get_symb(self.arguments[1])
+        if type(left) != bool:
+            raise OperandTypeError("Error: Wrong type\n")
+        right = self.get_symb(self.arguments[2])
+        if type(right) != bool:
+            raise OperandTypeError("Error: Wrong type\n")
+        vars[self.arguments[0].name] = left and right
 
 ## OR <var> <symb1> <symb2> ##
 
 
 class Or(Instruction):
-    def __init__(self, interpret):
-        super().__init__("OR", interpret)
+    operands = (VAR, BOOL_SYMB, BOOL_SYMB)
+    opcode = "OR"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 3:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        numbers = [None, None]
-        for i, var in enumerate(self.arguments[1:]):
-            if var.type == "var":
-                frame_2, name_2 = var.value.split('@', 1)
-                self.check_var(frame_2, name_2)
-                numbers[i] = self.get_var(frame_2, name_2)
-                if numbers[i] is None:
-                    sys.stderr.write("Error: Variable not set\n")
-                    sys.exit(ErrorNum.MISSING_VALUE)
-                if type(numbers[i]) != bool:
-                    sys.stderr.write("Error: Wrong type\n")
-                    sys.exit(ErrorNum.TYPE_ERROR)
-            elif var.type == "bool":
-                numbers[i] = var.value
-            else:
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
-        self.set_var(frame, name, numbers[0] or numbers[1])
+        vars = self.check_var(self.arguments[0])
+        left = self.get_symb(self.arguments[1])
+        if type(left) != bool:
+            raise OperandTypeError("Error: Wrong type\n")
+        right = self.get_symb(self.arguments[2])
+        if type(right) != bool:
+            raise OperandTypeError("Error: Wrong type\n")
+        vars[self.arguments[0].name] = left or right
 
 ## NOT <var> <symb> ##
 
 
 class Not(Instruction):
-    def __init__(self, interpret):
-        super().__init__("NOT", interpret)
+    operands = (VAR, BOOL_SYMB)
+    opcode = "NOT"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 2:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        value = None
-        if self.arguments[1].type == "var":
-            frame_2, name_2 = self.arguments[1].value.split('@', 1)
-            self.check_var(frame_2, name_2)
-            value = self.get_var(frame_2, name_2)
-            if value is None:
-                sys.stderr.write("Error: Variable not set\n")
-                sys.exit(ErrorNum.MISSING_VALUE)
-            if type(value) != bool:
-                sys.stderr.write("Error: Wrong type\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
-        elif self.arguments[1].type == "bool":
-            value = self.arguments[1].value
-        else:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.TYPE_ERROR)
-        self.set_var(frame, name, not (value))
+        vars = self.check_var(self.arguments[0])
+        value = self.get_symb(self.arguments[1])
+        if type(value) != bool:
+            raise OperandTypeError("Error: Wrong type\n")
+        vars[self.arguments[0].name] = not (value)
 
 # INT2CHAR <var> <symb> #
 
 
 class Int2Char(Instruction):
-    def __init__(self, interpret):
-        super().__init__("INT2CHAR", interpret)
+    operands = (VAR, (("var", "int"), "Error: Wrong type\n",
+                      ErrorNum.TYPE_ERROR))
+    opcode = "INT2CHAR"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 2:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        value = None
-        if self.arguments[1].type == "var":
-            frame_2, name_2 = self.arguments[1].value.split('@', 1)
-            self.check_var(frame_2, name_2)
-            value = self.get_var(frame_2, name_2)
-            if value is None:
-                sys.stderr.write("Error: Variable not set\n")
-                sys.exit(ErrorNum.MISSING_VALUE)
-            if type(value) != int:
-                sys.stderr.write("Error: Wrong type\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
-        elif self.arguments[1].type == "int":
-            value = self.arguments[1].value
+        vars = self.check_var(self.arguments[0])
+        value = self.get_symb(self.arguments[1])
+        if type(value) != int:
+            raise OperandTypeError("Error: Wrong type\n")
         try:
-            result = chr(value)
-            self.set_var(frame, name, result)
-        except TypeError:
-            sys.stderr.write("Error: Wrong type\n")
-            sys.exit(ErrorNum.TYPE_ERROR)
+            char = chr(value)
         except ValueError:
-            sys.stderr.write("Error: Wrong value\n")
-            sys.exit(ErrorNum.STRING_ERROR)
+            raise StringError("Error: Wrong value\n")
+        name = self.arguments[0].name
+        interpret = self.interpret
+        interpret.string_budget -= 1
+        if interpret.string_budget < 0:
+            interpret.limits.reclaim(interpret, 1, vars[name])
+        vars[name] = char
 
 ## STRI2INT <var> <symb1> <symb2> ##
 
 
 class Stri2Int(Instruction):
-    def __init__(self, interpret):
-        super().__init__("STRI2INT", interpret)
+    operands = (VAR, STR_SYMB, INT_SYMB)
+    opcode = "STRI2INT"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 3:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        string = None
-        index = None
-        for i, var in enumerate(self.arguments[1:]):
-            if var.type == "var":
-                frame_2, name_2 = var.value.split('@', 1)
-                self.check_var(frame_2, name_2)
-                if i == 0:
-                    string = self.get_var(frame_2, name_2)
-                    if string is None:
-                        sys.stderr.write("Error: Variable not set\n")
-                        sys.exit(ErrorNum.MISSING_VALUE)
-                    if type(string) != str:
-                        sys.stderr.write("Error: Wrong type\n")
-                        sys.exit(ErrorNum.TYPE_ERROR)
-                else:
-                    index = self.get_var(frame_2, name_2)
-                    if index is None:
-                        sys.stderr.write("Error: Variable not set\n")
-                        sys.exit(ErrorNum.MISSING_VALUE)
-                    if type(index) != int:
-                        sys.stderr.write("Error: Wrong type\n")
-                        sys.exit(ErrorNum.TYPE_ERROR)
-            elif var.type == "string":
-                if i == 0:
-                    string = var.value
-                else:
-                    sys.stderr.write("Error: Wrong XML structure\n")
-                    sys.exit(ErrorNum.TYPE_ERROR)
-            elif var.type == "int":
-                if i == 1:
-                    index = var.value
-                else:
-                    sys.stderr.write("Error: Wrong XML structure\n")
-                    sys.exit(ErrorNum.TYPE_ERROR)
-            else:
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
+        vars = self.check_var(self.arguments[0])
+        string = self.get_string(self.arguments[1])
+        index = self.get_symb(self.arguments[2])
+        if type(index) != int:
+            raise OperandTypeError("Error: Wrong type\n")
         ## Check if index is in range ##
         if index > len(string) - 1 or index < 0:
-            sys.stderr.write("Error: Wrong value\n")
-            sys.exit(ErrorNum.STRING_ERROR)
-        self.set_var(frame, name, ord(string[index]))
+            raise StringError("Error: Wrong value\n")
+        vars[self.arguments[0].name] = ord(string[index])
 
 ## READ <var> <type> ##
 
 
 class Read(Instruction):
-    def __init__(self, interpret):
-        super().__init__("READ", interpret)
+    operands = (VAR, TYPE)
+    opcode = "READ"
+    __slots__ = ()
 
-    def execute(self):
-        if len(self.arguments) != 2:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        if self.arguments[1].type != "type":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
+    def verify(self):
         if self.arguments[1].value not in ["int", "string", "bool"]:
-            sys.stderr.write("Error: wrong opereand value\n")
-            sys.exit(ErrorNum.WRONG_OPERAND_VALUE)
-        ## decide if input is from stdin or from input_data ##
-        if self.interpret.input_data == None:
-            # if eof, set var to nil
-            try:
-                value = input()
-            except EOFError:
-                self.set_var(frame, name, Nil())
-                return
-            if self.arguments[1].value == "bool":
-                if value.lower() == "true":
-                    self.set_var(frame, name, True)
-                else:
-                    self.set_var(frame, name, False)
-            elif self.arguments[1].value == "int":
-                # if input is wrong number set var to nil
-                try:
-                    self.set_var(frame, name, int(value))
-                except ValueError:
-                    self.set_var(frame, name, Nil())
+            self.set_error("Error: wrong opereand value\n",
+                           ErrorNum.WRONG_OPERAND_VALUE, 1)
+
+    def execute(self):
+        vars = self.check_var(self.arguments[0])
+        name = self.arguments[0].name
+        # if end of input, set var to nil
+        value = self.interpret.input.readline()
+        if value is None:
+            vars[name] = Nil()
+            return
+        if self.arguments[1].value == "bool":
+            if value.lower() == "true":
+                vars[name] = True
             else:
-                self.set_var(frame, name, value)
-        # wroking with saved input data
+                vars[name] = False
+        elif self.arguments[1].value == "int":
+            # if input is wrong number set var to nil
+            try:
+                vars[name] = int(value)
+            except ValueError:
+                vars[name] = Nil()
         else:
-            if len(self.interpret.input_data) == 0:
-                self.set_var(frame, name, Nil())
-                return
-            value = self.interpret.input_data.pop(0)
-            if self.arguments[1].value == "bool":
-                if value.lower() == "true":
-                    self.set_var(frame, name, True)
-                else:
-                    self.set_var(frame, name, False)
-            elif self.arguments[1].value == "int":
-                try:
-                    self.set_var(frame, name, int(value))
-                except ValueError:
-                    self.set_var(frame, name, Nil())
-            else:
-                self.set_var(frame, name, value)
+            interpret = self.interpret
+            interpret.string_budget -= len(value)
+            if interpret.string_budget < 0:
+                interpret.limits.reclaim(interpret, len(value), vars[name])
+            vars[name] = value
 
 ## WRITE <symb> ##
 
 
 class Write(Instruction):
-    def __init__(self, interpret):
-        super().__init__("WRITE", interpret)
+    operands = (SYMB,)
+    opcode = "WRITE"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 1:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type in ["label", "type"]:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type == "var":
-            frame, name = self.arguments[0].value.split('@', 1)
-            self.check_var(frame, name)
-            value = self.get_var(frame, name)
-            # check if var is initialized
-            if value is None:
-                sys.stderr.write("Error: Variable not set\n")
-                sys.exit(ErrorNum.MISSING_VALUE)
-        else:
-            value = self.arguments[0].value
+        # check if var is initialized
+        value = self.get_symb(self.arguments[0])
         if type(value) == bool:
             if value == True:
-                print("true", end="")
+                self.interpret.output.write("true")
             else:
-                print("false", end="")
-        elif type(value) == Nil:
-            print("", end="")
-        else:
-            print(value, end="")
+                self.interpret.output.write("false")
+        elif type(value) != Nil:
+            self.interpret.output.write(str(value))
 
 ## CONCAT <var> <symb> <symb> ##
 
 
 class Concat(Instruction):
+    operands = (VAR, (("var", "string"), "Error: Wrong type\n",
+                      ErrorNum.TYPE_ERROR),
+                (("var", "string"), "Error: Wrong type\n",
+                 ErrorNum.TYPE_ERROR))
+    opcode = "CONCAT"
+    __slots__ = ("append",)
+
     def __init__(self, interpret):
-        super().__init__("CONCAT", interpret)
+        super().__init__(interpret)
+        # is result appended to first operand in place
+        self.append = False
+
+    def verify(self):
+        self.append = same_var(self.arguments[1], self.arguments[0])
 
     def execute(self):
-        if len(self.arguments) != 3:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        strings = [None, None]
-        for i, var in enumerate(self.arguments[1:]):
-            if var.type == "var":
-                frame2, name2 = var.value.split('@', 1)
-                self.check_var(frame2, name2)
-                strings[i] = self.get_var(frame2, name2)
-                # check if var is initialized
-                if strings[i] is None:
-                    sys.stderr.write("Error: Variable not set\n")
-                    sys.exit(ErrorNum.MISSING_VALUE)
-                # check if var is string
-                if type(strings[i]) != str:
-                    sys.stderr.write("Error: Wrong type\n")
-                    sys.exit(ErrorNum.TYPE_ERROR)
-            elif var.type == "string":
-                strings[i] = var.value
-            else:
-                sys.stderr.write("Error: Wrong type\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
-        self.set_var(frame, name, strings[0] + strings[1])
+        vars = self.check_var(self.arguments[0])
+        name = self.arguments[0].name
+        if self.append and type(vars[name]) is StrBuf:
+            right = self.get_symb(self.arguments[2])
+            if type(right) != str:
+                raise OperandTypeError("Error: Wrong type\n")
+            interpret = self.interpret
+            interpret.string_budget -= len(right)
+            if interpret.string_budget < 0:
+                interpret.limits.reclaim(interpret, len(right), None)
+            vars[name].append(right)
+            return
+        # check if vars are initialized strings
+        left = self.get_symb(self.arguments[1])
+        if type(left) != str:
+            raise OperandTypeError("Error: Wrong type\n")
+        right = self.get_symb(self.arguments[2])
+        if type(right) != str:
+            raise OperandTypeError("Error: Wrong type\n")
+        size = len(left) + len(right)
+        interpret = self.interpret
+        interpret.string_budget -= size
+        if interpret.string_budget < 0:
+            interpret.limits.reclaim(interpret, size, vars[name])
+        if self.append and size >= StrBuf.THRESHOLD:
+            string = StrBuf(left)
+            string.append(right)
+            vars[name] = string
+        else:
+            vars[name] = left + right
 
 ## STRLEN <var> <symb> ##
 
 
 class Strlen(Instruction):
-    def __init__(self, interpret):
-        super().__init__("STRLEN", interpret)
+    operands = (VAR, (("var", "string"), "Error: Wrong type\n",
+                      ErrorNum.TYPE_ERROR))
+    opcode = "STRLEN"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 2:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        if self.arguments[1].type == "var":
-            frame2, name2 = self.arguments[1].value.split('@', 1)
-            self.check_var(frame2, name2)
-            var = self.get_var(frame2, name2)
-            # check if var is initialized
-            if var is None:
-                sys.stderr.write("Error: Variable not set\n")
-                sys.exit(ErrorNum.MISSING_VALUE)
-            # check if var is string
-            if type(var) != str:
-                sys.stderr.write("Error: Wrong type\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
-        elif self.arguments[1].type == "string":
-            var = self.arguments[1].value
-        else:
-            sys.stderr.write("Error: Wrong type\n")
-            sys.exit(ErrorNum.TYPE_ERROR)
-        self.set_var(frame, name, len(var))
+        vars = self.check_var(self.arguments[0])
+        # check if var is initialized string
+        string = self.get_string(self.arguments[1])
+        vars[self.arguments[0].name] = len(string)
 
 ## GETCHAR <var> <symb> <symb> ##
 
 
 class GetChar(Instruction):
-    def __init__(self, interpret):
-        super().__init__("GETCHAR", interpret)
+    operands = (VAR, STR_SYMB, INT_SYMB)
+    opcode = "GETCHAR"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 3:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        string = None
-        index = None
-        # loop through arguments
-        for i, var in enumerate(self.arguments[1:]):
-            if var.type == "var":
-                frame_2, name_2 = var.value.split('@', 1)
-                self.check_var(frame_2, name_2)
-                if i == 0:
-                    string = self.get_var(frame_2, name_2)
-                    if string is None:
-                        sys.stderr.write("Error: Variable not set\n")
-                        sys.exit(ErrorNum.MISSING_VALUE)
-                    if type(string) != str:
-                        sys.stderr.write("Error: Wrong type\n")
-                        sys.exit(ErrorNum.TYPE_ERROR)
-                else:
-                    index = self.get_var(frame_2, name_2)
-                    if index is None:
-                        sys.stderr.write("Error: Variable not set\n")
-                        sys.exit(ErrorNum.MISSING_VALUE)
-                    if type(index) != int:
-                        sys.stderr.write("Error: Wrong type\n")
-                        sys.exit(ErrorNum.TYPE_ERROR)
-            elif var.type == "string":
-                if i == 0:
-                    string = var.value
-                else:
-                    sys.stderr.write("Error: Wrong XML structure\n")
-                    sys.exit(ErrorNum.TYPE_ERROR)
-            elif var.type == "int":
-                if i == 1:
-                    index = var.value
-                else:
-                    sys.stderr.write("Error: Wrong XML structure\n")
-                    sys.exit(ErrorNum.TYPE_ERROR)
-            else:
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
+        vars = self.check_var(self.arguments[0])
+        string = self.get_string(self.arguments[1])
+        index = self.get_symb(self.arguments[2])
+        if type(index) != int:
+            raise OperandTypeError("Error: Wrong type\n")
         # check if index is in string
         if index > len(string) - 1 or index < 0:
-            sys.stderr.write("Error: Wrong value\n")
-            sys.exit(ErrorNum.STRING_ERROR)
-        self.set_var(frame, name, string[index])
+            raise StringError("Error: Wrong value\n")
+        name = self.arguments[0].name
+        interpret = self.interpret
+        interpret.string_budget -= 1
+        if interpret.string_budget < 0:
+            interpret.limits.reclaim(interpret, 1, vars[name])
+        vars[name] = string[index]
 
 ## SETCHAR <var> <symb> <symb> ##
 
 
 class SetChar(Instruction):
-    def __init__(self, interpret):
-        super().__init__("SETCHAR", interpret)
+    operands = (VAR, INT_SYMB, STR_SYMB)
+    opcode = "SETCHAR"
+    dest_kinds = ("string",)
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 3:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
-        string = self.get_var(frame, name)
-        if string is None:
-            sys.stderr.write("Error: Variable not set\n")
-            sys.exit(ErrorNum.MISSING_VALUE)
-        if type(string) != str:
-            sys.stderr.write("Error: Wrong type\n")
-            sys.exit(ErrorNum.TYPE_ERROR)
-        index = None
-        char = None
-        for i, var in enumerate(self.arguments[1:]):
-            if var.type == "var":
-                frame_2, name_2 = var.value.split('@', 1)
-                self.check_var(frame_2, name_2)
-                if i == 0:
-                    index = self.get_var(frame_2, name_2)
-                    if index is None:
-                        sys.stderr.write("Error: Variable not set\n")
-                        sys.exit(ErrorNum.MISSING_VALUE)
-                    if type(index) != int:
-                        sys.stderr.write("Error: Wrong type\n")
-                        sys.exit(ErrorNum.TYPE_ERROR)
-                else:
-                    char = self.get_var(frame_2, name_2)
-                    if char is None:
-                        sys.stderr.write("Error: Variable not set\n")
-                        sys.exit(ErrorNum.MISSING_VALUE)
-                    if type(char) != str:
-                        sys.stderr.write("Error: Wrong type\n")
-                        sys.exit(ErrorNum.TYPE_ERROR)
-            elif var.type == "int":
-                if i == 0:
-                    index = var.value
-                else:
-                    sys.stderr.write("Error: Wrong XML structure\n")
-                    sys.exit(ErrorNum.TYPE_ERROR)
-            elif var.type == "string":
-                if i == 1:
-                    char = var.value
-                else:
-                    sys.stderr.write("Error: Wrong XML structure\n")
-                    sys.exit(ErrorNum.TYPE_ERROR)
-            else:
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
+        vars = self.check_var(self.arguments[0])
+        string = self.get_string(self.arguments[0])
+        index = self.get_symb(self.arguments[1])
+        if type(index) != int:
+            raise OperandTypeError("Error: Wrong type\n")
+        char = self.get_symb(self.arguments[2])
+        if type(char) != str:
+            raise OperandTypeError("Error: Wrong type\n")
         # check if index is in string and char is at least 1 char long
         if index > len(string) - 1 or index < 0 or len(char) == 0:
-            sys.stderr.write("Error: Wrong value\n")
-            sys.exit(ErrorNum.STRING_ERROR)
-        self.set_var(frame, name, string[:index] +
-                     char[0] + string[index + 1:])
+            raise StringError("Error: Wrong value\n")
+        name = self.arguments[0].name
+        if type(string) is StrBuf:
+            string.set(index, char[0])
+            return
+        interpret = self.interpret
+        interpret.string_budget -= len(string)
+        if interpret.string_budget < 0:
+            interpret.limits.reclaim(interpret, len(string), vars[name])
+        if len(string) >= StrBuf.THRESHOLD:
+            vars[name] = StrBuf(string)
+            vars[name].set(index, char[0])
+        else:
+            vars[name] = string[:index] + char[0] + string[index + 1:]
 
 ## TYPE <var> <symb> ##
 
 
 class Type(Instruction):
-    def __init__(self, interpret):
-        super().__init__("TYPE", interpret)
+    operands = (VAR, ANY)
+    opcode = "TYPE"
+    __slots__ = ()
 
     def execute(self):
-        if len(self.arguments) != 2:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "var":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        frame, name = self.arguments[0].value.split('@', 1)
-        self.check_var(frame, name)
+        vars = self.check_var(self.arguments[0])
+        name = self.arguments[0].name
         var = self.arguments[1]
         if var.type == "var":
-            frame_2, name_2 = var.value.split('@', 1)
-            self.check_var(frame_2, name_2)
-            var = self.get_var(frame_2, name_2)
+            var = self.get_var(var)
             if var is None:
-                self.set_var(frame, name, "")
+                vars[name] = ""
             else:
                 match type(var).__name__:
                     case "int":
-                        self.set_var(frame, name, "int")
-                    case "str":
-                        self.set_var(frame, name, "string")
+                        vars[name] = "int"
+                    case "str" | "StrBuf":
+                        vars[name] = "string"
                     case "bool":
-                        self.set_var(frame, name, "bool")
+                        vars[name] = "bool"
                     case "Nil":
-                        self.set_var(frame, name, "nil")
+                        vars[name] = "nil"
         else:
-            self.set_var(frame, name, var.type)
+            vars[name] = var.type
 
 ## LABEL <label> ##
 
 
 class Label(Instruction):
-    def __init__(self, interpret):
-        super().__init__("LABEL", interpret)
-
-    def execute(self):
-        if len(self.arguments) != 1:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "label":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
+    operands = (LABEL,)
+    opcode = "LABEL"
+    __slots__ = ()
 
 ## JUMP <label> ##
 
 
 class Jump(Instruction):
+    operands = (LABEL,)
+    opcode = "JUMP"
+    __slots__ = ("target",)
+
     def __init__(self, interpret):
-        super().__init__("JUMP", interpret)
+        super().__init__(interpret)
+        self.target = None
+
+    def link(self, labels):
+        # instruction without arguments reports its arity error
+        if self.arguments:
+            self.target = labels.get(self.arguments[0].value)
 
     def execute(self):
-        if len(self.arguments) != 1:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "label":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if not (self.arguments[0].value in self.interpret.labels):
-            sys.stderr.write("Error: Missing label\n")
-            sys.exit(ErrorNum.SEMANTIC_ERROR)
+        if self.target is None:
+            raise SemanticError("Error: Missing label\n")
         # set instruction index to label index
-        self.interpret.inst_index = self.interpret.labels[self.arguments[0].value]
+        self.interpret.inst_index = self.target
 
 ## JUMPIFEQ <label> <symb1> <symb2> ##
 
 
 class JumpIfEq(Instruction):
+    operands = (LABEL, EQ_SYMB, EQ_SYMB)
+    opcode = "JUMPIFEQ"
+    __slots__ = ("target",)
+
     def __init__(self, interpret):
-        super().__init__("JUMPIFEQ", interpret)
+        super().__init__(interpret)
+        self.target = None
+
+    def link(self, labels):
+        # instruction without arguments reports its arity error
+        if self.arguments:
+            self.target = labels.get(self.arguments[0].value)
 
     def execute(self):
-        if len(self.arguments) != 3:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "label":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if not (self.arguments[0].value in self.interpret.labels):
-            sys.stderr.write("Error: Missing label\n")
-            sys.exit(ErrorNum.SEMANTIC_ERROR)
-        numbers = [None, None]
-        for i, var in enumerate(self.arguments[1:]):
-            if var.type == "var":
-                frame_2, name_2 = var.value.split('@', 1)
-                self.check_var(frame_2, name_2)
-                numbers[i] = self.get_var(frame_2, name_2)
-                if numbers[i] is None:
-                    sys.stderr.write("Error: Variable not set\n")
-                    sys.exit(ErrorNum.MISSING_VALUE)
-            elif var.type == "int" or var.type == "bool" or var.type == "string" or var.type == "nil":
-                numbers[i] = var.value
-            else:
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
+        if self.target is None:
+            raise SemanticError("Error: Missing label\n")
+        left = self.get_symb(self.arguments[1])
+        right = self.get_symb(self.arguments[2])
         # check if one var is nil
-        if Nil in [type(numbers[0]), type(numbers[1])]:
-            if type(numbers[0]) == type(numbers[1]):
-                self.interpret.inst_index = self.interpret.labels[self.arguments[0].value]
+        if type(left) == Nil or type(right) == Nil:
+            if type(left) == type(right):
+                self.interpret.inst_index = self.target
             return
-        if type(numbers[0]) != type(numbers[1]):
-            sys.stderr.write("Error: Wrong type\n")
-            sys.exit(ErrorNum.TYPE_ERROR)
-        if numbers[0] == numbers[1]:
-            self.interpret.inst_index = self.interpret.labels[self.arguments[0].value]
+        if type(left) != type(right):
+            raise OperandTypeError("Error: Wrong type\n")
+        if left == right:
+            self.interpret.inst_index = self.target
 
 ## JUMPIFNEQ <label> <symb1> <symb2> ##
 
 
 class JumpIfNeq(Instruction):
+    operands = (LABEL, EQ_SYMB, EQ_SYMB)
+    opcode = "JUMPIFNEQ"
+    __slots__ = ("target",)
+
     def __init__(self, interpret):
-        super().__init__("JUMPIFNEQ", interpret)
+        super().__init__(interpret)
+        self.target = None
+
+    def link(self, labels):
+        # instruction without arguments reports its arity error
+        if self.arguments:
+            self.target = labels.get(self.arguments[0].value)
 
     def execute(self):
-        if len(self.arguments) != 3:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type != "label":
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if not (self.arguments[0].value in self.interpret.labels):
-            sys.stderr.write("Error: Missing label\n")
-            sys.exit(ErrorNum.SEMANTIC_ERROR)
-        numbers = [None, None]
-        for i, var in enumerate(self.arguments[1:]):
-            if var.type == "var":
-                frame_2, name_2 = var.value.split('@', 1)
-                self.check_var(frame_2, name_2)
-                numbers[i] = self.get_var(frame_2, name_2)
-                if numbers[i] is None:
-                    sys.stderr.write("Error: Variable not set\n")
-                    sys.exit(ErrorNum.MISSING_VALUE)
-            elif var.type == "int" or var.type == "bool" or var.type == "string" or var.type == "nil":
-                numbers[i] = var.value
-            else:
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
-        if Nil in [type(numbers[0]), type(numbers[1])]:
-            if type(numbers[0]) != type(numbers[1]):
-                self.interpret.inst_index = self.interpret.labels[self.arguments[0].value]
+        if self.target is None:
+            raise SemanticError("Error: Missing label\n")
+        left = self.get_symb(self.arguments[1])
+        right = self.get_symb(self.arguments[2])
+        if type(left) == Nil or type(right) == Nil:
+            if type(left) != type(right):
+                self.interpret.inst_index = self.target
             return
-        if type(numbers[0]) != type(numbers[1]):
-            sys.stderr.write("Error: Wrong type\n")
-            sys.exit(ErrorNum.TYPE_ERROR)
-        if numbers[0] != numbers[1]:
-            self.interpret.inst_index = self.interpret.labels[self.arguments[0].value]
+        if type(left) != type(right):
+            raise OperandTypeError("Error: Wrong type\n")
+        if left != right:
+            self.interpret.inst_index = self.target
 
 
 class DPrint(Instruction):
-    def __init__(self, interpret):
-        super().__init__("DPRINT", interpret)
+    operands = None
+    opcode = "DPRINT"
+    __slots__ = ()
 
     def execute(self):
         pass
 
 
 class Break(Instruction):
-    def __init__(self, interpret):
-        super().__init__("BREAK", interpret)
+    operands = None
+    opcode = "BREAK"
+    __slots__ = ()
 
     def execute(self):
         pass
@@ -1288,31 +1032,35 @@ class Break(Instruction):
 
 
 class Exit(Instruction):
-    def __init__(self, interpret):
-        super().__init__("EXIT", interpret)
+    operands = (INT_SYMB,)
+    opcode = "EXIT"
+    __slots__ = ()
 
-    def execute(self):
-        if len(self.arguments) != 1:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.arguments[0].type == "var":
-            frame_2, name_2 = self.arguments[0].value.split('@', 1)
-            self.check_var(frame_2, name_2)
-            if self.get_var(frame_2, name_2) is None:
-                sys.stderr.write("Error: Variable not set\n")
-                sys.exit(ErrorNum.MISSING_VALUE)
-            if type(self.get_var(frame_2, name_2)) != int:
-                sys.stderr.write("Error: Wrong type\n")
-                sys.exit(ErrorNum.TYPE_ERROR)
-            value = self.get_var(frame_2, name_2)
-            sys.exit(self.get_var(frame_2, name_2))
-        elif self.arguments[0].type == "int":
-            value = self.arguments[0].value
-        else:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.TYPE_ERROR)
+    def verify(self):
         # check if value is not in range
-        if value < 0 or value > 49:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_OPERAND_VALUE)
-        sys.exit(int(value))
+        value = self.arguments[0].value
+        if self.arguments[0].type == "int" and (value < 0 or value > 49):
+            self.set_error("Error: Wrong XML structure\n",
+                           ErrorNum.WRONG_OPERAND_VALUE)
+
+    def execute(self):
+        value = self.get_symb(self.arguments[0])
+        if type(value) != int:
+            raise OperandTypeError("Error: Wrong type\n")
+        self.interpret.output.flush()
+        raise ProgramExit(int(value))
+
+# variant of every instruction class for instructions with static error,
+# variants are attributes of module, so they can be pickled
+
+
+def error_variant(cls):
+    return type(cls.__name__ + "Error", (cls,), {
+        "__slots__": (), "__module__": __name__,
+        "execute": Instruction.raise_error})
+
+
+ERROR_VARIANTS = {cls: error_variant(cls)
+                  for cls in Instruction.__subclasses__()}
+globals().update((variant.__name__, variant)
+                 for variant in ERROR_VARIANTS.values())
@@ -2,47 +2,119 @@
 # author: Jakub Kontrik xkontr02
 # Description: main module for interpretation
 import sys
-import xml.etree.ElementTree as ET
-from error import ErrorNum
+from error import ErrorNum, InterpretError, ProgramExit
 from arg_parse import ArgumentParser
-from xmlvalidator import XMLValidator
-from factory import Factory
+from loader import Loader
+from cache import ProgramCache
 from interpret_class import Interpret
+from bytecode import Bytecode, Machine
+from output import ErrorStream
+from stats import Stats
+from profiler import Profiler
+from fusion import fuse
+from optimizer import optimize
+from cfg import ControlFlowGraph
+from inference import specialize
+from jit import JIT
+from transpiler import emit
 
-if __name__ == '__main__':
+
+def main():
     # parsing arguments
     arg = ArgumentParser()
     # checking arguments
     source = arg.get_source()
     input_file = arg.get_input()
     help = arg.get_help()
+    engine = arg.get_engine()
+    output_buffer = arg.get_output_buffer()
+    use_cache = arg.get_cache()
+    stats_groups = arg.get_stats()
+    profile = arg.get_profile()
+    use_fusion = arg.get_fuse()
+    use_optimizer = arg.get_optimize()
+    use_specialization = arg.get_specialize()
+    use_jit = arg.get_jit()
+    emit_python = arg.get_emit_python()
+    limits = arg.get_limits()
     if help is True:
         if source is not None or input_file is not None:
             sys.stderr.write("Error: Wrong arguments\n")
             sys.exit(ErrorNum.WRONG_PARAM)
         print("TODO: help")
         sys.exit(0)
+    if limits is not None and stats_groups:
+        sys.stderr.write("Error: Limits can not be used with --stats\n")
+        sys.exit(ErrorNum.WRONG_PARAM)
     if (source is None and input is None):
         sys.stderr.write("Error: Expected source or input file\n")
         sys.exit(ErrorNum.WRONG_PARAM)
-    # validating xml
-    xml_in = XMLValidator(source)
-    xml_in.validate()
-    interpret = Interpret(input_file)
-    # getting labels
-    for i, child in enumerate(xml_in.root):
-        if child.get('opcode').upper() == 'LABEL':
-            if child[0].text in interpret.labels:
-                sys.stderr.write("Error: Label already defined\n")
-                sys.exit(ErrorNum.SEMANTIC_ERROR)
-            interpret.labels[child[0].text] = i
-    instruction = None
-    # getting instructions from factory
-    factory = Factory()
-    for child in xml_in.root:
-        instruction = factory.get_instruction(child.get('opcode'), interpret)
-        for arg in child:
-            instruction.set_arg(arg)
+    interpret = Interpret(input_file, output_buffer)
+    program = None
+    if use_cache:
+        # cached program skips validation and creating of instructions
+        cache = ProgramCache()
+        key, source = cache.hash_source(source)
+        program = cache.load(key, interpret)
+    if program is None:
+        # validating xml and creating instructions in one pass
+        loader = Loader(source, interpret)
+        loader.load()
+    interpret.open_input()
+    # program output is flushed before any error message
+    sys.stderr = ErrorStream(sys.stderr, interpret.output)
+    if program is None:
+        program = loader.link()
+        if use_cache:
+            cache.store(key, program)
+    # resolving jump and call targets to instruction indexes
+    program.link()
+    # folding constants and removing unreachable code, labels are relinked
+    if use_optimizer:
+        optimize(program, interpret)
+    instruction_list = program.instruction_list
+    # program is translated instead of being run
+    if emit_python is not None:
+        emit(instruction_list, emit_python, arg.get_source() or "stdin")
+        sys.exit(0)
+    # specialized and fused instructions are executed only by classic engine
+    classic = engine == "classic" or stats_groups or profile is not None
+    # traces are recorded from original instructions, so jit replaces
+    # specialization and fusion
+    jit = use_jit and engine == "classic" and not stats_groups and \
+        profile is None and limits is None
+    # limits count original instructions and check created strings, so
+    # instructions are not replaced
+    rewrite = classic and not jit and limits is None
+    if use_specialization and rewrite:
+        # control flow graph is built only for analyses of program
+        interpret.cfg = ControlFlowGraph(instruction_list)
+        specialize(interpret.cfg)
+    if use_fusion and rewrite:
+        fuse(instruction_list)
     # if there is at least one instruction run it
-    if instruction is not None:
-        interpret.run(instruction)
+    if instruction_list:
+        if stats_groups or profile is not None:
+            # statistics and profile are collected only by classic engine
+            interpret.run(program,
+                          Stats(stats_groups) if stats_groups else None,
+                          Profiler(profile) if profile is not None else None,
+                          limits=limits)
+        elif engine == "bytecode":
+            # lowering instructions to compact bytecode
+            Machine(interpret, Bytecode(instruction_list)).run(limits)
+        elif jit:
+            interpret.run(program, jit=JIT(instruction_list))
+        else:
+            interpret.run(program, limits=limits)
+
+
+if __name__ == '__main__':
+    # errors of interpretation end program with their code
+    try:
+        main()
+    except InterpretError as error:
+        sys.stderr.write(error.message)
+        sys.exit(error.code)
+    except ProgramExit as exit:
+        sys.exit(exit.code)
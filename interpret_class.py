@@ -2,36 +2,130 @@
 # author: Jakub Kontrik xkontr02
 # Description: interpretation module
 import sys
+from time import perf_counter
 from stack import Stack
 from frame import Frame
-from error import ErrorNum
+from error import InputFileError, InterpretError
+from output import Output
+from input_reader import InputReader
 
 # class for interpretation
 
 
 class Interpret:
-    def __init__(self, input_file):
-        self.labels = {}
+    # output is written to stream, stdout by default
+    def __init__(self, input_file, output_policy="block", stream=None):
         self.call_stack = Stack()
         self.data_stack = Stack()
         self.inst_index = 0
         self.tmp_frame = None
         self.global_frame = Frame()
         self.local_frames = Stack()
+        # control flow graph of loaded program, built only for --specialize
+        self.cfg = None
+        # buffered output of WRITE instructions
+        self.output = Output(stream, output_policy)
+        self.input_file = input_file
+        self.input = None
+        # characters which can still be created in strings, lowered by limits
+        self.string_budget = sys.maxsize
+        # limits of run, they compute string budget again when it is spent
+        self.limits = None
 
+    # lines of input file or stdin for READ instructions
+    def open_input(self):
         try:
-            input_file = open(input_file, 'r')
-            self.input_data = input_file.read().splitlines()
-            input_file.close()
+            self.input = InputReader(self.input_file)
+        except OSError:
+            raise InputFileError("Error: File not found\n")
 
-        except FileNotFoundError:
-            sys.stderr.write("Error: File not found\n")
-            sys.exit(ErrorNum.INPUT_FILE_ERR)
-        except TypeError:
-            self.input_data = None
+    # error of instruction gets its order and opcode, instruction index
+    # is not changed by instruction which failed
+    def run(self, program, stats=None, profiler=None, jit=None,
+            limits=None):
+        try:
+            self.run_loop(program, stats, profiler, jit, limits)
+        except InterpretError as error:
+            if self.inst_index < len(program.instruction_list):
+                inst = program.instruction_list[self.inst_index]
+                error.locate(inst.order, inst.opcode)
+            raise
 
-    def run(self, inst):
+    def run_loop(self, program, stats=None, profiler=None, jit=None,
+                 limits=None):
+        # profiler samples run loop by timer signal, loop is not changed
+        if profiler is not None:
+            profiler.start(self, program.instruction_list)
+            try:
+                self.run_loop(program, stats, limits=limits)
+            except BaseException:
+                profiler.stop(failed=True)
+                raise
+            profiler.stop()
+            return
+        if stats is not None:
+            self.run_stats(program, stats)
+            return
+        if limits is not None:
+            self.run_limited(program, limits)
+            return
+        if jit is not None:
+            self.run_jit(program, jit)
+            return
+        instruction_list = program.instruction_list
         # executinng every instruction
-        while self.inst_index != len(inst.instruction_list):
-            inst.instruction_list[self.inst_index].execute()
+        while self.inst_index != len(instruction_list):
+            instruction_list[self.inst_index].execute()
+            self.inst_index += 1
+        self.output.flush()
+
+    # same as run but collects statistics, stats are written also
+    # when program ends by EXIT or error
+    def run_stats(self, program, stats):
+        instruction_list = program.instruction_list
+        stats.start(instruction_list)
+        counts = stats.counts
+        times = stats.times
+        count_vars = "vars" in stats.metrics
+        try:
+            while self.inst_index != len(instruction_list):
+                index = self.inst_index
+                counts[index] += 1
+                start = perf_counter()
+                instruction_list[index].execute()
+                times[index] += perf_counter() - start
+                if count_vars:
+                    stats.peak_vars = max(stats.peak_vars,
+                                          stats.count_vars(self))
+                self.inst_index += 1
+        finally:
+            stats.write()
+        self.output.flush()
+
+    # same as run but backward jumps are passed to jit, which runs
+    # compiled traces of hot loops
+    def run_jit(self, program, jit):
+        instruction_list = program.instruction_list
+        while self.inst_index != len(instruction_list):
+            index = self.inst_index
+            instruction_list[index].execute()
+            if self.inst_index < index:
+                jit.backward(self, index)
+            self.inst_index += 1
+        self.output.flush()
+
+    # same as run but limits are checked before every instruction on which
+    # check is due, nothing is counted when there are no limits
+    def run_limited(self, program, limits):
+        instruction_list = program.instruction_list
+        limits.start(self)
+        executed = 0
+        check = limits.next_check(executed)
+        while self.inst_index != len(instruction_list):
+            if executed >= check:
+                limits.check(executed)
+                check = limits.next_check(executed)
+            instruction_list[self.inst_index].execute()
+            executed += 1
             self.inst_index += 1
+        self.output.flush()
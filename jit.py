@@ -0,0 +1,406 @@
+# jit.py
+# author: Jakub Kontrik xkontr02
+# Description: module for tracing hot loops and compiling them to python code
+from instructions import Nil, StrBuf
+
+# number of backward jumps to label before its loop is traced
+THRESHOLD = 50
+# longest trace, longer iterations are left to interpreter
+MAX_TRACE = 300
+
+JUMPS = ("JUMP", "JUMPIFEQ", "JUMPIFNEQ")
+# types compared by LT, GT and EQ without error
+CMP_TYPES = (int, bool, str)
+# names of types in generated code
+TYPE_NAMES = {int: "int", bool: "bool", str: "str", Nil: "Nil"}
+# result of generic operation whose operands would make instruction fail
+FAIL = object()
+
+# generic operations for operands without known types, FAIL means that
+# instruction has to be executed by interpreter to report its error
+
+
+def less(left, right):
+    if type(left) is not type(right) or type(left) not in CMP_TYPES:
+        return FAIL
+    return left < right
+
+
+def greater(left, right):
+    if type(left) is not type(right) or type(left) not in CMP_TYPES:
+        return FAIL
+    return left > right
+
+
+def equal(left, right):
+    if type(left) is Nil or type(right) is Nil:
+        return type(left) is type(right)
+    if type(left) is not type(right) or type(left) not in CMP_TYPES:
+        return FAIL
+    return left == right
+
+
+# text written by WRITE
+def text(value):
+    if type(value) is bool:
+        return "true" if value else "false"
+    if type(value) is Nil:
+        return ""
+    return str(value)
+
+
+GENERIC = {"LT": "less", "GT": "greater", "EQ": "equal"}
+# opcode to (types of operands, python expression of result, result type)
+OPERATIONS = {
+    "ADD": ((int, int), "{0} + {1}", int),
+    "SUB": ((int, int), "{0} - {1}", int),
+    "MUL": ((int, int), "{0} * {1}", int),
+    "IDIV": ((int, int), "int({0} / {1})", int),
+    "AND": ((bool, bool), "{0} and {1}", bool),
+    "OR": ((bool, bool), "{0} or {1}", bool),
+    "NOT": ((bool,), "not {0}", bool),
+    "CONCAT": ((str, str), "{0} + {1}", str),
+    "STRLEN": ((str,), "len({0})", int),
+    "GETCHAR": ((str, int), "{0}[{1}]", str),
+    "STRI2INT": ((str, int), "ord({0}[{1}])", int),
+    "INT2CHAR": ((int,), "chr({0})", str),
+}
+# conditions on values of operands which make instruction fail
+FAILURES = {
+    "IDIV": "{1} == 0",
+    "GETCHAR": "{1} > len({0}) - 1 or {1} < 0",
+    "STRI2INT": "{1} > len({0}) - 1 or {1} < 0",
+    "INT2CHAR": "{0} < 0 or {0} > 0x10FFFF",
+}
+# operations which read string operand only by len and index, so they
+# read mutable string without materializing it
+BUFFER_READS = ("STRLEN", "GETCHAR", "STRI2INT")
+SUPPORTED = set(OPERATIONS) | set(GENERIC) | set(JUMPS) | {
+    "LABEL", "MOVE", "SETCHAR", "WRITE", "PUSHS", "POPS"}
+
+# marker of variable which is initialized, but its type is not known
+VALUE = object()
+
+# raised when trace can not be compiled
+
+
+class Unsupported(Exception):
+    pass
+
+# class for compiling recorded trace of one loop iteration to python function
+# global variables are kept in locals of function, types of variables are
+# guarded when they are not known and every guard leaves trace before
+# instruction which would fail, so interpreter reports the error
+
+
+class TraceCompiler:
+    def __init__(self, interpret, instruction_list, trace):
+        self.interpret = interpret
+        self.instruction_list = instruction_list
+        # instruction indexes in order of execution, last one jumps to first
+        self.trace = trace
+        self.head = trace[0]
+        self.constants = {}
+        self.locals = {}
+        self.assigned = []
+        self.lines = []
+        self.types = {}
+        # variables appended by CONCAT to themselves, kept as StrBuf
+        self.buffers = set()
+
+    # can instruction be part of trace
+    @staticmethod
+    def supported(inst):
+        if inst.error is not None or inst.opcode not in SUPPORTED:
+            return False
+        return all(arg.type != "var" or arg.frame == "GF"
+                   for arg in inst.arguments)
+
+    def compile(self):
+        try:
+            self.collect()
+            # type of variable at start of iteration, None if it may be
+            # not initialized
+            global_vars = self.interpret.global_frame.vars
+            entry = {name: StrBuf if name in self.buffers
+                     else self.entry_type(global_vars.get(name))
+                     for name in self.locals}
+            while True:
+                self.generate(entry)
+                weaker = {name: self.weaken(type, self.types[name])
+                          for name, type in entry.items()}
+                if weaker == entry:
+                    break
+                entry = weaker
+        except Unsupported:
+            return None
+        self.source = self.function(entry)
+        namespace = {"Nil": Nil, "StrBuf": StrBuf, "less": less, "greater": greater,
+                     "equal": equal, "text": text, "FAIL": FAIL}
+        namespace.update(self.constants)
+        exec(compile(self.source, "<trace %d>" % self.head, "exec"),
+             namespace)
+        return namespace["trace"]
+
+    # type of loaded value, mutable string is loaded as str
+    def entry_type(self, value):
+        if value is None:
+            return None
+        if type(value) is StrBuf:
+            return str
+        return type(value)
+
+    # local names of global variables used by trace
+    def collect(self):
+        for index in self.trace:
+            inst = self.instruction_list[index]
+            if not self.supported(inst):
+                raise Unsupported
+            for i, arg in enumerate(inst.arguments):
+                if arg.type != "var":
+                    continue
+                if arg.name not in self.locals:
+                    self.locals[arg.name] = "v%d" % len(self.locals)
+                if i == 0 and arg.name not in self.assigned and \
+                        inst.opcode not in ("PUSHS", "WRITE") + JUMPS:
+                    self.assigned.append(arg.name)
+        # string appended to itself is appended in place, as in interpreter,
+        # copying it in every iteration would make loop quadratic
+        for index in self.trace:
+            inst = self.instruction_list[index]
+            if inst.opcode == "CONCAT" and inst.append:
+                self.buffers.add(inst.arguments[0].name)
+        for index in self.trace:
+            inst = self.instruction_list[index]
+            for i, arg in enumerate(inst.arguments):
+                if arg.type != "var" or arg.name not in self.buffers:
+                    continue
+                if inst.opcode == "CONCAT" and inst.append and i < 2:
+                    continue
+                if inst.opcode in BUFFER_READS and i == 1:
+                    continue
+                raise Unsupported
+
+    # entry type which holds also after iteration which ended with given type
+    def weaken(self, entry, end):
+        if entry is None or entry is end:
+            return entry
+        if end is None:
+            return None
+        return VALUE
+
+    # code leaving trace, next instruction is executed by interpreter
+    def leave(self, index):
+        stores = ["G[%r] = %s" % (name, self.locals[name])
+                  for name in self.assigned]
+        return "; ".join(stores + ["interp.inst_index = %d" % (index - 1),
+                                   "return"])
+
+    def emit(self, condition, index):
+        self.lines.append("if %s: %s" % (condition, self.leave(index)))
+
+    def constant(self, value):
+        if type(value) in (int, bool):
+            return repr(value)
+        name = "c%d" % len(self.constants)
+        self.constants[name] = value
+        return name
+
+    # python expression of symbol and its type, value is guarded to have
+    # required type, variable without required type has to be initialized
+    def symbol(self, arg, index, required=None):
+        if arg.type != "var":
+            value = arg.value
+            if required is not None and type(value) is not required:
+                raise Unsupported
+            return self.constant(value), type(value)
+        local = self.locals[arg.name]
+        # mutable string is read only by len and index
+        if arg.name in self.buffers:
+            return local, str
+        known = self.types[arg.name]
+        if required is not None and known is not required:
+            if known not in (None, VALUE):
+                # instruction would fail in every iteration
+                raise Unsupported
+            self.emit("type(%s) is not %s" % (local, TYPE_NAMES[required]),
+                      index)
+            self.types[arg.name] = required
+        elif required is None and known is None:
+            self.emit("%s is None" % local, index)
+            self.types[arg.name] = VALUE
+        return local, self.types[arg.name]
+
+    def assign(self, arg, expression, type):
+        self.lines.append("%s = %s" % (self.locals[arg.name], expression))
+        self.types[arg.name] = type
+
+    # comparison of two symbols, returns python expression of result
+    def compare(self, opcode, left_arg, right_arg, index):
+        left, left_type = self.symbol(left_arg, index)
+        right, right_type = self.symbol(right_arg, index)
+        if VALUE in (left_type, right_type):
+            self.lines.append("r = %s(%s, %s)" % (GENERIC[opcode], left,
+                                                   right))
+            self.emit("r is FAIL", index)
+            return "r"
+        if opcode == "EQ" and Nil in (left_type, right_type):
+            return repr(left_type is right_type)
+        if left_type is not right_type or left_type not in CMP_TYPES:
+            raise Unsupported
+        operator = {"LT": "<", "GT": ">", "EQ": "=="}[opcode]
+        return "(%s %s %s)" % (left, operator, right)
+
+    def generate(self, entry):
+        self.lines = []
+        self.types = dict(entry)
+        trace = self.trace
+        for position, index in enumerate(trace):
+            inst = self.instruction_list[index]
+            following = trace[position + 1] if position + 1 < len(trace) \
+                else self.head
+            self.instruction(inst, index, following)
+
+    def instruction(self, inst, index, following):
+        opcode = inst.opcode
+        args = inst.arguments
+        if opcode in ("LABEL", "JUMP"):
+            return
+        if opcode in ("JUMPIFEQ", "JUMPIFNEQ"):
+            condition = self.compare("EQ", args[1], args[2], index)
+            if opcode == "JUMPIFNEQ":
+                condition = "not %s" % condition
+            # guard leaves trace to branch which was not recorded
+            if following == inst.target + 1:
+                self.emit("not %s" % condition, index + 1)
+            else:
+                self.emit(condition, inst.target + 1)
+            return
+        if opcode in GENERIC:
+            self.assign(args[0], self.compare(opcode, args[1], args[2],
+                                              index), bool)
+        elif opcode == "CONCAT" and args[0].name in self.buffers:
+            right = self.symbol(args[2], index, str)[0]
+            self.lines.append("%s.append(%s)" % (self.locals[args[0].name],
+                                                 right))
+        elif opcode in OPERATIONS:
+            required, expression, result = OPERATIONS[opcode]
+            operands = [self.symbol(arg, index, type)[0]
+                        for arg, type in zip(args[1:], required)]
+            if opcode in FAILURES:
+                self.emit(FAILURES[opcode].format(*operands), index)
+            self.assign(args[0], expression.format(*operands), result)
+        elif opcode == "MOVE":
+            value, type = self.symbol(args[1], index)
+            self.assign(args[0], value, type)
+        elif opcode == "SETCHAR":
+            string = self.symbol(args[0], index, str)[0]
+            position = self.symbol(args[1], index, int)[0]
+            char = self.symbol(args[2], index, str)[0]
+            self.emit("%s > len(%s) - 1 or %s < 0 or len(%s) == 0" % (
+                position, string, position, char), index)
+            self.assign(args[0], "%s[:%s] + %s[0] + %s[%s + 1:]" % (
+                string, position, char, string, position), str)
+        elif opcode == "WRITE":
+            value, type = self.symbol(args[0], index)
+            if type is int:
+                self.lines.append("write(str(%s))" % value)
+            elif type is str:
+                self.lines.append("write(%s)" % value)
+            elif type is bool:
+                self.lines.append("write('true' if %s else 'false')" % value)
+            elif type is not Nil:
+                self.lines.append("write(text(%s))" % value)
+        elif opcode == "PUSHS":
+            self.lines.append("stack.append(%s)" % self.symbol(args[0],
+                                                               index)[0])
+        elif opcode == "POPS":
+            self.emit("not stack", index)
+            self.assign(args[0], "stack.pop()", VALUE)
+
+    # source of function, variables are loaded and guarded once and
+    # every iteration runs without leaving function
+    def function(self, entry):
+        enter = "interp.inst_index = %d; return" % (self.head - 1)
+        lines = ["def trace(interp):",
+                 "    G = interp.global_frame.vars",
+                 "    stack = interp.data_stack.items",
+                 "    write = interp.output.write"]
+        # string appended to itself is converted after all guards passed
+        # and stays mutable also after trace
+        buffers = []
+        for name, local in self.locals.items():
+            lines.append("    if %r not in G: %s" % (name, enter))
+            lines.append("    %s = G[%r]" % (local, name))
+            if name in self.buffers:
+                lines.append("    if type(%s) is not str and type(%s) is "
+                             "not StrBuf: %s" % (local, local, enter))
+                buffers.append("    if type(%s) is str: %s = StrBuf(%s)" % (
+                    local, local, local))
+                continue
+            lines.append("    if type(%s) is StrBuf: %s = %s.text()" % (
+                local, local, local))
+            if entry[name] is VALUE:
+                lines.append("    if %s is None: %s" % (local, enter))
+            elif entry[name] is not None:
+                lines.append("    if type(%s) is not %s: %s" % (
+                    local, TYPE_NAMES[entry[name]], enter))
+        lines.extend(buffers)
+        lines.append("    while True:")
+        lines.extend("        " + line for line in self.lines)
+        lines.append("        pass")
+        return "\n".join(lines) + "\n"
+
+# class for counting backward jumps and running compiled traces, loop
+# starts on instruction after label which is target of jump
+
+
+class JIT:
+    def __init__(self, instruction_list):
+        self.instruction_list = instruction_list
+        # first instruction of loop to compiled function
+        self.traces = {}
+        self.counts = {}
+        # loops which can not be traced
+        self.failed = set()
+
+    # called by run loop after instruction on index jumped backward
+    def backward(self, interpret, index):
+        head = interpret.inst_index + 1
+        trace = self.traces.get(head)
+        if trace is not None:
+            trace(interpret)
+            return
+        if head in self.failed or \
+                self.instruction_list[index].opcode not in JUMPS:
+            return
+        count = self.counts.get(head, 0) + 1
+        self.counts[head] = count
+        if count >= THRESHOLD:
+            self.record(interpret, head)
+
+    # execute one iteration of loop and compile executed instructions,
+    # interpret continues after last recorded instruction
+    def record(self, interpret, head):
+        instruction_list = self.instruction_list
+        trace = []
+        while len(trace) < MAX_TRACE:
+            index = interpret.inst_index + 1
+            if index == len(instruction_list):
+                break
+            inst = instruction_list[index]
+            if not TraceCompiler.supported(inst):
+                break
+            trace.append(index)
+            interpret.inst_index = index
+            inst.execute()
+            if interpret.inst_index + 1 == head and \
+                    inst.opcode in JUMPS and interpret.inst_index != index:
+                compiled = TraceCompiler(interpret, instruction_list,
+                                         trace).compile()
+                if compiled is None:
+                    break
+                self.traces[head] = compiled
+                compiled(interpret)
+                return
+        self.failed.add(head)
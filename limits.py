@@ -0,0 +1,139 @@
+# limits.py
+# author: Jakub Kontrik xkontr02
+# Description: module for resource limits of one run of program
+from time import perf_counter
+from stack import Stack
+from instructions import StrBuf
+from error import InstructionLimitError, TimeLimitError, StackLimitError, \
+    StringLimitError
+
+# class for stack which fails when it is deeper than limit
+
+
+class BoundedStack(Stack):
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+
+    def push(self, item):
+        if len(self.items) >= self.limit:
+            raise StackLimitError("Error: Stack limit exceeded\n")
+        self.items.append(item)
+
+# limit has to be positive number of given types, None means no limit
+
+
+def check_limit(value, types=(int,)):
+    if value is not None and (type(value) not in types or not value > 0):
+        raise ValueError("limit has to be positive number: %r" % (value,))
+    return value
+
+
+# converters of option values, argparse reports ValueError as wrong option
+def positive_int(text):
+    return check_limit(int(text))
+
+
+def positive_float(text):
+    return check_limit(float(text), (float,))
+
+
+# strings alive in frames and data stack of interpret, same string may be
+# referenced more times, so it is counted once with number of references
+def live_strings(interpret):
+    frames = [interpret.global_frame, interpret.tmp_frame]
+    frames.extend(interpret.local_frames.items)
+    values = [value for frame in frames if frame is not None
+              for value in frame.get_vars().values()]
+    values.extend(interpret.data_stack.items)
+    strings = {}
+    for value in values:
+        if type(value) is str or type(value) is StrBuf:
+            if id(value) in strings:
+                strings[id(value)][1] += 1
+            else:
+                strings[id(value)] = [value, 1]
+    return strings
+
+# class for limits of one run, None means no limit, instruction budget
+# and time are checked every INTERVAL instructions, depth of stacks on
+# every push and size of strings when they are created, every created
+# string is charged to string budget and when budget is spent, it is
+# computed again from total size of strings which are still alive
+
+
+class Limits:
+    # executed instructions between two checks
+    INTERVAL = 1024
+
+    def __init__(self, instructions=None, time=None, stack=None,
+                 strings=None):
+        self.instructions = check_limit(instructions)
+        self.time = check_limit(time, (int, float))
+        self.stack = check_limit(stack)
+        self.strings = check_limit(strings)
+        self.deadline = None
+
+    # set limits to interpret before its program is run
+    def start(self, interpret):
+        if self.time is not None:
+            self.deadline = perf_counter() + self.time
+        if self.stack is not None:
+            interpret.data_stack = BoundedStack(self.stack)
+            interpret.call_stack = BoundedStack(self.stack)
+            interpret.local_frames = BoundedStack(self.stack)
+        if self.strings is not None:
+            interpret.string_budget = self.strings
+        interpret.limits = self
+
+    # number of executed instructions when check is called next time
+    def next_check(self, executed):
+        if self.instructions is None:
+            return executed + self.INTERVAL
+        return min(executed + self.INTERVAL, self.instructions)
+
+    # called before next instruction is executed
+    def check(self, executed):
+        if self.instructions is not None and executed >= self.instructions:
+            raise InstructionLimitError("Error: Instruction limit exceeded\n")
+        if self.deadline is not None and perf_counter() > self.deadline:
+            raise TimeLimitError("Error: Time limit exceeded\n")
+
+    # called when string budget is spent by string of given size, which
+    # replaces value old of its variable
+    def reclaim(self, interpret, size, old=None):
+        strings = live_strings(interpret)
+        total = sum(len(value) for value, refs in strings.values())
+        # replaced string is freed if nothing else references it
+        if id(old) in strings and strings[id(old)][1] == 1:
+            total -= len(old)
+        if total + size > self.strings:
+            raise StringLimitError("Error: String limit exceeded\n")
+        interpret.string_budget = self.strings - total - size
+
+    def __bool__(self):
+        return any(limit is not None for limit in
+                   (self.instructions, self.time, self.stack, self.strings))
+
+
+# add options of limits to argparse parser
+def add_arguments(parser):
+    parser.add_argument(
+        "--max-instructions", help="maximum number of executed instructions",
+        metavar="N", type=positive_int, dest="max_instructions")
+    parser.add_argument(
+        "--timeout", help="maximum wall time of run in seconds",
+        metavar="SECONDS", type=positive_float, dest="timeout")
+    parser.add_argument(
+        "--max-stack", help="maximum depth of data, call and frame stacks",
+        metavar="N", type=positive_int, dest="max_stack")
+    parser.add_argument(
+        "--max-string", help="maximum total string size",
+        metavar="N", type=positive_int, dest="max_string")
+
+
+# limits from parsed options, None if no limit is set
+def from_args(args):
+    limits = Limits(args.max_instructions, args.timeout, args.max_stack,
+                    args.max_string)
+    return limits if limits else None
@@ -0,0 +1,137 @@
+# loader.py
+# author: Jakub Kontrik xkontr02
+# Description: module for loading program from xml in one pass
+import sys
+import xml.etree.ElementTree as ET
+from error import ErrorNum, InputFileError, make_error
+from xmlvalidator import XMLValidator
+from factory import Factory
+from program import Program
+
+# stages of loading, error of earlier stage is reported first
+PARSE, STRUCTURE, LABELS, OPCODES = range(4)
+
+# class for loading program, elements are validated and turned to
+# instructions while xml is parsed and freed right after
+
+
+class Loader:
+    def __init__(self, source, interpret):
+        # if source is None read from stdin, source may be file object
+        self.source = sys.stdin.buffer if source is None else source
+        self.interpret = interpret
+        self.validator = XMLValidator()
+        self.factory = Factory()
+        # decoded string literals of program, freed with loader
+        self.literals = {}
+        # (order, instruction) and (order, label name) in document order
+        self.instructions = []
+        self.labels = []
+        # program created by link
+        self.program = Program()
+        # orders of all valid instructions, even those not created
+        self.orders = []
+        # first error as (stage, order, message, code)
+        self.error = None
+
+    # parse whole xml, errors of xml structure are reported here
+    def load(self):
+        try:
+            events = ET.iterparse(self.source, events=("start", "end"))
+            depth = 0
+            for event, elem in events:
+                if event == "start":
+                    depth += 1
+                    if depth == 1:
+                        root = elem
+                        if not self.validator.validate_root(root):
+                            self.fail(STRUCTURE, 0,
+                                      "Error: Wrong XML structure\n",
+                                      ErrorNum.WRONG_XML_STRUCTURE)
+                    continue
+                depth -= 1
+                # instruction is complete, consume it and free it
+                if depth == 1:
+                    self.add(elem)
+                    root.remove(elem)
+        except FileNotFoundError:
+            raise InputFileError("Error: File not found\n")
+        except ET.ParseError:
+            self.fail(PARSE, 0, "Error: XML parse error\n",
+                      ErrorNum.WRONG_XML_FORMAT)
+        if self.error is not None and self.error[0] <= STRUCTURE:
+            self.report()
+
+    # returns program with instructions sorted by order and its labels,
+    # semantic errors of program are reported here
+    def link(self):
+        self.link_labels()
+        if self.error is not None:
+            self.report()
+        return self.program
+
+    def report(self):
+        stage, order, message, code = self.error
+        # order 0 is error of whole document
+        raise make_error(code, message).locate(order or None, None)
+
+    def add(self, child):
+        order = self.validator.get_order(child)
+        if order is None:
+            self.fail(STRUCTURE, 0, "Error: Wrong XML structure\n",
+                      ErrorNum.WRONG_XML_STRUCTURE)
+            return
+        # sorting arguments by tag
+        child[:] = sorted(child, key=lambda arg: arg.tag)
+        if not self.validator.validate_instruction(child):
+            self.fail(STRUCTURE, order, "Error: Wrong XML structure\n",
+                      ErrorNum.WRONG_XML_STRUCTURE)
+            return
+        for arg in child:
+            if not self.validator.validate_arg(arg):
+                self.fail(STRUCTURE, order, "Error: Wrong XML structure\n",
+                          ErrorNum.WRONG_XML_STRUCTURE)
+                return
+        self.orders.append(order)
+        opcode = child.get('opcode')
+        if opcode.upper() == 'LABEL' and len(child) > 0:
+            self.labels.append((order, child[0].text))
+        # errors found when instruction is created
+        if not self.factory.is_instruction(opcode):
+            self.fail(OPCODES, order, "Error: Unknown instruction\n",
+                      ErrorNum.WRONG_XML_STRUCTURE)
+            return
+        for arg in child:
+            if not self.validator.validate_value(arg):
+                self.fail(OPCODES, order, "Error: Wrong XML structure\n",
+                          ErrorNum.WRONG_XML_STRUCTURE)
+                return
+        # no instructions are needed once program is known to be wrong
+        if self.error is not None:
+            return
+        instruction = self.factory.get_instruction(opcode, self.interpret)
+        instruction.order = order
+        for arg in child:
+            instruction.set_arg(arg, self.literals)
+        # checking arity and operand kinds once before execution
+        instruction.decode()
+        self.instructions.append((order, instruction))
+
+    # sort instructions by order and store label indexes
+    def link_labels(self):
+        self.instructions.sort(key=lambda item: item[0])
+        self.program.instruction_list[:] = [
+            instruction for _, instruction in self.instructions]
+        index = {}
+        for i, order in enumerate(sorted(self.orders)):
+            index.setdefault(order, i)
+        for order, name in sorted(self.labels, key=lambda item: item[0]):
+            if name in self.program.labels:
+                self.fail(LABELS, order, "Error: Label already defined\n",
+                          ErrorNum.SEMANTIC_ERROR)
+                return
+            self.program.labels[name] = index[order]
+
+    def fail(self, stage, order, message, code):
+        if self.error is None or (stage, order) < self.error[:2]:
+            self.error = (stage, order, message, code)
@@ -0,0 +1,230 @@
+# optimizer.py
+# author: Jakub Kontrik xkontr02
+# Description: module for constant folding and dead code elimination
+from instructions import Argument, Nil, Move, Jump
+
+# instructions after which next instruction is reached only by label
+TERMINATORS = ("JUMP", "EXIT", "RETURN")
+
+# raise TypeError if values do not have given types, instruction with such
+# operands would fail, so it is not folded
+
+
+def need(values, *types):
+    for value, value_type in zip(values, types):
+        if type(value) is not value_type:
+            raise TypeError
+
+
+def comparable(left, right):
+    if type(left) is not type(right) or type(left) not in (int, bool, str):
+        raise TypeError
+
+
+def equal(left, right):
+    if type(left) is Nil or type(right) is Nil:
+        return type(left) is type(right)
+    comparable(left, right)
+    return left == right
+
+
+def char_at(string, index):
+    need((string, index), str, int)
+    if index > len(string) - 1 or index < 0:
+        raise ValueError
+    return string[index]
+
+# values of instructions with literal operands, every error which the
+# instruction would report raises exception here
+
+
+def fold_add(left, right):
+    need((left, right), int, int)
+    return left + right
+
+
+def fold_sub(left, right):
+    need((left, right), int, int)
+    return left - right
+
+
+def fold_mul(left, right):
+    need((left, right), int, int)
+    return left * right
+
+
+def fold_idiv(left, right):
+    need((left, right), int, int)
+    # same division as IDiv.execute
+    return int(left / right)
+
+
+def fold_lt(left, right):
+    comparable(left, right)
+    return left < right
+
+
+def fold_gt(left, right):
+    comparable(left, right)
+    return left > right
+
+
+def fold_and(left, right):
+    need((left, right), bool, bool)
+    return left and right
+
+
+def fold_or(left, right):
+    need((left, right), bool, bool)
+    return left or right
+
+
+def fold_not(value):
+    need((value,), bool)
+    return not value
+
+
+def fold_concat(left, right):
+    need((left, right), str, str)
+    return left + right
+
+
+def fold_strlen(string):
+    need((string,), str)
+    return len(string)
+
+
+def fold_int2char(value):
+    need((value,), int)
+    return chr(value)
+
+
+def fold_stri2int(string, index):
+    return ord(char_at(string, index))
+
+
+FOLDS = {
+    "ADD": fold_add,
+    "SUB": fold_sub,
+    "MUL": fold_mul,
+    "IDIV": fold_idiv,
+    "LT": fold_lt,
+    "GT": fold_gt,
+    "EQ": equal,
+    "AND": fold_and,
+    "OR": fold_or,
+    "NOT": fold_not,
+    "CONCAT": fold_concat,
+    "STRLEN": fold_strlen,
+    "INT2CHAR": fold_int2char,
+    "STRI2INT": fold_stri2int,
+    "GETCHAR": char_at,
+}
+
+# class for optimizing loaded program, instruction list and labels
+# of program are changed in place
+
+
+class Optimizer:
+    def __init__(self, interpret):
+        self.interpret = interpret
+
+    def optimize(self, program):
+        optimized = [self.fold(inst) for inst in program.instruction_list]
+        program.instruction_list[:] = self.eliminate(optimized,
+                                                     program.labels)
+        program.link()
+        return program
+
+    # literal argument with given value
+    def literal(self, value):
+        if type(value) is bool:
+            arg = Argument("bool", "true")
+        elif type(value) is int:
+            arg = Argument("int", "0")
+        else:
+            arg = Argument("string", "")
+        arg.value = value
+        return arg
+
+    # value of instruction with literal operands, None if it can not be folded
+    def value(self, inst):
+        args = inst.arguments[1:]
+        if inst.error is not None or not args or \
+                any(arg.type == "var" for arg in args):
+            return None
+        if inst.opcode == "TYPE":
+            return args[0].type
+        if inst.opcode not in FOLDS:
+            return None
+        try:
+            return FOLDS[inst.opcode](*(arg.value for arg in args))
+        except Exception:
+            return None
+
+    def fold(self, inst):
+        if inst.opcode in ("JUMPIFEQ", "JUMPIFNEQ"):
+            return self.fold_branch(inst)
+        value = self.value(inst)
+        if value is None:
+            return inst
+        # move checks destination variable same way as folded instruction
+        move = Move(self.interpret)
+        move.order = inst.order
+        move.arguments = (inst.arguments[0], self.literal(value))
+        return move
+
+    # branch with literal operands is jump or nothing, missing label is
+    # reported by jump with same message, so branch is kept if it is missing
+    def fold_branch(self, inst):
+        args = inst.arguments
+        if inst.error is not None or inst.target is None or \
+                args[1].type == "var" or args[2].type == "var":
+            return inst
+        try:
+            taken = equal(args[1].value, args[2].value)
+        except TypeError:
+            return inst
+        if inst.opcode == "JUMPIFNEQ":
+            taken = not taken
+        if not taken:
+            return None
+        jump = Jump(self.interpret)
+        jump.order = inst.order
+        jump.arguments = (args[0],)
+        return jump
+
+    # remove folded branches and instructions which are not reachable,
+    # code after terminator is reachable only from referenced label
+    def eliminate(self, instruction_list, labels):
+        referenced = set()
+        for inst in instruction_list:
+            if inst is not None and inst.opcode != "LABEL":
+                for arg in inst.arguments:
+                    if arg.type == "label" and arg.value in labels:
+                        referenced.add(labels[arg.value])
+        kept = []
+        # new index of every kept instruction by old index
+        index = {}
+        reachable = True
+        for i, inst in enumerate(instruction_list):
+            if inst is None:
+                continue
+            if i in referenced:
+                reachable = True
+            if not reachable:
+                continue
+            index[i] = len(kept)
+            kept.append(inst)
+            if inst.opcode in TERMINATORS:
+                reachable = False
+        for name, label in list(labels.items()):
+            if label in index:
+                labels[name] = index[label]
+            else:
+                del labels[name]
+        return kept
+
+
+def optimize(program, interpret):
+    return Optimizer(interpret).optimize(program)
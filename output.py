@@ -0,0 +1,63 @@
+# output.py
+# author: Jakub Kontrik xkontr02
+# Description: module for buffered program output
+import sys
+
+# flush policies of output
+POLICIES = ("block", "line", "unbuffered")
+
+# class for buffering output of WRITE instructions
+
+
+class Output:
+    # size of buffered text which forces flush in block policy
+    BLOCK_SIZE = 1 << 16
+
+    def __init__(self, stream=None, policy="block"):
+        self.stream = sys.stdout if stream is None else stream
+        self.policy = policy
+        self.parts = []
+        self.size = 0
+        # choosing write method by policy once
+        if policy == "line":
+            self.write = self.write_line
+        elif policy == "unbuffered":
+            self.write = self.write_unbuffered
+
+    def write(self, text):
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= self.BLOCK_SIZE:
+            self.flush()
+
+    def write_line(self, text):
+        self.parts.append(text)
+        self.size += len(text)
+        if "\n" in text or self.size >= self.BLOCK_SIZE:
+            self.flush()
+
+    def write_unbuffered(self, text):
+        self.stream.write(text)
+        self.stream.flush()
+
+    def flush(self):
+        if self.parts:
+            self.stream.write("".join(self.parts))
+            self.parts = []
+            self.size = 0
+        self.stream.flush()
+
+# stream which flushes program output before anything is written to stderr
+
+
+class ErrorStream:
+    def __init__(self, stream, output):
+        self.stream = stream
+        self.output = output
+
+    def write(self, text):
+        self.output.flush()
+        return self.stream.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
@@ -0,0 +1,81 @@
+# profiler.py
+# author: Jakub Kontrik xkontr02
+# Description: module for sampling profiler of interpretation
+import sys
+import signal
+from error import ParamError, OutputFileError
+
+# class for sampling profiler, snapshots of instruction index and call stack
+# are taken by timer signal and written as collapsed stacks for flame graphs
+
+
+class Profiler:
+    # seconds of processor time between samples
+    INTERVAL = 0.001
+
+    def __init__(self, file_name, interval=INTERVAL):
+        if not hasattr(signal, "setitimer"):
+            raise ParamError("Error: Profiler is not supported\n")
+        self.file_name = file_name
+        self.interval = interval
+        # number of samples by (call stack, instruction index)
+        self.samples = {}
+        self.interpret = None
+        self.instruction_list = []
+        self.handler = None
+
+    def start(self, interpret, instruction_list):
+        self.interpret = interpret
+        self.instruction_list = instruction_list
+        self.handler = signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    # when program failed or exited, error of profile file is only reported,
+    # so error and exit code of program are not replaced
+    def stop(self, failed=False):
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, self.handler)
+        try:
+            self.write()
+        except OutputFileError as error:
+            if not failed:
+                raise
+            sys.stderr.write(error.message)
+
+    # signal handler, only stores snapshot
+    def sample(self, signum, frame):
+        key = (tuple(self.interpret.call_stack.items),
+               self.interpret.inst_index)
+        self.samples[key] = self.samples.get(key, 0) + 1
+
+    # name of nearest label before every instruction
+    def regions(self):
+        regions = []
+        name = "main"
+        for inst in self.instruction_list:
+            if inst.opcode.upper() == "LABEL" and inst.arguments:
+                name = inst.arguments[0].value
+            regions.append(name)
+        return regions
+
+    # map snapshots to label names, called functions are labels of CALL
+    def collapse(self):
+        regions = self.regions()
+        stacks = {}
+        for (calls, index), count in self.samples.items():
+            stack = ["main"]
+            for call in calls:
+                stack.append(self.instruction_list[call].arguments[0].value)
+            if index < len(regions) and regions[index] != stack[-1]:
+                stack.append(regions[index])
+            name = ";".join(stack)
+            stacks[name] = stacks.get(name, 0) + count
+        return stacks
+
+    def write(self):
+        try:
+            with open(self.file_name, 'w') as file:
+                for stack, count in sorted(self.collapse().items()):
+                    file.write("%s %d\n" % (stack, count))
+        except OSError:
+            raise OutputFileError("Error: Cannot write profile file\n")
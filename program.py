@@ -0,0 +1,22 @@
+# program.py
+# author: Jakub Kontrik xkontr02
+# Description: module with loaded program, its instructions and labels
+
+# class for loaded program, instructions are sorted by order and labels
+# map label name to index of LABEL instruction, every program has its own
+# list, so more programs can be loaded and run in one process
+
+
+class Program:
+    def __init__(self, instruction_list=None, labels=None):
+        self.instruction_list = [] if instruction_list is None \
+            else instruction_list
+        self.labels = {} if labels is None else labels
+
+    # resolve jump and call targets to instruction indexes
+    def link(self):
+        for inst in self.instruction_list:
+            inst.link(self.labels)
+
+    def __len__(self):
+        return len(self.instruction_list)
@@ -0,0 +1,235 @@
+# server.py
+# author: Jakub Kontrik xkontr02
+# Description: module for long running interpreter listening on unix socket
+import io
+import os
+import sys
+import json
+import stat
+import signal
+import socket
+import hashlib
+import argparse
+import locale
+import threading
+import traceback
+import socketserver
+from collections import OrderedDict
+from interpret_class import Interpret
+from input_reader import InputReader
+from loader import Loader
+from bytecode import Bytecode, Machine
+from error import InterpretError, ProgramExit
+from limits import Limits, add_arguments
+
+# every request is one json line with keys hash, source and input, source
+# and input are sizes of bytes of program xml and input which follow,
+# program may be given only by hash of earlier request, optional key
+# limits changes limits of server for request, response is one json line
+# with status, hash, code, stdout and stderr
+LIMITS = ("instructions", "time", "stack", "strings")
+
+# class for loaded programs kept in memory, programs are lowered to
+# bytecode, which does not depend on interpret, so one program can run
+# in more requests at once, error of loading is kept as (message, code)
+
+
+class ProgramStore:
+    def __init__(self, size):
+        self.size = size
+        self.programs = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            program = self.programs.get(key)
+            if program is not None:
+                self.programs.move_to_end(key)
+            return program
+
+    def add(self, key, program):
+        with self.lock:
+            self.programs[key] = program
+            self.programs.move_to_end(key)
+            while len(self.programs) > self.size:
+                self.programs.popitem(last=False)
+
+    # load program from xml bytes, errors of program are also stored
+    def load(self, key, data):
+        loader = Loader(io.BytesIO(data), Interpret(None))
+        try:
+            loader.load()
+            program = loader.link()
+            program.link()
+            program = Bytecode(program.instruction_list)
+        except InterpretError as error:
+            program = (error.message, int(error.code))
+        self.add(key, program)
+        return program
+
+
+# run program with input text in its own interpret, returns
+# (stdout, stderr, exit code)
+def execute(program, text, limits=None):
+    if type(program) is tuple:
+        return "", program[0], program[1]
+    stdout = io.StringIO()
+    interpret = Interpret(None, stream=stdout)
+    interpret.input = InputReader(text=text)
+    try:
+        if program.ops:
+            Machine(interpret, program).run(limits)
+    except InterpretError as error:
+        interpret.output.flush()
+        return stdout.getvalue(), error.message, int(error.code)
+    except ProgramExit as exit:
+        return stdout.getvalue(), "", exit.code
+    return stdout.getvalue(), "", 0
+
+# class for one client connection, more requests can be sent one by one
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            try:
+                response = self.serve(json.loads(line))
+            except (ValueError, KeyError, TypeError) as error:
+                response = {"status": "bad request", "error": str(error)}
+            except Exception:
+                response = {"status": "error",
+                            "error": traceback.format_exc()}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+    def serve(self, request):
+        # header is checked whole before payload is read
+        if type(request) is not dict:
+            raise ValueError("request has to be json object")
+        source_size = self.size(request, "source")
+        input_size = self.size(request, "input")
+        try:
+            if not source_size and type(request.get("hash")) is not str:
+                raise ValueError("hash has to be string")
+            limits = self.limits(request)
+        except (ValueError, KeyError, TypeError):
+            # payload of rejected request is skipped, so next request can
+            # be read from connection
+            self.rfile.read(source_size + input_size)
+            raise
+        source = self.read(source_size)
+        data = self.read(input_size)
+        store = self.server.store
+        if source:
+            key = hashlib.sha256(source).hexdigest()
+            program = store.get(key)
+            if program is None:
+                program = store.load(key, source)
+        else:
+            key = request["hash"]
+            program = store.get(key)
+            if program is None:
+                return {"status": "missing", "hash": key}
+        text = data.decode(locale.getpreferredencoding(False))
+        stdout, stderr, code = execute(program, text,
+                                       limits if limits else None)
+        return {"status": "ok", "hash": key, "code": code,
+                "stdout": stdout, "stderr": stderr}
+
+    # limits are created for every request, they hold its deadline
+    def limits(self, request):
+        request_limits = request.get("limits", {})
+        if type(request_limits) is not dict:
+            raise ValueError("limits has to be json object")
+        limits = dict(self.server.limits)
+        for name, value in request_limits.items():
+            if name not in LIMITS:
+                raise KeyError(name)
+            limits[name] = value
+        return Limits(**limits)
+
+    # size of payload from header of request, zero if it is not given
+    @staticmethod
+    def size(request, name):
+        size = request.get(name, 0)
+        if type(size) is not int or size < 0:
+            raise ValueError("%s has to be non negative integer" % name)
+        return size
+
+    def read(self, size):
+        data = self.rfile.read(size)
+        if len(data) != size:
+            raise ValueError("unexpected end of request")
+        return data
+
+# class for server, every connection is served in its own thread
+
+
+class Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, size, limits=None):
+        # socket left by server which did not end is replaced
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+        super().__init__(path, RequestHandler)
+        self.store = ProgramStore(size)
+        # default limits of every request by name
+        self.limits = {} if limits is None else limits
+
+# class for client of server, connection is kept for more requests
+
+
+class Client:
+    def __init__(self, path):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path)
+        self.file = self.socket.makefile('rwb')
+
+    # run program given by xml bytes or by hash, returns response
+    def run(self, source=None, input=b"", digest=None, limits=None):
+        request = {"input": len(input)}
+        if limits is not None:
+            request["limits"] = limits
+        if source is not None:
+            request["source"] = len(source)
+        else:
+            request["hash"] = digest
+        self.file.write(json.dumps(request).encode() + b"\n")
+        if source is not None:
+            self.file.write(source)
+        self.file.write(input)
+        self.file.flush()
+        return json.loads(self.file.readline())
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog="python server.py")
+    parser.add_argument("socket", help="path of unix socket")
+    parser.add_argument("--cache-size", type=int, default=256,
+                        help="number of loaded programs kept in memory")
+    add_arguments(parser)
+    args = parser.parse_args()
+    limits = dict(zip(LIMITS, (args.max_instructions, args.timeout,
+                               args.max_stack, args.max_string)))
+    try:
+        server = Server(args.socket, args.cache_size, limits)
+    except OSError as error:
+        sys.stderr.write("Error: Cannot listen on socket: %s\n" % error)
+        sys.exit(1)
+    # socket is removed also when server is terminated
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(args.socket)
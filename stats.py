@@ -0,0 +1,110 @@
+# stats.py
+# author: Jakub Kontrik xkontr02
+# Description: module for statistics of interpretation
+from error import OutputFileError
+
+# instructions which are not counted as executed
+NOT_COUNTED = ("LABEL", "DPRINT", "BREAK")
+
+# class for storing statistics collected by Interpret.run_stats
+# and writing them to files
+
+
+class Stats:
+    def __init__(self, groups):
+        # list of (file name, list of metrics) in order of arguments
+        self.groups = groups
+        self.metrics = {metric for _, metrics in groups for metric in metrics}
+        self.counts = []
+        self.times = []
+        self.peak_vars = 0
+
+    # prepare counters for instructions of program
+    def start(self, instruction_list):
+        self.instruction_list = instruction_list
+        self.counts = [0] * len(instruction_list)
+        self.times = [0.0] * len(instruction_list)
+
+    # number of initialized variables in all frames
+    def count_vars(self, interpret):
+        frames = [interpret.global_frame] + interpret.local_frames.items
+        if interpret.tmp_frame is not None:
+            frames.append(interpret.tmp_frame)
+        count = 0
+        for frame in frames:
+            for value in frame.vars.values():
+                if value is not None:
+                    count += 1
+        return count
+
+    # executions of every instruction, second instruction of fused pair
+    # is executed every time its fused instruction is
+    def executed(self):
+        counts = list(self.counts)
+        for i, inst in enumerate(self.instruction_list):
+            if getattr(inst, "second", None) is not None:
+                counts[i + 1] += counts[i]
+        return counts
+
+    def insts(self):
+        return sum(count for inst, count in zip(self.instruction_list,
+                                                self.executed())
+                   if inst.opcode.upper() not in NOT_COUNTED)
+
+    # order of most executed instruction, the lowest order wins
+    def hot(self):
+        best = None
+        for inst, count in zip(self.instruction_list, self.executed()):
+            if inst.opcode.upper() in NOT_COUNTED or count == 0:
+                continue
+            if best is None or count > best[0] or \
+                    (count == best[0] and inst.order < best[1]):
+                best = (count, inst.order)
+        return "" if best is None else best[1]
+
+    # lines with opcode, number of executions and time in seconds
+    def opcodes(self):
+        opcodes = {}
+        for inst, count, time in zip(self.instruction_list, self.executed(),
+                                     self.times):
+            if count == 0:
+                continue
+            total = opcodes.setdefault(inst.opcode.upper(), [0, 0.0])
+            total[0] += count
+            total[1] += time
+        return "\n".join("%s %d %.6f" % (opcode, count, time)
+                         for opcode, (count, time) in sorted(opcodes.items()))
+
+    # lines with fused pattern, number of fused pairs and their executions
+    def fused(self):
+        patterns = {}
+        for inst, count in zip(self.instruction_list, self.counts):
+            pattern = getattr(inst, "pattern", None)
+            if pattern is None:
+                continue
+            total = patterns.setdefault(pattern, [0, 0])
+            total[0] += 1
+            total[1] += count
+        return "\n".join("%s %d %d" % (pattern, sites, count)
+                         for pattern, (sites, count) in sorted(patterns.items()))
+
+    def write(self):
+        for file_name, metrics in self.groups:
+            lines = []
+            for metric in metrics:
+                if metric == "insts":
+                    lines.append(str(self.insts()))
+                elif metric == "hot":
+                    lines.append(str(self.hot()))
+                elif metric == "vars":
+                    lines.append(str(self.peak_vars))
+                elif metric == "opcodes":
+                    lines.append(self.opcodes())
+                elif metric == "fused":
+                    lines.append(self.fused())
+            try:
+                with open(file_name, 'w') as file:
+                    for line in lines:
+                        file.write(line + "\n")
+            except OSError:
+                raise OutputFileError("Error: Cannot write stats file\n")
@@ -0,0 +1,242 @@
+# conftest.py
+# author: Jakub Kontrik xkontr02
+# Description: shared programs and helpers for running interpreter in tests
+import os
+import sys
+import subprocess
+from xml.sax.saxutils import escape
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# opcodes whose first argument is label and second argument of READ is type
+LABEL_OPCODES = ("LABEL", "JUMP", "CALL", "JUMPIFEQ", "JUMPIFNEQ")
+FRAMES = ("GF@", "LF@", "TF@")
+
+# programs in IPPcode23 text, spaces in strings are written as \032
+PROGRAMS = {
+    "arithmetic": """
+        DEFVAR GF@i
+        MOVE GF@i int@0
+        DEFVAR GF@sum
+        MOVE GF@sum int@0
+        DEFVAR GF@cond
+        LABEL loop
+        ADD GF@sum GF@sum GF@i
+        MUL GF@cond GF@i int@3
+        SUB GF@sum GF@sum GF@cond
+        IDIV GF@cond GF@i int@7
+        ADD GF@sum GF@sum GF@cond
+        ADD GF@i GF@i int@1
+        LT GF@cond GF@i int@200
+        JUMPIFEQ loop GF@cond bool@true
+        GT GF@cond GF@sum int@0
+        NOT GF@cond GF@cond
+        AND GF@cond GF@cond bool@true
+        OR GF@cond GF@cond bool@false
+        WRITE GF@sum
+        WRITE string@\\010
+        WRITE GF@cond
+        """,
+    "branches": """
+        DEFVAR GF@i
+        MOVE GF@i int@0
+        DEFVAR GF@even
+        MOVE GF@even int@0
+        DEFVAR GF@rest
+        LABEL loop
+        IDIV GF@rest GF@i int@2
+        MUL GF@rest GF@rest int@2
+        JUMPIFNEQ odd GF@rest GF@i
+        ADD GF@even GF@even int@1
+        LABEL odd
+        ADD GF@i GF@i int@1
+        JUMPIFNEQ loop GF@i int@300
+        WRITE GF@even
+        """,
+    "strings": """
+        DEFVAR GF@s
+        MOVE GF@s string@
+        DEFVAR GF@i
+        MOVE GF@i int@0
+        DEFVAR GF@c
+        LABEL loop
+        INT2CHAR GF@c int@97
+        CONCAT GF@s GF@s GF@c
+        CONCAT GF@s GF@s string@b\\032
+        ADD GF@i GF@i int@1
+        JUMPIFNEQ loop GF@i int@400
+        SETCHAR GF@s int@5 string@Z
+        DEFVAR GF@n
+        STRLEN GF@n GF@s
+        WRITE GF@n
+        GETCHAR GF@c GF@s int@5
+        WRITE GF@c
+        STRI2INT GF@n GF@s int@3
+        WRITE GF@n
+        DEFVAR GF@t
+        TYPE GF@t GF@s
+        WRITE GF@t
+        GETCHAR GF@c GF@s int@1199
+        WRITE GF@c
+        """,
+    "calls": """
+        DEFVAR GF@result
+        PUSHS int@10
+        CALL factorial
+        POPS GF@result
+        WRITE GF@result
+        EXIT int@0
+        LABEL factorial
+        CREATEFRAME
+        PUSHFRAME
+        DEFVAR LF@n
+        POPS LF@n
+        JUMPIFEQ base LF@n int@0
+        DEFVAR LF@m
+        SUB LF@m LF@n int@1
+        PUSHS LF@m
+        CALL factorial
+        POPS LF@m
+        MUL LF@m LF@m LF@n
+        PUSHS LF@m
+        POPFRAME
+        RETURN
+        LABEL base
+        PUSHS int@1
+        POPFRAME
+        RETURN
+        """,
+    "stack": """
+        DEFVAR GF@x
+        DEFVAR GF@t
+        PUSHS int@1
+        PUSHS string@a
+        PUSHS bool@true
+        PUSHS nil@nil
+        POPS GF@x
+        TYPE GF@t GF@x
+        WRITE GF@t
+        POPS GF@x
+        WRITE GF@x
+        POPS GF@x
+        WRITE GF@x
+        POPS GF@x
+        WRITE GF@x
+        """,
+    "read": """
+        DEFVAR GF@a
+        DEFVAR GF@b
+        DEFVAR GF@c
+        DEFVAR GF@d
+        READ GF@a int
+        READ GF@b string
+        READ GF@c bool
+        READ GF@d int
+        ADD GF@a GF@a int@1
+        WRITE GF@a
+        WRITE GF@b
+        WRITE GF@c
+        WRITE GF@d
+        """,
+    "exit": """
+        WRITE string@before
+        EXIT int@7
+        WRITE string@after
+        """,
+    "zero_division": """
+        DEFVAR GF@x
+        WRITE string@start
+        IDIV GF@x int@1 int@0
+        """,
+    "undefined_variable": """
+        WRITE GF@x
+        """,
+    "operand_type": """
+        DEFVAR GF@x
+        DEFVAR GF@y
+        MOVE GF@y string@a
+        ADD GF@x int@1 GF@y
+        """,
+    "missing_frame": """
+        WRITE LF@x
+        """,
+    "missing_value": """
+        DEFVAR GF@x
+        WRITE GF@x
+        """,
+    "undefined_label": """
+        JUMP nowhere
+        """,
+    "string_index": """
+        DEFVAR GF@x
+        GETCHAR GF@x string@abc int@3
+        """,
+}
+
+# input of programs which read it
+INPUTS = {"read": "41\nhello\nTRUE\n"}
+
+
+# xml of program in IPPcode23 text
+def to_xml(text):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<program language="IPPcode23">']
+    instructions = [line.split() for line in text.strip().splitlines()]
+    for order, (opcode, *operands) in enumerate(instructions, 1):
+        lines.append('<instruction order="%d" opcode="%s">' % (order, opcode))
+        for index, operand in enumerate(operands, 1):
+            if index == 1 and opcode in LABEL_OPCODES:
+                kind, value = "label", operand
+            elif index == 2 and opcode == "READ":
+                kind, value = "type", operand
+            elif operand[:3] in FRAMES:
+                kind, value = "var", operand
+            else:
+                kind, value = operand.split("@", 1)
+            lines.append('<arg%d type="%s">%s</arg%d>' % (
+                index, kind, escape(value), index))
+        lines.append('</instruction>')
+    lines.append('</program>')
+    return "\n".join(lines) + "\n"
+
+
+# run python script of repository or any file, returns (stdout, stderr, code)
+def run_script(script, *args, input=None, env=None):
+    process = subprocess.run(
+        [sys.executable, os.path.join(ROOT, script)] + list(args),
+        input=input, capture_output=True, text=True, env=env, timeout=120)
+    return process.stdout, process.stderr, process.returncode
+
+
+# environment with cache directory of one test
+@pytest.fixture
+def env(tmp_path):
+    env = dict(os.environ)
+    env["XDG_CACHE_HOME"] = str(tmp_path / "cache")
+    return env
+
+
+# write program and its input to files, returns (source, input) paths
+@pytest.fixture
+def write_program(tmp_path):
+    def write(name, text=None, input=None):
+        source = tmp_path / (name + ".xml")
+        source.write_text(to_xml(PROGRAMS[name] if text is None else text))
+        if input is None:
+            input = INPUTS.get(name, "")
+        input_file = tmp_path / (name + ".in")
+        input_file.write_text(input)
+        return str(source), str(input_file)
+    return write
+
+
+# run interpret.py on program with extra arguments
+@pytest.fixture
+def interpret(write_program, env):
+    def run(name, *args, text=None, input=None):
+        source, input_file = write_program(name, text, input)
+        return run_script("interpret.py", "--source=" + source,
+                          "--input=" + input_file, *args, env=env)
+    return run
@@ -0,0 +1,80 @@
+# test_batch.py
+# author: Jakub Kontrik xkontr02
+# Description: tests of running many cases in one process pool
+import json
+from conftest import PROGRAMS, run_script
+from test_limits import COPIES
+
+
+# manifest with cases of programs, returns its path
+def write_manifest(tmp_path, cases):
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text("".join(json.dumps(case) + "\n" for case in cases))
+    return str(manifest)
+
+
+def run_batch(tmp_path, cases, *args):
+    stdout, stderr, code = run_script(
+        "batch.py", write_manifest(tmp_path, cases), "--jobs=2", *args)
+    return [json.loads(line) for line in stdout.splitlines()], stderr, code
+
+
+def test_same_as_interpret(tmp_path, write_program, interpret):
+    cases = []
+    expected = []
+    for name in sorted(PROGRAMS):
+        write_program(name)
+        stdout, stderr, code = interpret(name)
+        (tmp_path / (name + ".out")).write_text(stdout)
+        cases.append({"source": name + ".xml", "input": name + ".in",
+                      "expected": name + ".out", "code": code})
+        expected.append((stdout, stderr, code))
+    # same source is loaded once and run by more cases
+    cases.append(dict(cases[0]))
+    expected.append(expected[0])
+    results, stderr, code = run_batch(tmp_path, cases)
+    assert code == 0
+    assert stderr == "%d cases, 0 failed\n" % len(cases)
+    assert [result["case"] for result in results] == list(range(len(cases)))
+    assert [(result["stdout"], result["stderr"], result["code"])
+            for result in results] == expected
+    assert all(result["passed"] for result in results)
+
+
+def test_failed_expectations(tmp_path, write_program):
+    write_program("exit")
+    (tmp_path / "wrong.out").write_text("after")
+    cases = [{"source": "exit.xml", "code": 7},
+             {"source": "exit.xml", "code": 0},
+             {"source": "exit.xml", "expected": "wrong.out"},
+             {"source": "exit.xml"}]
+    results, stderr, code = run_batch(tmp_path, cases)
+    assert code == 1
+    assert stderr == "4 cases, 2 failed\n"
+    assert [result["passed"] for result in results] == [
+        True, False, False, None]
+
+
+def test_load_error(tmp_path, write_program):
+    write_program("broken", text="FOO")
+    results, stderr, code = run_batch(tmp_path, [
+        {"source": "broken.xml", "code": 32}])
+    assert (results[0]["stderr"], results[0]["code"]) == (
+        "Error: Unknown instruction\n", 32)
+    assert code == 0
+
+
+def test_limits(tmp_path, write_program):
+    write_program("copies", text=COPIES)
+    cases = [{"source": "copies.xml", "code": 64}]
+    results, stderr, code = run_batch(tmp_path, cases, "--max-string=1000")
+    assert results[0]["stderr"] == "Error: String limit exceeded\n"
+    assert code == 0
+    results, stderr, code = run_batch(tmp_path, cases)
+    assert (results[0]["stdout"], results[0]["code"]) == ("done", 0)
+
+
+def test_wrong_manifest(tmp_path):
+    stdout, stderr, code = run_script("batch.py", str(tmp_path / "none"))
+    assert code == 1
+    assert stderr.startswith("Error: Wrong manifest")
@@ -0,0 +1,19 @@
+# test_bytecode.py
+# author: Jakub Kontrik xkontr02
+# Description: tests of bytecode engine against classic interpretation
+import pytest
+from conftest import PROGRAMS
+
+
+@pytest.mark.parametrize("name", sorted(PROGRAMS))
+def test_same_as_classic(interpret, name):
+    assert interpret(name, "--engine=bytecode") == interpret(name)
+
+
+def test_expected_results(interpret):
+    assert interpret("calls", "--engine=bytecode") == ("3628800", "", 0)
+    assert interpret("exit", "--engine=bytecode") == ("before", "", 7)
+    assert interpret("read", "--engine=bytecode") == (
+        "42hellotrue", "", 0)
+    stdout, stderr, code = interpret("zero_division", "--engine=bytecode")
+    assert (stdout, code) == ("start", 57)
@@ -0,0 +1,99 @@
+# test_cache.py
+# author: Jakub Kontrik xkontr02
+# Description: tests of cache of loaded programs and its invalidation
+import os
+from conftest import PROGRAMS, to_xml
+from interpret_class import Interpret
+from loader import Loader
+from cache import ProgramCache, MODULES, MAGIC, HEADER, source_stamp
+
+
+# cache files in cache directory of test
+def cache_files(env):
+    directory = os.path.join(env["XDG_CACHE_HOME"], "ipp-interpret")
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in os.listdir(directory)]
+
+
+# first run stores program, second one loads it from cache
+def test_cached_program_same_as_loaded(interpret, env):
+    for name in sorted(PROGRAMS):
+        loaded = interpret(name, "--no-cache")
+        assert interpret(name) == loaded
+        assert interpret(name) == loaded
+    assert len(cache_files(env)) == len(PROGRAMS)
+
+
+def test_no_cache_option(interpret, env):
+    interpret("calls", "--no-cache")
+    assert cache_files(env) == []
+    interpret("calls")
+    assert len(cache_files(env)) == 1
+
+
+def test_program_with_error_is_not_stored(interpret, env):
+    result = interpret("broken", text="FOO")
+    assert result[2] == 32
+    assert cache_files(env) == []
+
+
+def test_changed_source_is_loaded_again(interpret, env):
+    assert interpret("exit")[0] == "before"
+    text = PROGRAMS["exit"].replace("string@before", "string@changed")
+    assert interpret("exit", text=text) == ("changed", "", 7)
+    assert len(cache_files(env)) == 2
+
+
+def test_corrupted_file_is_ignored(interpret, env):
+    expected = interpret("calls")
+    path, = cache_files(env)
+    with open(path, 'rb') as file:
+        data = file.read()
+    for corrupted in (b"", data[:HEADER.size], data[:-10],
+                      data[:HEADER.size] + b"garbage"):
+        with open(path, 'wb') as file:
+            file.write(corrupted)
+        assert interpret("calls") == expected
+    # corrupted file is replaced by loaded program
+    with open(path, 'rb') as file:
+        assert file.read() == data
+
+
+def test_file_of_other_sources_is_ignored(interpret, env):
+    expected = interpret("calls")
+    path, = cache_files(env)
+    with open(path, 'rb') as file:
+        data = file.read()
+    # same program stored by other version of modules
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, b"\0" * 8) + data[HEADER.size:])
+    assert interpret("calls") == expected
+    with open(path, 'rb') as file:
+        assert file.read() == data
+
+
+def test_stamp_covers_loading_modules():
+    # modules which validate, decode and create instructions
+    for name in ("loader.py", "xmlvalidator.py", "factory.py",
+                 "instructions.py", "program.py", "frame.py", "error.py"):
+        assert name in MODULES
+    assert source_stamp() == ProgramCache().stamp
+    assert len(source_stamp()) == HEADER.size - len(MAGIC)
+
+
+def test_load_checks_stamp(tmp_path):
+    source = tmp_path / "exit.xml"
+    source.write_text(to_xml(PROGRAMS["exit"]))
+    cache = ProgramCache(str(tmp_path / "cache"))
+    key, path = cache.hash_source(str(source))
+    loader = Loader(path, Interpret(None))
+    loader.load()
+    cache.store(key, loader.link())
+    program = cache.load(key, Interpret(None))
+    assert [inst.opcode for inst in program.instruction_list] == [
+        "WRITE", "EXIT", "WRITE"]
+    cache.stamp = b"\0" * 8
+    assert cache.load(key, Interpret(None)) is None
+    cache.stamp = None
+    assert cache.load(key, Interpret(None)) is None
@@ -0,0 +1,67 @@
+# test_fusion.py
+# author: Jakub Kontrik xkontr02
+# Description: tests of fused instruction pairs against classic interpretation
+import pytest
+from conftest import PROGRAMS
+
+# loop with every fused pattern
+COUNTER = """
+    DEFVAR GF@i
+    MOVE GF@i int@0
+    DEFVAR GF@c
+    LABEL loop
+    LT GF@c GF@i int@100
+    JUMPIFEQ end GF@c bool@false
+    ADD GF@i GF@i int@1
+    JUMP loop
+    LABEL end
+    WRITE GF@i
+    """
+
+# fused pairs whose fast path fails, both instructions report the error,
+# programs with their exit codes
+FAILING = {
+    "compare": ("""
+        DEFVAR GF@c
+        DEFVAR GF@x
+        LT GF@c GF@x int@1
+        JUMPIFEQ end GF@c bool@true
+        LABEL end
+        """, 56),
+    "increment": ("""
+        DEFVAR GF@i
+        MOVE GF@i string@a
+        LABEL loop
+        ADD GF@i GF@i int@1
+        JUMP loop
+        """, 53),
+    "define": ("""
+        DEFVAR GF@x
+        MOVE GF@x GF@y
+        """, 54),
+}
+
+
+@pytest.mark.parametrize("name", sorted(PROGRAMS))
+def test_same_as_classic(interpret, name):
+    assert interpret(name, "--fuse") == interpret(name)
+
+
+def test_patterns_are_fused(interpret, tmp_path):
+    stats = tmp_path / "stats.txt"
+    result = interpret("counter", "--fuse", "--stats=%s" % stats, "--fused",
+                       text=COUNTER)
+    assert result == ("100", "", 0)
+    fused = dict(line.split(" ", 1) for line in
+                 stats.read_text().splitlines())
+    assert fused == {"compare-and-branch": "1 101",
+                     "increment-and-jump": "1 100",
+                     "define-and-init": "1 1"}
+
+
+@pytest.mark.parametrize("name", sorted(FAILING))
+def test_failing_pair_same_as_classic(interpret, name):
+    text, code = FAILING[name]
+    result = interpret(name, "--fuse", text=text)
+    assert result[2] == code
+    assert result == interpret(name, text=text)
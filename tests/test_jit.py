@@ -0,0 +1,90 @@
+# test_jit.py
+# author: Jakub Kontrik xkontr02
+# Description: tests of compiled traces against classic interpretation
+import io
+import pytest
+from conftest import PROGRAMS
+from interpret_class import Interpret
+from input_reader import InputReader
+from loader import Loader
+from jit import JIT, THRESHOLD
+
+# hot loops which leave compiled trace, programs with their exit codes
+LEAVING = {
+    "zero_division": ("""
+        DEFVAR GF@i
+        DEFVAR GF@x
+        MOVE GF@i int@200
+        LABEL loop
+        SUB GF@i GF@i int@1
+        IDIV GF@x int@1000 GF@i
+        WRITE GF@x
+        JUMP loop
+        """, 57),
+    "changed_type": ("""
+        DEFVAR GF@i
+        DEFVAR GF@x
+        MOVE GF@i int@0
+        MOVE GF@x int@0
+        LABEL loop
+        ADD GF@i GF@i int@1
+        JUMPIFNEQ keep GF@i int@150
+        MOVE GF@x string@a
+        LABEL keep
+        ADD GF@x GF@x int@1
+        JUMP loop
+        """, 53),
+    "string_index": ("""
+        DEFVAR GF@s
+        DEFVAR GF@i
+        DEFVAR GF@c
+        MOVE GF@s string@
+        MOVE GF@i int@0
+        LABEL loop
+        CONCAT GF@s GF@s string@ab
+        STRLEN GF@c GF@s
+        GETCHAR GF@c GF@s GF@i
+        WRITE GF@c
+        ADD GF@i GF@i int@3
+        JUMP loop
+        """, 58),
+    "exit": ("""
+        DEFVAR GF@i
+        MOVE GF@i int@0
+        LABEL loop
+        ADD GF@i GF@i int@1
+        WRITE GF@i
+        JUMPIFNEQ loop GF@i int@120
+        EXIT int@3
+        """, 3),
+}
+
+
+@pytest.mark.parametrize("name", sorted(PROGRAMS))
+def test_same_as_classic(interpret, name):
+    assert interpret(name, "--jit") == interpret(name)
+
+
+@pytest.mark.parametrize("name", sorted(LEAVING))
+def test_leaving_trace_same_as_classic(interpret, name):
+    text, code = LEAVING[name]
+    result = interpret(name, "--jit", text=text)
+    assert result[2] == code
+    assert result == interpret(name, text=text)
+
+
+# loops jumped to THRESHOLD times are compiled
+@pytest.mark.parametrize("name", ["arithmetic", "branches", "strings"])
+def test_hot_loop_is_compiled(write_program, name):
+    source = write_program(name)[0]
+    stdout = io.StringIO()
+    interpret = Interpret(None, stream=stdout)
+    loader = Loader(source, interpret)
+    loader.load()
+    interpret.input = InputReader(text="")
+    program = loader.link()
+    program.link()
+    jit = JIT(program.instruction_list)
+    interpret.run(program, jit=jit)
+    assert jit.traces
+    assert jit.counts[next(iter(jit.traces))] == THRESHOLD
@@ -0,0 +1,160 @@
+# test_limits.py
+# author: Jakub Kontrik xkontr02
+# Description: tests of resource limits in both execution engines
+import pytest
+from conftest import PROGRAMS
+from limits import Limits
+
+ENGINES = [[], ["--engine=bytecode"]]
+
+INFINITE = """
+    LABEL loop
+    JUMP loop
+    """
+
+# new string of same variable in every iteration, total size stays small
+REPLACED = """
+    DEFVAR GF@s
+    DEFVAR GF@i
+    MOVE GF@i int@0
+    LABEL loop
+    CONCAT GF@s string@ab string@cd
+    ADD GF@i GF@i int@1
+    JUMPIFNEQ loop GF@i int@2000
+    WRITE GF@s
+    """
+
+# copies of long string are kept on data stack
+COPIES = """
+    DEFVAR GF@big
+    DEFVAR GF@t
+    DEFVAR GF@i
+    MOVE GF@i int@0
+    MOVE GF@big string@%s
+    LABEL loop
+    CONCAT GF@t GF@big string@a
+    PUSHS GF@t
+    ADD GF@i GF@i int@1
+    JUMPIFNEQ loop GF@i int@2000
+    WRITE string@done
+    """ % ("x" * 100)
+
+# copies are popped or dropped with temporary frame
+RELEASED = """
+    DEFVAR GF@big
+    DEFVAR GF@t
+    DEFVAR GF@i
+    MOVE GF@i int@0
+    MOVE GF@big string@%s
+    LABEL loop
+    CONCAT GF@t GF@big string@a
+    PUSHS GF@t
+    POPS GF@t
+    CREATEFRAME
+    DEFVAR TF@copy
+    CONCAT TF@copy GF@big GF@big
+    SETCHAR TF@copy int@0 string@y
+    ADD GF@i GF@i int@1
+    JUMPIFNEQ loop GF@i int@2000
+    WRITE string@done
+    """ % ("x" * 100)
+
+# string built by appending to itself
+BUILT = """
+    DEFVAR GF@s
+    DEFVAR GF@i
+    MOVE GF@s string@
+    MOVE GF@i int@0
+    LABEL loop
+    CONCAT GF@s GF@s string@abc
+    ADD GF@i GF@i int@1
+    JUMPIFNEQ loop GF@i int@1000
+    STRLEN GF@i GF@s
+    WRITE GF@i
+    """
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("name", sorted(PROGRAMS))
+def test_high_limits_same_as_classic(interpret, engine, name):
+    limits = ["--max-instructions=1000000", "--timeout=60",
+              "--max-stack=1000", "--max-string=1000000"]
+    assert interpret(name, *engine, *limits) == interpret(name)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_instruction_limit(interpret, engine):
+    stdout, stderr, code = interpret("arithmetic", *engine,
+                                     "--max-instructions=100")
+    assert (stdout, stderr, code) == (
+        "", "Error: Instruction limit exceeded\n", 61)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_time_limit(interpret, engine):
+    result = interpret("infinite", *engine, "--timeout=0.2", text=INFINITE)
+    assert result == ("", "Error: Time limit exceeded\n", 62)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_stack_limit(interpret, engine):
+    result = interpret("calls", *engine, "--max-stack=5")
+    assert result == ("", "Error: Stack limit exceeded\n", 63)
+    assert interpret("calls", *engine, "--max-stack=12")[2] == 0
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_replaced_strings_are_not_counted(interpret, engine):
+    result = interpret("replaced", *engine, "--max-string=1000",
+                       text=REPLACED)
+    assert result == ("abcd", "", 0)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_released_strings_are_not_counted(interpret, engine):
+    result = interpret("released", *engine, "--max-string=1000",
+                       text=RELEASED)
+    assert result == ("done", "", 0)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_string_copies_are_counted(interpret, engine):
+    result = interpret("copies", *engine, "--max-string=1000", text=COPIES)
+    assert result == ("", "Error: String limit exceeded\n", 64)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_built_string_limit(interpret, engine):
+    assert interpret("built", *engine, "--max-string=3000",
+                     text=BUILT) == ("3000", "", 0)
+    assert interpret("built", *engine, "--max-string=2999",
+                     text=BUILT)[2] == 64
+
+
+@pytest.mark.parametrize("option", [
+    "--max-instructions=0", "--max-stack=-1", "--max-string=abc",
+    "--timeout=nan", "--timeout=0", "--timeout=-1"])
+def test_wrong_limit(interpret, option):
+    assert interpret("exit", option)[2] == 10
+
+
+def test_limits_with_stats(interpret, tmp_path):
+    stats = tmp_path / "stats.txt"
+    result = interpret("exit", "--max-string=10", "--stats=%s" % stats,
+                       "--insts")
+    assert result[2] == 10
+
+
+@pytest.mark.parametrize("limits", [
+    {"instructions": 0}, {"stack": -1}, {"strings": True}, {"time": "1"},
+    {"time": float("nan")}, {"strings": 1.5}])
+def test_wrong_limits_object(limits):
+    with pytest.raises(ValueError):
+        Limits(**limits)
+
+
+def test_limits_object():
+    assert not Limits()
+    assert Limits(time=1)
+    assert Limits(instructions=10).next_check(0) == 10
+    assert Limits().next_check(5) == 5 + Limits.INTERVAL
@@ -0,0 +1,47 @@
+# test_optimizer.py
+# author: Jakub Kontrik xkontr02
+# Description: tests of optimized programs against classic interpretation
+import pytest
+from conftest import PROGRAMS
+
+# instructions with literal operands, constant jumps and unreachable code
+CONSTANT = """
+    DEFVAR GF@x
+    ADD GF@x int@2 int@3
+    WRITE GF@x
+    CONCAT GF@x string@ab string@cd
+    WRITE GF@x
+    STRLEN GF@x string@hello
+    WRITE GF@x
+    LT GF@x int@1 int@2
+    WRITE GF@x
+    JUMPIFEQ skip int@1 int@1
+    WRITE string@unreachable
+    LABEL skip
+    JUMPIFNEQ skip int@1 int@1
+    WRITE string@reached
+    JUMP end
+    WRITE string@dead
+    ADD GF@x int@1 int@1
+    LABEL end
+    IDIV GF@x int@1 int@0
+    """
+
+
+@pytest.mark.parametrize("name", sorted(PROGRAMS))
+def test_same_as_classic(interpret, name):
+    assert interpret(name, "--optimize") == interpret(name)
+
+
+def test_constant_program(interpret, tmp_path):
+    stats = tmp_path / "stats.txt"
+    result = interpret("constant", "--optimize", text=CONSTANT)
+    assert result == interpret("constant", text=CONSTANT)
+    assert result[0] == "5abcd5truereached"
+    assert result[2] == 57
+    # folded jumps and unreachable code are not executed
+    interpret("constant", "--stats=%s" % stats, "--insts", text=CONSTANT)
+    classic = int(stats.read_text())
+    interpret("constant", "--optimize", "--stats=%s" % stats, "--insts",
+              text=CONSTANT)
+    assert int(stats.read_text()) < classic
@@ -0,0 +1,151 @@
+# test_server.py
+# author: Jakub Kontrik xkontr02
+# Description: tests of protocol of long running interpreter server
+import json
+import socket
+import threading
+import pytest
+from conftest import PROGRAMS, INPUTS, to_xml
+from server import Server, Client
+from test_limits import REPLACED, COPIES
+
+
+# server listening in thread of test, every request has given limits
+def start_server(path, limits=None):
+    server = Server(path, 4, limits)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+# one server is shared by tests of module
+@pytest.fixture(scope="module")
+def server_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("server") / "ipp.sock")
+    server = start_server(path)
+    yield path
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server_path):
+    client = Client(server_path)
+    yield client
+    client.close()
+
+
+# raw connection for requests which client does not send
+@pytest.fixture
+def connection(server_path):
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.connect(server_path)
+    file = connection.makefile('rwb')
+    yield file
+    file.close()
+    connection.close()
+
+
+def request(file, line, payload=b""):
+    file.write(line + b"\n" + payload)
+    file.flush()
+    return json.loads(file.readline())
+
+
+@pytest.mark.parametrize("name", sorted(PROGRAMS))
+def test_same_as_classic(client, interpret, name):
+    source = to_xml(PROGRAMS[name]).encode()
+    input = INPUTS.get(name, "").encode()
+    response = client.run(source, input)
+    assert response["status"] == "ok"
+    stdout, stderr, code = interpret(name)
+    assert (response["stdout"], response["stderr"], response["code"]) == (
+        stdout, stderr, code)
+
+
+def test_program_by_hash(client):
+    source = to_xml(PROGRAMS["read"]).encode()
+    first = client.run(source, b"1\na\nfalse\n")
+    assert first["stdout"] == "2afalse"
+    second = client.run(input=b"5\nb\ntrue\n", digest=first["hash"])
+    assert second["status"] == "ok"
+    assert second["stdout"] == "6btrue"
+    assert client.run(digest="0" * 64) == {"status": "missing",
+                                           "hash": "0" * 64}
+
+
+def test_load_error_is_stored(client):
+    response = client.run(to_xml("FOO").encode())
+    assert (response["code"], response["stderr"]) == (
+        32, "Error: Unknown instruction\n")
+    assert client.run(digest=response["hash"]) == response
+
+
+def test_request_limits(client):
+    response = client.run(to_xml(REPLACED).encode(),
+                          limits={"strings": 1000})
+    assert (response["stdout"], response["code"]) == ("abcd", 0)
+    response = client.run(to_xml(COPIES).encode(), limits={"strings": 1000})
+    assert (response["stderr"], response["code"]) == (
+        "Error: String limit exceeded\n", 64)
+    response = client.run(to_xml(COPIES).encode())
+    assert (response["stdout"], response["code"]) == ("done", 0)
+
+
+def test_server_limits(tmp_path):
+    path = str(tmp_path / "ipp.sock")
+    server = start_server(path, {"instructions": 100})
+    client = Client(path)
+    try:
+        response = client.run(to_xml(PROGRAMS["arithmetic"]).encode())
+        assert response["code"] == 61
+        # request can change limits of server
+        response = client.run(digest=response["hash"],
+                              limits={"instructions": 1000000})
+        assert response["code"] == 0
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.parametrize("line", [
+    b"not json", b"[1]", b'{"source": -1}', b'{"source": "10"}',
+    b'{"source": true}', b'{"input": 1.5, "hash": "x"}', b'{"input": 0}',
+    b'{"hash": 1}', b'{"hash": "x", "limits": [1]}',
+    b'{"hash": "x", "limits": {"strings": -1}}',
+    b'{"hash": "x", "limits": {"memory": 1}}'])
+def test_bad_request(connection, line):
+    response = request(connection, line)
+    assert response["status"] == "bad request"
+    # connection can be used for next request
+    assert request(connection, b'{"hash": "x"}')["status"] == "missing"
+
+
+def test_payload_of_bad_request_is_skipped(connection):
+    source = to_xml(PROGRAMS["exit"]).encode()
+    line = json.dumps({"source": len(source), "input": 3,
+                       "limits": {"strings": 0}}).encode()
+    response = request(connection, line, source + b"abc")
+    assert response["status"] == "bad request"
+    line = json.dumps({"source": len(source)}).encode()
+    response = request(connection, line, source)
+    assert (response["status"], response["code"]) == ("ok", 7)
+
+
+def test_concurrent_clients(client, server_path):
+    source = to_xml(PROGRAMS["calls"]).encode()
+    digest = client.run(source)["hash"]
+    results = []
+
+    def run():
+        other = Client(server_path)
+        for _ in range(5):
+            results.append(other.run(digest=digest)["stdout"])
+        other.close()
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["3628800"] * 20
@@ -0,0 +1,61 @@
+# test_specialization.py
+# author: Jakub Kontrik xkontr02
+# Description: tests of specialized instructions against classic interpretation
+import pytest
+from conftest import PROGRAMS
+from interpret_class import Interpret
+from loader import Loader
+from cfg import ControlFlowGraph
+from inference import specialize
+
+# types of variable differ on paths to instructions, so they are not
+# specialized and report errors as in classic run
+UNPROVEN = {
+    "changed_type": ("""
+        DEFVAR GF@x
+        DEFVAR GF@i
+        MOVE GF@x int@1
+        MOVE GF@i int@0
+        LABEL loop
+        ADD GF@x GF@x int@1
+        MOVE GF@x string@a
+        ADD GF@i GF@i int@1
+        JUMPIFNEQ loop GF@i int@5
+        """, 53),
+    "not_initialized": ("""
+        DEFVAR GF@x
+        DEFVAR GF@c
+        JUMPIFEQ skip int@1 int@1
+        MOVE GF@x int@1
+        LABEL skip
+        ADD GF@c GF@x int@1
+        """, 56),
+    "zero_division": ("""
+        DEFVAR GF@x
+        MOVE GF@x int@0
+        IDIV GF@x int@1 GF@x
+        """, 57),
+}
+
+
+@pytest.mark.parametrize("name", sorted(PROGRAMS))
+def test_same_as_classic(interpret, name):
+    assert interpret(name, "--specialize") == interpret(name)
+
+
+@pytest.mark.parametrize("name", sorted(UNPROVEN))
+def test_errors_same_as_classic(interpret, name):
+    text, code = UNPROVEN[name]
+    result = interpret(name, "--specialize", text=text)
+    assert result[2] == code
+    assert result == interpret(name, text=text)
+
+
+# instructions of global variables with proven types are replaced
+def test_proven_instructions_are_specialized(write_program):
+    source = write_program("arithmetic")[0]
+    loader = Loader(source, Interpret(None))
+    loader.load()
+    program = loader.link()
+    program.link()
+    assert specialize(ControlFlowGraph(program.instruction_list)) > 0
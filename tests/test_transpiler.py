@@ -0,0 +1,25 @@
+# test_transpiler.py
+# author: Jakub Kontrik xkontr02
+# Description: tests of programs translated to python against classic run
+import pytest
+from conftest import PROGRAMS, run_script
+
+
+# generated file is written to directory of test, so it can not import
+# modules of interpreter
+@pytest.mark.parametrize("name", sorted(PROGRAMS))
+def test_same_as_classic(interpret, write_program, env, tmp_path, name):
+    emitted = tmp_path / (name + ".py")
+    assert interpret(name, "--emit-python=%s" % emitted) == ("", "", 0)
+    input_file = write_program(name)[1]
+    result = run_script(str(emitted), "--input=" + input_file, env=env)
+    assert result == interpret(name)
+
+
+def test_output_buffer_option(interpret, env, tmp_path):
+    emitted = tmp_path / "exit.py"
+    interpret("exit", "--emit-python=%s" % emitted)
+    for policy in ("block", "line", "unbuffered"):
+        result = run_script(str(emitted), "--output-buffer=" + policy,
+                            input="", env=env)
+        assert result == ("before", "", 7)
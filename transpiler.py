@@ -0,0 +1,162 @@
+# transpiler.py
+# author: Jakub Kontrik xkontr02
+# Description: module for translating loaded program to standalone python file
+import os
+import re
+import inspect
+from error import OutputFileError
+from bytecode import Bytecode, OPCODES
+from cfg import ControlFlowGraph
+from instructions import Nil
+
+# modules whose source is copied to generated file in this order,
+# imports between them are removed
+RUNTIME = ("error", "stack", "frame", "output", "input_reader",
+           "interpret_class", "bytecode")
+LOCAL_IMPORT = re.compile(r"^(from|import) (%s)\b(.*\\\n)*.*$" % "|".join(
+    RUNTIME + ("instructions",)), re.MULTILINE)
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+MAIN = '''
+## PROGRAM ##
+
+# class with tables of lowered program used by Machine
+class Program:
+    consts = [%(consts)s]
+    global_names = %(global_names)r
+    local_names = %(local_names)r
+    errors = %(errors)r
+
+
+%(blocks)s
+
+
+# first instruction index of block to block function
+BLOCKS = {%(table)s}
+END = %(end)d
+
+
+# wrong arguments end with same code as in interpret.py
+class Parser(argparse.ArgumentParser):
+    def exit(self, status=0, message=None):
+        if message:
+            self._print_message(message)
+        sys.exit(ErrorNum.WRONG_PARAM)
+
+
+def main():
+    parser = Parser(add_help=False)
+    parser.add_argument("--input", metavar="FILE", dest="input_file")
+    parser.add_argument("--output-buffer", dest="output_buffer",
+                        choices=["block", "line", "unbuffered"],
+                        default="block")
+    args, unknown = parser.parse_known_args()
+    if unknown:
+        sys.stderr.write("Error: Wrong arguments\\n")
+        sys.exit(ErrorNum.WRONG_PARAM)
+    interpret = Interpret(args.input_file, args.output_buffer)
+    try:
+        interpret.open_input()
+        sys.stderr = ErrorStream(sys.stderr, interpret.output)
+        m = Machine(interpret, Program)
+        pc = 0
+        while pc != END:
+            pc = BLOCKS[pc](m)
+        interpret.output.flush()
+    except InterpretError as error:
+        sys.stderr.write(error.message)
+        sys.exit(error.code)
+    except ProgramExit as exit:
+        sys.exit(exit.code)
+
+
+if __name__ == '__main__':
+    main()
+'''
+
+# class for translating instructions to python source, every basic block
+# is function which calls bytecode handlers with constant operands and
+# returns index of first instruction of next block
+
+
+class Transpiler:
+    def __init__(self, instruction_list):
+        self.instruction_list = instruction_list
+        self.code = Bytecode(instruction_list)
+        self.cfg = ControlFlowGraph(instruction_list)
+
+    # source of runtime modules without imports of each other
+    def runtime(self):
+        parts = ["import argparse\n"]
+        for name in RUNTIME:
+            with open(os.path.join(DIRECTORY, name + ".py")) as file:
+                source = file.read()
+            parts.append(LOCAL_IMPORT.sub("", source))
+            if name == "frame":
+                # bytecode handlers create nil values
+                parts.append(inspect.getsource(Nil))
+        return "\n".join(parts)
+
+    def constant(self, value):
+        if type(value) is Nil:
+            return "Nil()"
+        return repr(value)
+
+    # python statements of instruction on index
+    def instruction(self, index, end):
+        code = self.code
+        op = OPCODES[code.ops[index]]
+        a, b, c = code.arg1[index], code.arg2[index], code.arg3[index]
+        call = "op_%s(m, %d, %d, %d)" % (op.lower(), a, b, c)
+        # label operands hold label index, which starts a block
+        if op == "NOP":
+            return []
+        if op == "JUMP":
+            return [call] if a < 0 else ["return %d" % a]
+        if op in ("JUMPIFEQ", "JUMPIFNEQ"):
+            if a < 0:
+                return [call]
+            return ["if %s is not None:" % call, "    return %d" % a,
+                    "return %d" % end]
+        if op == "CALL":
+            return [call, "return %d" % a]
+        if op == "RETURN":
+            return ["return %s" % call]
+        return [call]
+
+    def block(self, block):
+        lines = ["def block_%d(m):" % block.start]
+        body = []
+        for index in range(block.start, block.end):
+            body.extend(self.instruction(index, block.end))
+        if not body or not body[-1].startswith("return"):
+            body.append("return %d" % block.end)
+        lines.extend("    " + line for line in body)
+        return "\n".join(lines)
+
+    def source(self, name):
+        code = self.code
+        blocks = self.cfg.blocks
+        header = "# generated from %s by interpret.py --emit-python\n" % name
+        return header + self.runtime() + MAIN % {
+            "consts": ", ".join(self.constant(value)
+                                for value in code.consts),
+            "global_names": code.global_names,
+            "local_names": code.local_names,
+            "errors": [(message, int(number), checks)
+                       for message, number, checks in code.errors],
+            "blocks": "\n\n\n".join(self.block(block) for block in blocks),
+            "table": ", ".join("%d: block_%d" % (block.start, block.start)
+                               for block in blocks),
+            "end": len(self.instruction_list),
+        }
+
+
+# write program as python file
+def emit(instruction_list, file_name, source_name):
+    source = Transpiler(instruction_list).source(source_name)
+    try:
+        with open(file_name, 'w') as file:
+            file.write(source)
+    except OSError:
+        raise OutputFileError("Error: Cannot write python file\n")
@@ -1,128 +1,97 @@
 # xmlvalidator.py
 # author: Jakub Kontrik xkontr02
-# Description: module for validating given xml file
-import xml.etree.ElementTree as ET
-import sys
+# Description: module for validating elements of given xml file
 import re
-from error import ErrorNum
 
-# class for validating xml file
+# precompiled patterns of argument values
+BOOL_RE = re.compile(r'(true|false)')
+NIL_RE = re.compile(r'nil')
+LABEL_RE = re.compile(r'[a-zA-Z_\-$&%*!?][a-zA-Z0-9_\-$&%*!?]*')
+TYPE_RE = re.compile(r'(int|string|bool)')
+VAR_RE = re.compile(r'(GF|LF|TF)@[a-zA-Z_\-$&%*!?][a-zA-Z0-9_\-$&%*!?]*')
+ARG_TAGS = ((), ('arg1',), ('arg1', 'arg2'), ('arg1', 'arg2', 'arg3'))
+
+# class for validating xml elements as they are loaded
+# every method returns False if element is not valid
 
 
 class XMLValidator:
-    def __init__(self, source):
-        try:
-            # if source is None read from stdin
-            if source == None:
-                self.root = ET.fromstring(sys.stdin.read())
-            else:
-                self.root = ET.parse(source).getroot()
-        except FileNotFoundError:
-            sys.stderr.write("Error: File not found\n")
-            sys.exit(ErrorNum.INPUT_FILE_ERR)
-        except ET.ParseError:
-            sys.stderr.write("Error: XML parse error\n")
-            sys.exit(ErrorNum.WRONG_XML_FORMAT)
-        # reading xml and sorting it
-        try:
-            self.root[:] = sorted(self.root, key=lambda child: int(
-                # if negative number is in order attribute forcing zero division exeption
-                child.get('order')) if int(child.get('order')) > 0 else 0/0)
-            for child in self.root:
-                child[:] = sorted(child, key=lambda arg: arg.tag)
-        except (TypeError, ValueError, ZeroDivisionError):
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
+    def __init__(self):
+        # order attributes of already validated instructions
+        self.orders = set()
 
-    def validate(self):
-        opcode_num = set()
-        self.validate_root()
-        for child in self.root:
-            if child.tag == 'instruction':
-                self.validate_instruction(child, opcode_num)
-                for arg in child:
-                    self.validate_arg(arg)
-            else:
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-    # checking instruction attributes
+    def validate_root(self, root):
+        if root.tag != 'program':
+            return False
+        if root.attrib.get('language') != 'IPPcode23':
+            return False
+        return True
 
-    def validate_instruction(self, child, opcode_num):
-        if child.get('order') in opcode_num:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
+    # get order of instruction, None if it is not positive number
+    def get_order(self, child):
+        try:
+            order = int(child.get('order'))
+        except (TypeError, ValueError):
+            return None
+        if order <= 0:
+            return None
+        return order
+
+    # checking instruction attributes, arguments have to be sorted by tag
+    def validate_instruction(self, child):
+        if child.tag != 'instruction':
+            return False
+        if child.get('order') in self.orders:
+            return False
         else:
-            opcode_num.add(child.get('order'))
+            self.orders.add(child.get('order'))
         if child.get('opcode') is None:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if child.get('order') is None:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
+            return False
         if len(child) > 3:
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if len(child) == 1:
-            if child[0].tag != 'arg1':
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if len(child) == 2:
-            if child[0].tag != 'arg1' or child[1].tag != 'arg2':
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if len(child) == 3:
-            if child[0].tag != 'arg1' or child[1].tag != 'arg2' or child[2].tag != 'arg3':
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-    # ccekcing arguments attributes
+            return False
+        if tuple(arg.tag for arg in child) != ARG_TAGS[len(child)]:
+            return False
+        return True
 
+    # checking arguments attributes, text of argument is stripped
     def validate_arg(self, child):
+        if child.text is None:
+            child.text = ''
         match child.attrib.get('type'):
             case 'int':
                 child.text = child.text.strip()
-                pass
             case 'bool':
                 child.text = child.text.strip()
-                if not re.match(r'^(true|false)$', child.text) or child.text is None:
-                    sys.stderr.write("Error: Wrong XML structure\n")
-                    sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
+                if not BOOL_RE.fullmatch(child.text):
+                    return False
             case 'string':
-                if child.text is not None:
-                    child.text = child.text.strip()
-                else:
-                    child.text = ''
-                pass
+                child.text = child.text.strip()
             case 'nil':
                 child.text = child.text.strip()
-                if child.attrib.get('type') == 'nil':
-                    if not re.match(r'^nil$', child.text) or child.text is None:
-                        sys.stderr.write("Error: Wrong XML structure\n")
-                        sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
+                if not NIL_RE.fullmatch(child.text):
+                    return False
             case 'label':
                 child.text = child.text.strip()
-                if child.attrib.get('type') == 'label':
-                    if not re.match(r'^[a-zA-Z_\-$&%*!?][a-zA-Z0-9_\-$&%*!?]*$', child.text) or child.text is None:
-                        sys.stderr.write("Error: Wrong XML structure\n")
-                        sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
+                if not LABEL_RE.fullmatch(child.text):
+                    return False
             case 'type':
                 child.text = child.text.strip()
-                if child.attrib.get('type') == 'type':
-                    if not re.match(r'^(int|string|bool)$', child.text) or child.text is None:
-                        sys.stderr.write("Error: Wrong XML structure\n")
-                        sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
+                if not TYPE_RE.fullmatch(child.text):
+                    return False
             case 'var':
                 child.text = child.text.strip()
-                if not re.match(r'^(GF|LF|TF)@[a-zA-Z_\-$&%*!?][a-zA-Z0-9_\-$&%*!?]*$', child.text) or child.text is None:
-                    sys.stderr.write("Error: Wrong XML structure\n")
-                    sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
+                if not VAR_RE.fullmatch(child.text):
+                    return False
             case _:
-                sys.stderr.write("Error: Wrong XML structure\n")
-                sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
+                return False
+        return True
 
-    def validate_root(self):
-        if self.root.tag != 'program':
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
-        if self.root.attrib.get('language') != 'IPPcode23':
-            sys.stderr.write("Error: Wrong XML structure\n")
-            sys.exit(ErrorNum.WRONG_XML_STRUCTURE)
+    # checking value of validated argument, it is checked when instruction
+    # is created
+    def validate_value(self, child):
+        if child.attrib.get('type') == 'int':
+            try:
+                int(child.text, 0)
+            except ValueError:
+                return False
+        return True